@@ -0,0 +1,88 @@
+import json
+import os
+
+import pygame
+
+# sprite name -> (image in the assets directory, size on screen)
+SPRITES = {
+    "board": ("board.png", (800, 800)),
+    "token_red": ("token_red.png", (30, 30)),
+    "token_blue": ("token_blue.png", (30, 30)),
+    "token_green": ("token_green.png", (30, 30)),
+    "token_yellow": ("token_yellow.png", (30, 30)),
+    "house": ("house.png", (20, 20)),
+    "hotel": ("hotel.png", (25, 25)),
+}
+for _face in range(1, 7):
+    SPRITES["dice_{0}".format(_face)] = ("dice_{0}.png".format(_face), (40, 40))
+
+ATLAS_WIDTH = 800
+
+
+def pack(sizes, width=ATLAS_WIDTH):
+    """Shelf-pack sizes (name -> (w, h)), tallest first; return
+    (name -> (x, y, w, h), total height)."""
+    rects = {}
+    x = y = shelf = 0
+    for name, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        if x + w > width:
+            x, y, shelf = 0, y + shelf, 0
+        rects[name] = (x, y, w, h)
+        x += w
+        shelf = max(shelf, h)
+    return rects, y + shelf
+
+
+def _source_key(assets):
+    """What the cached atlas was built from: file stamps and target sizes."""
+    key = []
+    for name, (filename, size) in sorted(SPRITES.items()):
+        stat = os.stat(os.path.join(assets, filename))
+        key.append([name, filename, stat.st_mtime_ns, stat.st_size, list(size)])
+    return key
+
+
+def _build(assets, rects, height):
+    atlas = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+    for name, (filename, size) in SPRITES.items():
+        image = pygame.image.load(os.path.join(assets, filename)).convert_alpha()
+        atlas.blit(pygame.transform.smoothscale(image, size), rects[name][:2])
+    return atlas
+
+
+def load_atlas(assets="assets", cache=None):
+    """Return name -> Surface for every sprite, pre-scaled.
+
+    The sprites are subsurfaces of one packed atlas, cached as an
+    uncompressed 32-bit BMP (ten times faster to load than a PNG) with a
+    JSON index in cache (assets/cache by default) and rebuilt from the
+    source images when any of them, or SPRITES, changes. A cache that
+    cannot be written is skipped. Needs a display mode to be set.
+    """
+    cache = cache or os.path.join(assets, "cache")
+    image_path = os.path.join(cache, "atlas.bmp")
+    index_path = os.path.join(cache, "atlas.json")
+    key = _source_key(assets)
+
+    atlas = rects = None
+    try:
+        with open(index_path) as fp:
+            index = json.load(fp)
+        if index["key"] == key:
+            atlas = pygame.image.load(image_path).convert_alpha()
+            rects = {name: tuple(rect) for name, rect in index["rects"].items()}
+    except (OSError, ValueError, KeyError, pygame.error):
+        atlas = None
+
+    if atlas is None:
+        rects, height = pack({name: size for name, (_, size) in SPRITES.items()})
+        atlas = _build(assets, rects, height)
+        try:
+            os.makedirs(cache, exist_ok=True)
+            pygame.image.save(atlas, image_path)
+            with open(index_path, "w") as fp:
+                json.dump({"key": key, "rects": rects}, fp)
+        except (OSError, pygame.error):
+            pass
+
+    return {name: atlas.subsurface(rect) for name, rect in rects.items()}
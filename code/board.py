@@ -1,15 +1,48 @@
-import random
-from dice import Throw
+from collections import namedtuple
+from cards import GetOutJailFree
+from dice import DiceStream, Throw, substream
+from events import EventKind
 from player import Player
-from strategy import HumanRandom
+from strategy import JAIL_CARD, JAIL_PAY, JAIL_ROLL, PAY_BY_MORTGAGING, HumanRandom
 from board_config import BoardConfig
-from squares import Jail, Start, GoToJail
+from board_index import BoardIndex
+from liquidation import SELL_BUILDING, plan_liquidation
+from rent import RentTable
+from state import BoardTables
+from squares import Chance, CommunityChest, Start, GoToJail
+
+# Everything a game changes on a Board, see Board.snapshot(). dice is the
+# DiceStream (seed, position), decks the Deck snapshots (chance, community)
+# and players one PlayerSnapshot per player still in the game, in turn order.
+BoardSnapshot = namedtuple("BoardSnapshot", ["dice", "decks", "current", "doubles", "players"])
+# squares are (index, houses, hotels, mortgaged) of the owned squares, in
+# property_list order; counters the Player running totals; cards the card
+# objects held; creditor a uid or -1.
+PlayerSnapshot = namedtuple("PlayerSnapshot", [
+    "uid", "position", "cash", "squares", "counters", "cards", "skip",
+    "double_rent", "jail", "creditor",
+])
 
 class Board(BoardConfig):
-    def __init__(self, num_players=4, strategies=None):
+    def __init__(self, num_players=4, strategies=None, events=None, seed=None):
         super().__init__()
-        random.shuffle(self.chance_cards)
-        random.shuffle(self.community_cards)
+        # name / class / group lookups shared by all boards of this layout
+        self.index = BoardIndex.for_config(type(self))
+        self.rents = RentTable.for_config(type(self))
+        self.tables = BoardTables.for_config(type(self))
+        self.jail_fine = self.squares[self.index.jail].fine
+        # event sink, None disables logging entirely
+        self.events = events
+        if events is not None:
+            events.bind(self)
+
+        # dice and deck order follow from the seed alone, each on a stream
+        # of its own
+        self.dice = DiceStream(seed)
+        self.seed = self.dice.seed
+        shuffler = substream(self.seed, "decks")
+        self.chance_deck.shuffle(shuffler)
+        self.community_deck.shuffle(shuffler)
 
         if strategies is None:
             strategies = [HumanRandom() for _ in range(num_players)]
@@ -17,78 +50,287 @@ class Board(BoardConfig):
             Player(uid=i, token=self.token[i], strategy=strategies[i])
             for i in range(num_players)
         ]
+        # every player by uid, bankrupt or not, for restore()
+        self.all_players = tuple(self.players)
         self.positions = [0] * num_players
         self.current = 0
+        # doubles rolled so far in the current player's turn
+        self.doubles_rolled = 0
+        # whether the roll being resolved gives the player another one, for
+        # strategies that search on from a decision
+        self.roll_again = False
+
+        # GUI log, formatted lazily by last_move_msg
+        self._last_move = ("", ())
+
+    def snapshot(self):
+        """Return the state of the game as an immutable BoardSnapshot.
+
+        Only what play changes is copied: squares, cards, decks and
+        strategies are shared, so a snapshot takes a few microseconds and any
+        number of them can be restored into this board. The random generators
+        of the strategies are not part of it.
+        """
+        players = []
+        for player, position in zip(self.players, self.positions):
+            creditor = player.creditor
+            players.append(PlayerSnapshot(
+                player.uid, position, player.cash,
+                tuple((sq.index, getattr(sq, "house_count", 0),
+                       getattr(sq, "hotel_count", 0), sq.mortgaged)
+                      for sq in player.property_list),
+                (player.houses, player.hotels, player.utilities, player.railroads,
+                 tuple(player.group_counts.items()), frozenset(player.monopolies)),
+                tuple(player.cards), player.skip_next_turns, player.double_rent,
+                player.in_jail_count, -1 if creditor is None else creditor.uid,
+            ))
+        return BoardSnapshot(
+            self.dice.getstate(),
+            (self.chance_deck.snapshot(), self.community_deck.snapshot()),
+            self.current, self.doubles_rolled, tuple(players),
+        )
+
+    def restore(self, snapshot):
+        """Put the game back to a snapshot() of this board."""
+        squares, everyone = self.squares, self.all_players
+        for player in self.players:
+            for square in player.property_list:
+                square.owner = None
+                square.mortgaged = False
+                if square.counter is None:
+                    square.house_count = square.hotel_count = 0
 
-        # GUI log
-        self.last_move_msg = ""
+        self.players = players = []
+        self.positions = positions = []
+        for saved in snapshot.players:
+            player = everyone[saved.uid]
+            players.append(player)
+            positions.append(saved.position)
+            player.cash = saved.cash
+            player.property_list = owned = []
+            for index, houses, hotels, mortgaged in saved.squares:
+                square = squares[index]
+                square.owner = player
+                square.mortgaged = mortgaged
+                if square.counter is None:
+                    square.house_count = houses
+                    square.hotel_count = hotels
+                owned.append(square)
+            (player.houses, player.hotels, player.utilities, player.railroads,
+             group_counts, monopolies) = saved.counters
+            player.group_counts = dict(group_counts)
+            player.monopolies = set(monopolies)
+            player.cards = list(saved.cards)
+            player.skip_next_turns = saved.skip
+            player.double_rent = saved.double_rent
+            player.in_jail_count = saved.jail
+            player.creditor = None if saved.creditor < 0 else everyone[saved.creditor]
+
+        self.dice.setstate(snapshot.dice)
+        self.seed = self.dice.seed
+        chance, community = snapshot.decks
+        self.chance_deck.restore(chance)
+        self.community_deck.restore(community)
+        self.current = snapshot.current
+        self.doubles_rolled = snapshot.doubles
+
+    @property
+    def last_move_msg(self):
+        fmt, args = self._last_move
+        return fmt.format(*args)
 
     def play_single_turn(self):
-        """Perform one turn and return (die1, die2)."""
+        """Perform one turn and return (die1, die2). After doubles the same
+        player plays the next turn."""
         player = self.players[self.current]
+        again = False
 
         # Skip flag
         if getattr(player, "skip_next_turns", 0) > 0:
             player.skip_next_turns -= 1
-            self.last_move_msg = f"{player} skips their turn."
+            self._last_move = ("{0} skips their turn.", (player,))
+            if self.events is not None:
+                self.events.emit(EventKind.SKIP, player.uid, -1, 0)
             roll = (0, 0)
         else:
-            throw = Throw()
+            if player.is_in_jail():
+                self._jail_decision(player)
+            throw = Throw(dice=self.dice)
             # always two dice in our setup
             d1, d2 = throw.values[0], throw.values[1]
-            self._move(player, throw.amount, throw)
-            square = self.squares[self.positions[self.current]]
-            self.last_move_msg = (
-                f"{player} rolls {d1}+{d2}={throw.amount}, lands on {square}"
-            )
             roll = (d1, d2)
+            if self.events is not None:
+                self.events.emit(EventKind.ROLL, player.uid, -1, throw.amount)
+            if player.is_in_jail():
+                moves = self._jail_roll(player, throw)
+            elif throw.double and self.doubles_rolled == 2:
+                # a third double in a row goes straight to jail
+                self.send_to_jail(player)
+                moves = False
+            else:
+                moves = True
+                again = throw.double
+            if moves:
+                self.roll_again = again
+                self._move(player, throw.amount, throw)
+                self.roll_again = False
+                square = self.squares[self.positions[self.current]]
+                self._last_move = (
+                    "{0} rolls {1}+{2}={3}, lands on {4}", (player, d1, d2, throw.amount, square)
+                )
+            else:
+                self._last_move = ("{0} rolls {1}+{2} and stays in jail.", (player, d1, d2))
+            # no more rolls once in jail
+            again = again and not player.is_in_jail()
 
-        # Bankruptcy check
+        # Bankruptcy check: raise what is missing first
+        if player.get_cash() < 0:
+            self._liquidate(player)
         if player.get_cash() < 0:
+            if self.events is not None:
+                self.events.emit(EventKind.BANKRUPT, player.uid, -1, player.get_cash())
+            self._transfer_assets(player)
             b = self.players.pop(self.current)
             self.positions.pop(self.current)
-            self.last_move_msg = f"{b} has gone bankrupt!"
+            self._last_move = ("{0} has gone bankrupt!", (b,))
             if self.current >= len(self.players):
                 self.current = 0
+            self.doubles_rolled = 0
+        elif again:
+            self.doubles_rolled += 1
+            if self.events is not None:
+                self.events.emit(EventKind.DOUBLES, player.uid, -1, 0)
         else:
             self.current = (self.current + 1) % len(self.players)
+            self.doubles_rolled = 0
+        player.creditor = None
 
         return roll
 
-    def _log(self, msg: str):
-        """Print to console and save as last_event."""
-        print(msg)
-        self.last_event = msg
+    def _liquidate(self, player):
+        """Sell buildings and mortgage squares to cover the player's debt."""
+        self.raise_cash(player, 0)
+
+    def raise_cash(self, player, amount):
+        """Mortgage squares, then sell buildings, until the player holds
+        amount in cash or has nothing left to raise it with."""
+        holdings = [(sq.index, sq.building_level(), sq.mortgaged)
+                    for sq in player.property_list]
+        actions, _ = plan_liquidation(holdings, amount - player.get_cash(), self.tables)
+        for action, i in actions:
+            square = self.squares[i]
+            if action == SELL_BUILDING:
+                self._sell_building(player, square)
+            else:
+                self._mortgage(player, square)
+
+    def _sell_building(self, player, square):
+        price = square.building_costs // 2
+        self.emit(EventKind.SELL_BUILDING, player, square.index, price)
+        houses, hotels = square.count_houses(), square.count_hotels()
+        square.sell_house()
+        player.add_building(square.count_houses() - houses, square.count_hotels() - hotels)
+        player.transfer(price)
+
+    def _mortgage(self, player, square):
+        self.emit(EventKind.MORTGAGE, player, square.index, square.mortgage)
+        square.mortgaged = True
+        player.transfer(square.mortgage)
+
+    def _transfer_assets(self, player):
+        """Hand a bankrupt player's squares to the creditor, who also gives
+        back the part of the debt that could not be paid, or to the bank,
+        which frees their mortgages."""
+        creditor = player.creditor
+        if creditor is player or creditor not in self.players:
+            creditor = None
+        for square in list(player.property_list):
+            if creditor is None:
+                square.mortgaged = False
+            self._set_owner(square, creditor)
+        if creditor is not None:
+            creditor.transfer(player.get_cash())
+        self._return_cards(player)
+
+    def _jail_decision(self, player):
+        """Before rolling in jail: use a card or pay the fine if the strategy
+        says so."""
+        choice = player.strategy.decide_leave_jail(self, player)
+        if choice == PAY_BY_MORTGAGING:
+            self.raise_cash(player, self.jail_fine)
+            choice = JAIL_PAY if player.get_cash() >= self.jail_fine else JAIL_ROLL
+        if choice == JAIL_CARD and player.has_jail_card():
+            # a chance card before a community chest one
+            card = min((c for c in player.cards if isinstance(c, GetOutJailFree)),
+                       key=lambda c: c not in self.chance_deck.cards)
+            player.cards.remove(card)
+            self._give_back_card(card)
+            self._leave_jail(player, 0)
+        elif choice == JAIL_PAY:
+            self._leave_jail(player, self.jail_fine)
+
+    def _jail_roll(self, player, throw):
+        """Roll to leave jail and return whether the player moves: doubles
+        free the player, the third failed attempt pays the fine."""
+        if throw.double:
+            self._leave_jail(player, 0)
+            return True
+        player.count_failed_leave_fail()
+        if player.count_failed_attempts_fail() >= self.squares[self.index.jail].max_attempts:
+            self._leave_jail(player, self.jail_fine)
+            return True
+        return False
+
+    def _leave_jail(self, player, fine):
+        self.emit(EventKind.LEAVE_JAIL, player, self.index.jail, fine)
+        player.transfer(-fine)
+        player.leave_jail()
+
+    def emit(self, kind, player, square=-1, amount=0):
+        """Send an event to the sink, if any. For cards and squares; the hot
+        paths below test self.events inline instead."""
+        if self.events is not None:
+            uid = player.uid if player is not None else -1
+            self.events.emit(kind, uid, square, amount)
 
     def _take_turn(self, player):
-        self._log(f"\n-- {player}'s turn --")
-        throw = Throw()
+        throw = Throw(dice=self.dice)
         while True:
             steps = throw.get_amount()
-            self._log(f"{player} rolls {steps}")
+            self.emit(EventKind.ROLL, player, amount=steps)
             self._move(player, steps, throw)
             if not throw.is_double():
                 break
-            self._log(f"{player} rolled doubles and goes again!")
-            throw = Throw()
+            self.emit(EventKind.DOUBLES, player)
+            throw = Throw(dice=self.dice)
 
     def _move(self, player, steps, throw):
         idx = self.players.index(player)
         new_pos = (self.positions[idx] + steps) % len(self.squares)
         self.positions[idx] = new_pos
+        if self.events is not None:
+            self.events.emit(EventKind.MOVE, player.uid, new_pos, steps)
+        self._land(player, new_pos, throw)
+
+    def _land(self, player, new_pos, throw=None):
+        """Resolve the square the player has just landed on."""
         square = self.squares[new_pos]
-        self._log(f"{player} lands on {square}")
-        
-        
+
         # 1) Own property → maybe build house
         if square.is_owner(player):
+            if square.mortgaged:
+                return
             if player.strategy.decide_build_house(self, player, square):
                 self._buy_house(player, square)
             return
 
         # 2) Unowned property → buy or auction
         if square.can_be_bought():
-            if player.strategy.decide_purchase(self, player, square):
+            answer = player.strategy.decide_purchase(self, player, square)
+            if answer == PAY_BY_MORTGAGING:
+                self.raise_cash(player, square.get_price())
+                answer = player.get_cash() >= square.get_price()
+            if answer:
                 self._buy_property(player, square)
             else:
                 self._auction(square)
@@ -97,69 +339,189 @@ class Board(BoardConfig):
         # 3) Pay rent
         owner = square.get_owner()
         if owner:
-            self._handle_rent(player, square)
+            self._handle_rent(player, square, throw)
             return
 
         # 4) Chance
-        if isinstance(square, type(self.chance_cards[0])):
-            card = self.chance_cards.pop(0)
-            self._log(f"{player} draws Chance: {card.name}")
-            card.action(self, player)
-            self.chance_cards.append(card)
+        if isinstance(square, Chance):
+            self._draw_card(self.chance_deck, player, square)
             return
 
         # 5) Community Chest
-        if isinstance(square, type(self.community_cards[0])):
-            card = self.community_cards.pop(0)
-            self._log(f"{player} draws Community Chest: {card.name}")
-            card.action(self, player)
-            self.community_cards.append(card)
+        if isinstance(square, CommunityChest):
+            self._draw_card(self.community_deck, player, square)
             return
 
         # 6) Special
         self._handle_special(square, player)
 
+    def _draw_card(self, deck, player, square):
+        i = deck.draw()
+        if i is None:
+            return
+        card = deck.cards[i]
+        self.emit(EventKind.CARD, player, square.index, i)
+        card.action(self, player, square=square)
+        # a card the player keeps is skipped by the deck until given back
+        if card in player.cards:
+            deck.hold(i)
+
+    def _give_back_card(self, card):
+        for deck in (self.chance_deck, self.community_deck):
+            if card in deck.cards:
+                deck.release(deck.index(card))
+
+    def _return_cards(self, player):
+        """Give the player's held cards back to their decks."""
+        for card in player.cards:
+            self._give_back_card(card)
+        player.cards = []
+
+    def transaction_to_player(self, giver, amount, receiver):
+        """Move amount from giver to receiver (either may be the Bank; a
+        negative amount flows the other way). A player left in debt to
+        another player owes its assets to that player."""
+        giver.transfer(-amount)
+        receiver.transfer(amount)
+        payer, payee = (giver, receiver) if amount >= 0 else (receiver, giver)
+        if isinstance(payer, Player) and isinstance(payee, Player) and payer.cash < 0:
+            payer.creditor = payee
+
+    def transaction_to_player_from_all(self, amount, player):
+        """Every other player pays amount to player."""
+        for other in self.players:
+            if other is not player:
+                self.transaction_to_player(other, amount, player)
+
+    def send_to_jail(self, player):
+        jail = self.index.jail
+        self.emit(EventKind.GO_TO_JAIL, player, jail)
+        self.positions[self.players.index(player)] = jail
+        player.go_to_jail()
+
+    def get_square_index_by_name(self, name):
+        return self.index.by_name[name]
+
+    def get_square_by_class(self, square_class, from_square=None):
+        """Return the first square of a class after from_square (a square or
+        an index), or the first on the board when from_square is None."""
+        if from_square is None:
+            return self.squares[self.index.indices_of(square_class)[0]]
+        if not isinstance(from_square, int):
+            from_square = from_square.index
+        return self.squares[self.index.next_of_class(square_class, from_square)]
+
+    def get_group_squares(self, group_index):
+        return [self.squares[i] for i in self.index.group_members[group_index]]
+
+    def _player_slot(self, player_id, player):
+        """Return (player, position slot) for a uid or a Player."""
+        if player is None:
+            player = next(p for p in self.players if p.uid == player_id)
+        return player, self.players.index(player)
+
+    def move_player_to(self, player_id, square_index, player=None, square=None,
+                       process_square=True):
+        """Move a player forward to a square (given by index or object),
+        collecting the Go salary when passing Go, then resolve the square
+        unless process_square is False."""
+        player, idx = self._player_slot(player_id, player)
+        if square is not None:
+            square_index = square.index
+        start = self.index.start
+        if square_index < self.positions[idx] and square_index != start:
+            reward = self.squares[start].cash_on_pass
+            self.emit(EventKind.PASS_GO, player, amount=reward)
+            player.transfer(reward)
+        self.positions[idx] = square_index
+        self.emit(EventKind.MOVE, player, square_index, 0)
+        if process_square:
+            self._land(player, square_index)
+
+    def move_player_n_square(self, player_id, n, player=None, process_square=True):
+        """Move a player n squares (backwards when negative) without passing Go."""
+        player, idx = self._player_slot(player_id, player)
+        square_index = (self.positions[idx] + n) % len(self.squares)
+        self.positions[idx] = square_index
+        self.emit(EventKind.MOVE, player, square_index, n)
+        if process_square:
+            self._land(player, square_index)
+
     def _buy_property(self, player, square):
         price = square.get_price()
-        self._log(f"{player} buys {square} for ${price}")
+        if self.events is not None:
+            self.events.emit(EventKind.BUY, player.uid, square.index, price)
+        player.transfer(-price)
+        self._set_owner(square, player)
+
+    def _buy_house(self, player, square):
+        price = square.get_house_price()
+        if price is None:
+            return
+        if self.events is not None:
+            self.events.emit(EventKind.BUILD, player.uid, square.index, price)
         player.transfer(-price)
+        houses, hotels = square.count_houses(), square.count_hotels()
+        square.buy_house()
+        player.add_building(square.count_houses() - houses, square.count_hotels() - hotels)
+
+    def _set_owner(self, square, player):
+        """Hand a square to player (None for the bank), keeping both owners'
+        counters up to date."""
+        previous = square.get_owner()
+        if previous is not None:
+            previous.remove_property(square)
         square.set_owner(player)
-        player.add_property(square)
+        if player is not None:
+            player.add_property(square)
 
-    def _handle_rent(self, player, square):
+    def _handle_rent(self, player, square, throw):
+        if square.mortgaged:
+            return
         owner = square.get_owner()
-        rent = square.compute_rent(thr=Throw()) if hasattr(square, "compute_rent") else square.get_rent_amount()
+        # utilities charge on the roll that brought the player here, or on a
+        # fresh one when a card moved the player
+        if throw is not None:
+            dice = throw.amount
+        elif self.rents.per_roll[square.index]:
+            dice = Throw.simple_amount(dice=self.dice)
+        else:
+            dice = 0
+        rent = self.rents.square_rent(square, dice)
         if owner.double_rent:
             rent *= 2
             owner.double_rent = False
-            self._log(f"{owner}'s Double Rent → rent x2 = ${rent}")
-        self._log(f"{player} pays ${rent} rent to {owner}")
-        player.transfer(-rent)
-        owner.transfer(rent)
+            if self.events is not None:
+                self.events.emit(EventKind.DOUBLE_RENT, owner.uid, -1, rent)
+        if self.events is not None:
+            self.events.emit(EventKind.RENT, player.uid, square.index, rent)
+        self.transaction_to_player(player, rent, owner)
 
     def _handle_special(self, square, player):
         # Income / Luxury Tax
         if hasattr(square, "cash_on_land"):
             tax = -square.cash_on_land
-            self._log(f"{player} pays ${tax} tax")
+            self.emit(EventKind.TAX, player, square.index, tax)
             player.transfer(square.cash_on_land)
 
         # Passing Go
         if isinstance(square, Start):
             reward = square.cash_on_pass
-            self._log(f"{player} collects ${reward} for passing Go")
+            self.emit(EventKind.PASS_GO, player, amount=reward)
             player.transfer(reward)
 
         # Go To Jail
         if isinstance(square, GoToJail):
-            jail_idx = next(i for i, s in enumerate(self.squares) if isinstance(s, Jail))
-            self._log(f"{player} goes directly to Jail")
-            self.positions[self.players.index(player)] = jail_idx
+            self.send_to_jail(player)
 
     def _auction(self, square):
-        self._log(f"Auction for {square}")
+        events = self.events
+        if events is not None:
+            square_idx = square.index
+            events.emit(EventKind.AUCTION, -1, square_idx, 0)
         current_bids = {}
-        active = set(self.players)
+        # a list, not a set: bidding order must not depend on object ids
+        active = list(self.players)
 
         while True:
             bids_this_round = False
@@ -169,23 +531,26 @@ class Board(BoardConfig):
                 if bid > prev and bid <= p.get_cash():
                     current_bids[p] = bid
                     bids_this_round = True
-                    self._log(f"{p} bids ${bid}")
+                    if events is not None:
+                        events.emit(EventKind.BID, p.uid, square_idx, bid)
                 else:
-                    active.discard(p)
-                    self._log(f"{p} passes")
+                    active.remove(p)
+                    if events is not None:
+                        events.emit(EventKind.AUCTION_PASS, p.uid, square_idx, 0)
             if not bids_this_round or len(active) <= 1:
                 break
 
         if not current_bids:
-            self._log(f"No bids for {square}, auction ends unsold")
+            if events is not None:
+                events.emit(EventKind.AUCTION_UNSOLD, -1, square_idx, 0)
             return
 
         winner = max(current_bids, key=current_bids.get)
         winning_bid = current_bids[winner]
-        self._log(f"{winner} wins auction for {square} at ${winning_bid}")
+        if events is not None:
+            events.emit(EventKind.AUCTION_WON, winner.uid, square_idx, winning_bid)
         winner.transfer(-winning_bid)
-        square.owner = winner
-        winner.property_list.append(square)
+        self._set_owner(square, winner)
 
     def _trade_phase(self, player):
         for other in self.players:
@@ -193,24 +558,20 @@ class Board(BoardConfig):
                 continue
             offer = player.strategy.propose_trade(self, player, other)
             if offer:
-                self._log(f"{player} proposes trade to {other}: {offer}")
+                self.emit(EventKind.TRADE_PROPOSED, player, amount=offer.get("cash", 0))
                 if other.strategy.accept_trade(self, other, offer):
                     self._execute_trade(offer)
-                    self._log("Trade executed")
+                    self.emit(EventKind.TRADE_ACCEPTED, other)
                 else:
-                    self._log(f"{other} rejects trade")
+                    self.emit(EventKind.TRADE_REJECTED, other)
 
     def _execute_trade(self, offer):
         giver = offer["from"]
         receiver = offer["to"]
         for sq in offer.get("give", []):
-            sq.owner = receiver
-            giver.property_list.remove(sq)
-            receiver.property_list.append(sq)
+            self._set_owner(sq, receiver)
         for sq in offer.get("receive", []):
-            sq.owner = giver
-            receiver.property_list.remove(sq)
-            giver.property_list.append(sq)
+            self._set_owner(sq, giver)
         cash = offer.get("cash", 0)
         if cash:
             giver.transfer(-cash)
@@ -37,6 +37,7 @@ from cards import (
     TaxRefundChance,
     TaxRefundCC,
 )
+from decks import Deck
 from squares import (
     Chance,
     CommunityChest,
@@ -54,6 +55,9 @@ from squares import (
 )
 
 class BoardConfig:
+    """Board layout. The class attributes are a template that is never played on;
+    every instance gets its own squares, groups and decks."""
+
     community_cards = [
         AdvanceToGo(),
         BankError(),
@@ -207,3 +211,48 @@ class BoardConfig:
         "Wheelbarrow",
         "Cat",
     ]
+
+    def __init__(self):
+        self.groups, self.squares = self.clone_layout()
+        # cards hold no state, only the deck order is per board
+        self.chance_deck = Deck(self.chance_cards)
+        self.community_deck = Deck(self.community_cards)
+
+    @classmethod
+    def _layout_template(cls):
+        """Flatten the template once into (class, attributes, group index) rows."""
+        template = cls.__dict__.get("_template")
+        if template is None:
+            group_index = {id(g): i for i, g in enumerate(cls.groups)}
+            groups = tuple((g.__class__, dict(g.__dict__)) for g in cls.groups)
+            # every square carries its board index
+            squares = tuple(
+                (sq.__class__, dict(sq.__dict__, index=i),
+                 group_index.get(id(getattr(sq, "property_group", None))))
+                for i, sq in enumerate(cls.squares)
+            )
+            template = cls._template = (groups, squares)
+        return template
+
+    @classmethod
+    def clone_layout(cls):
+        """Return fresh (groups, squares) copied from the template without
+        running any __init__."""
+        group_rows, square_rows = cls._layout_template()
+        groups = []
+        for klass, attrs in group_rows:
+            group = object.__new__(klass)
+            group.__dict__ = attrs.copy()
+            group.property_list = []
+            groups.append(group)
+
+        squares = []
+        for klass, attrs, gi in square_rows:
+            square = object.__new__(klass)
+            square.__dict__ = attrs.copy()
+            if gi is not None:
+                group = groups[gi]
+                square.property_group = group
+                group.property_list.append(square)
+            squares.append(square)
+        return groups, squares
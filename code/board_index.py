@@ -0,0 +1,68 @@
+from board_config import BoardConfig
+from squares import Jail, Square, Start
+
+
+class BoardIndex:
+    """Lookup tables of a board configuration, built once and shared by every
+    board of that configuration.
+
+    by_name maps a square name to its index, by_class a square class (and each
+    of its Square base classes) to the sorted indices of its squares, and
+    group_members a property group index to the indices of its squares.
+    """
+
+    _cache = {}
+
+    def __init__(self, squares, groups):
+        self.size = n = len(squares)
+        self.by_name = {}
+        by_class = {}
+        for i, sq in enumerate(squares):
+            self.by_name.setdefault(sq.name, i)
+            for klass in type(sq).__mro__:
+                if klass is Square or not issubclass(klass, Square):
+                    continue
+                by_class.setdefault(klass, []).append(i)
+        self.by_class = {klass: tuple(indices) for klass, indices in by_class.items()}
+
+        # next_by_class[klass][i]: first square of klass strictly after i, wrapping
+        self.next_by_class = {}
+        for klass, indices in self.by_class.items():
+            members = set(indices)
+            table = [0] * n
+            j = indices[0]
+            for i in range(n - 1, -1, -1):
+                table[i] = j
+                if i in members:
+                    j = i
+            self.next_by_class[klass] = tuple(table)
+
+        group_index = {id(g): gi for gi, g in enumerate(groups)}
+        members = [[] for _ in groups]
+        self.group_of = []
+        for i, sq in enumerate(squares):
+            gi = group_index.get(id(getattr(sq, "property_group", None)), -1)
+            self.group_of.append(gi)
+            if gi >= 0:
+                members[gi].append(i)
+        self.group_of = tuple(self.group_of)
+        self.group_members = tuple(tuple(m) for m in members)
+
+        self.start = self.by_class[Start][0]
+        self.jail = self.by_class[Jail][0]
+
+    @classmethod
+    def for_config(cls, config=BoardConfig):
+        """Return the index of a BoardConfig class, built once."""
+        index = cls._cache.get(config)
+        if index is None:
+            index = cls._cache[config] = cls(config.squares, config.groups)
+        return index
+
+    def indices_of(self, klass):
+        """Indices of the squares of a class, in board order."""
+        return self.by_class.get(klass, ())
+
+    def next_of_class(self, klass, after):
+        """Index of the first square of klass after index after (wrapping)."""
+        return self.next_by_class[klass][after]
@@ -1,12 +1,28 @@
 from dice import Throw
+from events import EventKind
 from player import Bank
-from squares import Chance, CommunityChest
+from squares import Chance, CommunityChest, Start, TrainStation, Utility
+
+# card effects, as (op, argument): what action() does, for StateEngine
+NOTHING = 0
+CASH = 1          # from (or to, when negative) the bank
+FROM_ALL = 2      # from (or to) every other player
+REPAIRS = 3       # (per house, per hotel)
+GOTO = 4          # square name, collecting the Go salary when passing Go
+BACK = 5          # move back by the argument
+NEAREST = 6       # "railroad" or "utility"
+JAIL_FREE = 7
+TO_JAIL = 8
+DOUBLE_RENT = 9
+SKIP_TURN = 10
 
 class Card:
     name = ""
+    # kept next to action(); cards without an effect on the game (the tax
+    # refunds, since nobody can own a tax square) are NOTHING
+    effect = (NOTHING, None)
     def action(self, board, player, *args, **kwargs):
-        print("Card:", self.name)
-        player.add_card(self)
+        """Apply the card; cards kept by the player add themselves to its hand."""
 
 class Chance(Card):
     """Chance card."""
@@ -23,6 +39,7 @@ class CommunityChest(Card):
 class AdvanceToGo(Card):
 
     name = "Advance to Go (Collect $200)"
+    effect = (GOTO, "Start")
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -34,6 +51,7 @@ class AdvanceToGo(Card):
 class BankError(CommunityChest):
 
     name = "Bank error in your favor - Collect $200"
+    effect = (CASH, 200)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -44,6 +62,7 @@ class BankError(CommunityChest):
 class DoctorFees(CommunityChest):
 
     name = "Doctor's Fees - Pay $50"
+    effect = (CASH, -50)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -54,6 +73,7 @@ class DoctorFees(CommunityChest):
 class SaleStock(CommunityChest):
 
     name = "From sale of stock you get $50"
+    effect = (CASH, 50)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -64,6 +84,7 @@ class SaleStock(CommunityChest):
 class GetOutJailFree(Card):
 
     name = "Get Out of Jail Free - This card may be kept until needed or sold"
+    effect = (JAIL_FREE, None)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -74,16 +95,18 @@ class GetOutJailFree(Card):
 class GoToJailCard(Card):
 
     name = "Go to Jail - Go directly to jail - Do not pass Go - Do not collect $200"
+    effect = (TO_JAIL, None)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
         super().action(board, player, *args, **kwargs)
-        player.go_to_jail()
+        board.send_to_jail(player)
 
 
 class GrandOperaNight(CommunityChest):
 
     name = "Grand Opera Night - Collect $50 from every player for opening night seats"
+    effect = (FROM_ALL, 50)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -94,6 +117,7 @@ class GrandOperaNight(CommunityChest):
 class HolidayFund(CommunityChest):
 
     name = "Holiday Fund matures - Receive $100"
+    effect = (CASH, 100)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -104,6 +128,7 @@ class HolidayFund(CommunityChest):
 class IncomeTaxRefund(CommunityChest):
 
     name = "Income tax refund - Collect $20"
+    effect = (CASH, 20)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -114,6 +139,7 @@ class IncomeTaxRefund(CommunityChest):
 class Birthday(CommunityChest):
 
     name = "It is your birthday - Collect $10 from each player "
+    effect = (FROM_ALL, 20)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -124,6 +150,7 @@ class Birthday(CommunityChest):
 class LifeInsurance(CommunityChest):
 
     name = "Life insurance matures - Collect $100"
+    effect = (CASH, 100)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -134,6 +161,7 @@ class LifeInsurance(CommunityChest):
 class HospitalFees(CommunityChest):
 
     name = "Pay hospital fees of $100"
+    effect = (CASH, -100)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -144,6 +172,7 @@ class HospitalFees(CommunityChest):
 class SchoolFees(CommunityChest):
 
     name = "Pay school fees of $150"
+    effect = (CASH, -150)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -154,6 +183,7 @@ class SchoolFees(CommunityChest):
 class ConsultancyFees(CommunityChest):
 
     name = "Receive $25 consultancy fee"
+    effect = (CASH, 25)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -164,6 +194,7 @@ class ConsultancyFees(CommunityChest):
 class StreetRepairs(CommunityChest):
 
     name = "You are assessed for street repairs - $40 per house - $115 per hotel"
+    effect = (REPAIRS, (40, 115))
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -175,6 +206,7 @@ class StreetRepairs(CommunityChest):
 class BeautyContest(CommunityChest):
 
     name = "You have won second prize in a beauty contest - Collect $10"
+    effect = (CASH, 10)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -185,6 +217,7 @@ class BeautyContest(CommunityChest):
 class Inherit(CommunityChest):
 
     name = "You inherit $100"
+    effect = (CASH, 100)
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -195,6 +228,7 @@ class Inherit(CommunityChest):
 class AdvanceIllinois(Chance):
 
     name = "Advance to Illinois Ave. - If you pass Go, collect $200"
+    effect = (GOTO, "Illinois Avenue")
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -206,6 +240,7 @@ class AdvanceIllinois(Chance):
 class AdvanceStCharlesPlace(Chance):
 
     name = "Advance to St. Charles Place - If you pass Go, collect $200"
+    effect = (GOTO, "St. Charles Place")
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -217,6 +252,7 @@ class AdvanceStCharlesPlace(Chance):
 class AdvanceUtility(Chance):
 
     name = "Advance token to nearest Utility. If unowned, you may buy it from the Bank. If owned, throw dice and pay owner a total ten times the amount thrown"
+    effect = (NEAREST, "utility")
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -227,8 +263,10 @@ class AdvanceUtility(Chance):
             # the user might whant to buy the square, so we just move_to
             board.move_player_to(None, None, player=player, square=target_square)
         elif owner is not player:
-            # pay 3 times the through of a dice
-            board.transaction_to_player(player, Throw.simple_amount() * 3, owner)
+            # pay 3 times the through of a dice, nothing on a mortgaged square
+            if not target_square.mortgaged:
+                board.transaction_to_player(
+                    player, Throw.simple_amount(dice=board.dice) * 3, owner)
             board.move_player_to(
                 None, None, player=player, square=target_square, process_square=False
             )
@@ -237,6 +275,7 @@ class AdvanceUtility(Chance):
 class AdvanceRailroad(Chance):
 
     name = "Advance token to the nearest Railroad and pay owner twice the rental to which he/she is otherwise entitled. If Railroad is unowned, you may buy it from the Bank."
+    effect = (NEAREST, "railroad")
 
     def action(self, board, player, *args, **kwargs):
         """Move the player to the Go."""
@@ -250,8 +289,9 @@ class AdvanceRailroad(Chance):
             # the user might whant to buy the square, so we just move_to
             board.move_player_to(None, None, player=player, square=target_square)
         elif owner is not player:
-            # pay 3 times the through of a dice
-            board.transaction_to_player(player, target_square.compute_rent() * 2, owner)
+            # pay twice the rent, nothing on a mortgaged square
+            if not target_square.mortgaged:
+                board.transaction_to_player(player, target_square.compute_rent() * 2, owner)
             board.move_player_to(
                 None, None, player=player, square=target_square, process_square=False
             )
@@ -260,6 +300,7 @@ class AdvanceRailroad(Chance):
 class BankPays(Chance):
 
     name = "Bank pays you dividend of $50"
+    effect = (CASH, 50)
 
     def action(self, board, player, *args, **kwargs):
         """Make the transaction."""
@@ -270,6 +311,7 @@ class BankPays(Chance):
 class GoBack3Spaces(Chance):
 
     name = "Go Back 3 Spaces"
+    effect = (BACK, 3)
 
     def action(self, board, player, *args, **kwargs):
         """Make the transaction."""
@@ -280,6 +322,7 @@ class GoBack3Spaces(Chance):
 class GeneralRepairs(Chance):
 
     name = "Make general repairs on all your property - For each house pay $25 - For each hotel $100"
+    effect = (REPAIRS, (25, 100))
 
     def action(self, board, player, *args, **kwargs):
         """Make the transaction."""
@@ -291,6 +334,7 @@ class GeneralRepairs(Chance):
 class PoorTax(Chance):
 
     name = "Pay poor tax of $15"
+    effect = (CASH, -15)
 
     def action(self, board, player, *args, **kwargs):
         """Make the transaction."""
@@ -301,6 +345,7 @@ class PoorTax(Chance):
 class TripReadingTrainStation(Chance):
 
     name = "Take a trip to Reading Railroad - If you pass Go, collect $200"
+    effect = (GOTO, "Reading Railroad")
 
     def action(self, board, player, *args, **kwargs):
         """Make the transaction."""
@@ -312,6 +357,7 @@ class TripReadingTrainStation(Chance):
 class TripBoardwalk(Chance):
 
     name = "Take a walk on the Boardwalk - Advance token to Boardwalk"
+    effect = (GOTO, "Boardwalk")
 
     def action(self, board, player, *args, **kwargs):
         """Make the transaction."""
@@ -323,6 +369,7 @@ class TripBoardwalk(Chance):
 class Chairman(Chance):
 
     name = "You have been elected Chairman of the Board - Pay each player $50"
+    effect = (FROM_ALL, -50)
 
     def action(self, board, player, *args, **kwargs):
         """Make the transaction."""
@@ -333,6 +380,7 @@ class Chairman(Chance):
 class BuildingLoadMature(Chance):
 
     name = "Your building loan matures - Collect $150"
+    effect = (CASH, -150)
 
     def action(self, board, player, *args, **kwargs):
         """Make the transaction."""
@@ -343,6 +391,7 @@ class BuildingLoadMature(Chance):
 class CrosswordCompetition(Chance):
 
     name = "You have won a crossword competition - Collect $10"
+    effect = (CASH, 10)
 
     def action(self, board, player, *args, **kwargs):
         """Make the transaction."""
@@ -352,6 +401,7 @@ class CrosswordCompetition(Chance):
 class DoubleRent(Card):
     """Your next rent collection is doubled."""
     name = "Double Rent: Next rent you collect is doubled"
+    effect = (DOUBLE_RENT, None)
     def action(self, board, player, *args, **kwargs):
         super().action(board, player, *args, **kwargs)
         player.double_rent = True
@@ -360,6 +410,7 @@ class DoubleRent(Card):
 class SkipNextTurn(Card):
     """You lose your next turn."""
     name = "Skip Next Turn: You lose your next turn"
+    effect = (SKIP_TURN, None)
     def action(self, board, player, *args, **kwargs):
         super().action(board, player, *args, **kwargs)
         player.skip_next_turns = getattr(player, "skip_next_turns", 0) + 1
@@ -384,38 +435,34 @@ class TaxRefundCC(Card):
 
 class DoubleRent(Chance):
     name = "Double Rent – Next rent you collect is doubled"
+    effect = (DOUBLE_RENT, None)
     def action(self, board, player, *args, **kwargs):
         super().action(board, player)
         player.double_rent = True
-        print(f"{player} will collect double rent on next rent")
 
 class SkipNextTurn(Chance):
     name = "Miss Next Turn – Skip your next turn"
+    effect = (SKIP_TURN, None)
     def action(self, board, player, *args, **kwargs):
         super().action(board, player)
         player.skip_next_turns += 1
-        print(f"{player} will skip their next turn")
 
 class TaxRefundChance(Chance):
     name = "Property Tax Refund (Chance)"
     def action(self, board, player, *args, **kwargs):
         super().action(board, player)
         refund = sum(sq.cash_on_land for sq in board.squares
-                     if hasattr(sq, "cash_on_land") and sq.owner == player and sq.cash_on_land > 0)
+                     if getattr(sq, "owner", None) is player and getattr(sq, "cash_on_land", 0) > 0)
         if refund:
             board.transaction_to_player(Bank(), refund, player)
-            print(f"{player} receives ${refund} tax refund (Chance)")
-        else:
-            print(f"{player} has no taxes to refund")
+            board.emit(EventKind.CASH, player, amount=refund)
 
 class TaxRefundCC(CommunityChest):
     name = "Property Tax Refund (Community Chest)"
     def action(self, board, player, *args, **kwargs):
         super().action(board, player)
         refund = sum(sq.cash_on_land for sq in board.squares
-                     if hasattr(sq, "cash_on_land") and sq.owner == player and sq.cash_on_land > 0)
+                     if getattr(sq, "owner", None) is player and getattr(sq, "cash_on_land", 0) > 0)
         if refund:
             board.transaction_to_player(Bank(), refund, player)
-            print(f"{player} receives ${refund} tax refund (Community Chest)")
-        else:
-            print(f"{player} has no taxes to refund")
\ No newline at end of file
+            board.emit(EventKind.CASH, player, amount=refund)
\ No newline at end of file
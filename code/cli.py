@@ -0,0 +1,115 @@
+"""Command line entry point.
+
+    python cli.py simulate -s random random minimax --games 500
+    python cli.py tournament -s random mcts --games 2000 --processes 4
+    python cli.py play --players 3
+    python cli.py play -s random random --watch --rate 20
+
+simulate and tournament are headless: nothing here imports pygame, so batch
+runs and their worker processes only load the game modules. play imports the
+UI when it starts.
+"""
+import argparse
+import sys
+
+from simulator import Simulator
+from strategy import MCTStrategy, MinimaxStrategy, RandomStrategy, RLStrategy
+from termination import Referee
+from tournament import Tournament
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "minimax": MinimaxStrategy,
+    "mcts": MCTStrategy,
+    "rl": RLStrategy,
+}
+
+
+def make_strategies(names):
+    return [STRATEGIES[name]() for name in names]
+
+
+def simulate(args):
+    simulator = Simulator(make_strategies(args.strategies), seed=args.seed,
+                          referee=Referee(max_turns=args.max_turns))
+    report = simulator.run(args.games)
+    print(report)
+    for uid, wins in sorted(report.wins().items(), key=lambda item: (item[0] is None, item[0] or 0)):
+        name = "tie" if uid is None else "{0} ({1})".format(uid, args.strategies[uid])
+        print("{0:<20} {1:>8}".format(name, wins))
+    for reason, n in sorted(report.reasons().items()):
+        print("ended by {0}: {1}".format(reason, n))
+
+
+def tournament(args):
+    t = Tournament(make_strategies(args.strategies), args.games, seed=args.seed,
+                   processes=args.processes, shard_size=args.shard_size,
+                   referee=Referee(max_turns=args.max_turns))
+    print(t.run())
+    print("{0:.1f} games/sec".format(t.games_per_sec))
+
+
+def play(args):
+    # the only command that needs pygame
+    from game import Game
+
+    referee = Referee(max_turns=args.max_turns) if args.max_turns else None
+    strategies = make_strategies(args.strategies) if args.strategies else None
+    if args.load:
+        game = Game.load(args.load, strategies=strategies, referee=referee)
+    else:
+        players = len(strategies) if strategies else args.players
+        game = Game(num_players=players, strategies=strategies, referee=referee)
+    if args.watch:
+        game.watch(turns_per_sec=args.rate, log=args.log)
+    else:
+        game.run()
+
+
+def parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="AI Monopoly")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_strategies(command, default):
+        command.add_argument("-s", "--strategies", nargs="+", choices=sorted(STRATEGIES),
+                             default=default, help="one strategy per player")
+
+    command = commands.add_parser("simulate", help="play games headless and report wins")
+    add_strategies(command, ["random"] * 4)
+    command.add_argument("--games", type=int, default=100)
+    command.add_argument("--seed", type=int, default=0)
+    command.add_argument("--max-turns", type=int, default=1000)
+    command.set_defaults(run=simulate)
+
+    command = commands.add_parser("tournament",
+                                  help="play a lineup over a process pool, seats rotated")
+    add_strategies(command, ["random"] * 4)
+    command.add_argument("--games", type=int, default=1000)
+    command.add_argument("--seed", type=int, default=0)
+    command.add_argument("--processes", type=int, default=None)
+    command.add_argument("--shard-size", type=int, default=50)
+    command.add_argument("--max-turns", type=int, default=1000)
+    command.set_defaults(run=tournament)
+
+    command = commands.add_parser("play", help="open the game window")
+    add_strategies(command, None)
+    command.add_argument("--players", type=int, default=4)
+    command.add_argument("--load", metavar="PATH", nargs="?", const="savegame.sav",
+                         help="continue a saved game")
+    command.add_argument("--watch", action="store_true",
+                         help="let the players play on their own (spectator mode)")
+    command.add_argument("--rate", type=float, default=None,
+                         help="turns per second when watching, default as fast as possible")
+    command.add_argument("--log", action="store_true", help="print events when watching")
+    command.add_argument("--max-turns", type=int, default=None)
+    command.set_defaults(run=play)
+    return parser
+
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,53 @@
+class Deck:
+    """A shuffled card deck drawn through a rotating index.
+
+    cards are the shared (stateless) card objects, order the shuffled card
+    indices. A held card (Get Out of Jail Free) stays in its slot but is
+    skipped until it is released. The state is just (order, position, held),
+    all immutable, so snapshot() and restore() never copy anything.
+    """
+
+    def __init__(self, cards):
+        self.cards = tuple(cards)
+        self.order = tuple(range(len(self.cards)))
+        self.position = 0
+        self.held = frozenset()
+
+    def shuffle(self, rng):
+        """Shuffle the order with rng (a random.Random) and start from the top."""
+        order = list(self.order)
+        rng.shuffle(order)
+        self.order = tuple(order)
+        self.position = 0
+
+    def draw(self):
+        """Return the index of the next card not held, or None."""
+        order = self.order
+        n = len(order)
+        for _ in range(n):
+            i = order[self.position]
+            self.position = (self.position + 1) % n
+            if i not in self.held:
+                return i
+        return None
+
+    def hold(self, i):
+        """Take card i out of the deck until released."""
+        self.held = self.held | {i}
+
+    def release(self, i):
+        """Put held card i back into the deck."""
+        self.held = self.held - {i}
+
+    def index(self, card):
+        return self.cards.index(card)
+
+    def snapshot(self):
+        return self.order, self.position, self.held
+
+    def restore(self, snapshot):
+        self.order, self.position, self.held = snapshot
+
+    def __len__(self):
+        return len(self.cards) - len(self.held)
+
@@ -1,15 +1,97 @@
+import random
 from random import randint
 
+# random bytes 0..251 map evenly onto faces 1..6, 252..255 are dropped
+_FACE_TABLE = bytes(b % 6 + 1 for b in range(256))
+_REJECT = bytes(range(252, 256))
+
+
+def substream(seed, name):
+    """A random.Random of its own for one use of a game seed: the decks, the
+    strategies, ... A string seed hashes the same in every run and never
+    gives the generator of a DiceStream batch, which is seeded by int."""
+    return random.Random(f"{name}/{seed}")
+
+
+class DiceStream:
+    """Seeded source of die faces, generated in batches.
+
+    Batch k is made from the bytes of random.Random(seed * 2**32 + k), so the
+    stream is counter based: its whole state is (seed, position) and seek()
+    can jump anywhere without replaying the rolls before it.
+    """
+
+    def __init__(self, seed=None, batch=1024):
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+        self.batch = batch
+        self._block = 0
+        self._i = 0
+        self._faces = None
+
+    def _load(self):
+        rng = random.Random(self.seed * 2**32 + self._block)
+        self._faces = rng.randbytes(self.batch).translate(_FACE_TABLE, _REJECT)
+
+    def tell(self):
+        """Position in the stream, to be passed to seek()."""
+        return self._block * self.batch + self._i
+
+    def seek(self, position):
+        """Continue the stream from a tell() value; a batch other than the
+        current one is regenerated lazily."""
+        block, self._i = divmod(position, self.batch)
+        if block != self._block:
+            self._block = block
+            self._faces = None
+
+    def getstate(self):
+        """Return (seed, position), to be passed to setstate()."""
+        return self.seed, self._block * self.batch + self._i
+
+    def setstate(self, state):
+        seed, position = state
+        if seed != self.seed:
+            self.seed = seed
+            self._faces = None
+        self.seek(position)
+
+    def face(self):
+        if self._faces is None:
+            self._load()
+        while self._i >= len(self._faces):
+            self._block += 1
+            self._i = 0
+            self._load()
+        i = self._i
+        self._i = i + 1
+        return self._faces[i]
+
+    def roll(self):
+        """Return two faces."""
+        i = self._i
+        faces = self._faces
+        if faces is not None and i + 2 <= len(faces):
+            self._i = i + 2
+            return faces[i], faces[i + 1]
+        return self.face(), self.face()
+
+
 class Throw:
     """Stores each die roll and total."""
-    def __init__(self, n=2):
-        self.values = []
-        self.double = True
-        for _ in range(n):
-            v = randint(1, 6)
-            if self.values and v != self.values[-1]:
-                self.double = False
-            self.values.append(v)
+    def __init__(self, n=2, dice=None):
+        if dice is not None and n == 2:
+            a, b = dice.roll()
+            self.values = [a, b]
+            self.double = a == b
+            self.amount = a + b
+            return
+        if dice is None:
+            self.values = [randint(1, 6) for _ in range(n)]
+        else:
+            self.values = [dice.face() for _ in range(n)]
+        self.double = len(set(self.values)) == 1
         self.amount = sum(self.values)
 
     def get_amount(self):
@@ -19,6 +101,8 @@ class Throw:
         return self.double
 
     @classmethod
-    def simple_amount(cls, n=2):
+    def simple_amount(cls, n=2, dice=None):
         """Quick total without tracking faces."""
-        return sum(randint(1,6) for _ in range(n))
+        if dice is None:
+            return sum(randint(1, 6) for _ in range(n))
+        return sum(dice.face() for _ in range(n))
@@ -0,0 +1,413 @@
+import random
+
+from cards import (
+    BACK,
+    CASH,
+    DOUBLE_RENT,
+    FROM_ALL,
+    GOTO,
+    JAIL_FREE,
+    NEAREST,
+    REPAIRS,
+    SKIP_TURN,
+    TO_JAIL,
+)
+from dice import DiceStream
+from liquidation import SELL_BUILDING, plan_liquidation
+from rent import RentTable
+from strategy import JAIL_CARD, JAIL_PAY, JAIL_ROLL, PAY_BY_MORTGAGING
+from state import (
+    CHANCE,
+    CHEST,
+    FREE,
+    GO_TO_JAIL,
+    NOBODY,
+    PROPERTY,
+    START,
+    TAX,
+    BoardTables,
+)
+
+
+class RandomPolicy:
+    """RandomStrategy for a GameState, drawing from the engine's rng in the same
+    order so that a seeded game plays identically on Board and StateEngine."""
+
+    def __init__(self, buy_prob=0.5, build_prob=0.5):
+        self.buy_prob = buy_prob
+        self.build_prob = build_prob
+
+    def decide_purchase(self, engine, state, uid, square):
+        return engine.rng.random() < self.buy_prob
+
+    def decide_bid_auction(self, engine, state, uid, square, current_bids):
+        max_cash = max(state.cash[uid], 0)
+        if engine.rng.random() < 0.5 and max_cash > 0:
+            return engine.rng.randint(0, max_cash)
+        return 0
+
+    def decide_build_house(self, engine, state, uid, square):
+        cost = engine.tables.house_cost[square]
+        return (engine.tables.kind[square] == PROPERTY and state.cash[uid] > cost
+                and engine.rng.random() < self.build_prob)
+
+    def decide_leave_jail(self, engine, state, uid):
+        if uid in state.card_holder:
+            return JAIL_CARD
+        if state.cash[uid] > engine.tables.jail_fine and engine.rng.random() < 0.5:
+            return JAIL_PAY
+        return JAIL_ROLL
+
+
+class StateEngine:
+    """Play the Board rules on a GameState.
+
+    policies holds one policy per uid (see RandomPolicy for the interface) and
+    rng, used by the policies, is anything with random(), randint() and
+    getrandbits(), the random module by default. dice is a DiceStream, seeded
+    from rng when not given.
+    """
+
+    def __init__(self, policies=None, tables=None, rng=random, dice=None):
+        self.tables = tables or BoardTables.for_config()
+        self.rents = RentTable.for_config()
+        self.policies = policies
+        self.rng = rng
+        self.dice = dice or DiceStream(rng.getrandbits(63))
+
+    def roll(self):
+        return self.dice.roll()
+
+    def play_turn(self, state):
+        """Play the current player's turn and return (die1, die2). After
+        doubles the same player plays the next turn."""
+        uid = state.current
+        jail = state.jail
+        if state.skip[uid] > 0:
+            state.skip[uid] -= 1
+            roll = (0, 0)
+        else:
+            if jail[uid] != FREE:
+                self.jail_decision(state, uid)
+            roll = self.roll()
+            double = roll[0] == roll[1]
+            again = False
+            if jail[uid] != FREE:
+                moves = self.jail_roll(state, uid, double)
+            elif double and state.doubles == 2:
+                # a third double in a row goes straight to jail
+                self.send_to_jail(state, uid)
+                moves = False
+            else:
+                moves = True
+                again = double
+            if moves:
+                self.move(state, uid, roll[0] + roll[1])
+            self.finish_roll(state, uid, again)
+            return roll
+        self.end_turn(state)
+        return roll
+
+    def finish_roll(self, state, uid, again):
+        """End uid's roll and return whether uid rolls again: after doubles
+        (again) a player out of jail, and out of debt once liquidated, does;
+        otherwise the turn ends."""
+        if again and state.jail[uid] == FREE:
+            if state.cash[uid] < 0:
+                self.liquidate(state, uid)
+            if state.cash[uid] >= 0:
+                state.doubles += 1
+                state.creditor[uid] = NOBODY
+                return True
+        self.end_turn(state)
+        return False
+
+    def jail_decision(self, state, uid):
+        """Before rolling in jail: use a card or pay the fine if the policy
+        says so."""
+        choice = self.policies[uid].decide_leave_jail(self, state, uid)
+        if choice == PAY_BY_MORTGAGING:
+            fine = self.tables.jail_fine
+            self.raise_cash(state, uid, fine)
+            choice = JAIL_PAY if state.cash[uid] >= fine else JAIL_ROLL
+        if choice == JAIL_CARD:
+            # a chance card before a community chest one, as on Board
+            for card in self.held_cards(state, uid)[:1]:
+                state.card_holder[card] = NOBODY
+                state.jail[uid] = FREE
+        elif choice == JAIL_PAY:
+            state.cash[uid] -= self.tables.jail_fine
+            state.jail[uid] = FREE
+
+    def jail_roll(self, state, uid, double):
+        """Roll to leave jail and return whether uid moves: doubles free the
+        player, the third failed attempt pays the fine."""
+        if double:
+            state.jail[uid] = FREE
+            return True
+        state.jail[uid] += 1
+        if state.jail[uid] >= self.tables.jail_attempts:
+            state.cash[uid] -= self.tables.jail_fine
+            state.jail[uid] = FREE
+            return True
+        return False
+
+    def send_to_jail(self, state, uid):
+        state.positions[uid] = self.tables.jail
+        state.jail[uid] = 0
+
+    def liquidate(self, state, uid):
+        """Sell buildings and mortgage squares to cover uid's debt."""
+        self.raise_cash(state, uid, 0)
+
+    def raise_cash(self, state, uid, amount):
+        """Mortgage squares, then sell buildings, until uid holds amount in
+        cash or has nothing left to raise it with."""
+        tables = self.tables
+        owner, level, mortgaged = state.owner, state.level, state.mortgaged
+        holdings = [(sq, level[sq], mortgaged[sq]) for sq in tables.buyable
+                    if owner[sq] == uid]
+        actions, raised = plan_liquidation(holdings, amount - state.cash[uid], tables)
+        for action, sq in actions:
+            if action == SELL_BUILDING:
+                level[sq] -= 1
+            else:
+                mortgaged[sq] = 1
+        state.cash[uid] += raised
+
+    def bankrupt(self, state, uid):
+        """Drop uid, handing its squares to its creditor (who gives back the
+        unpaid part of the debt) or to the bank."""
+        state.alive[uid] = 0
+        creditor = state.creditor[uid]
+        if creditor == uid or creditor == NOBODY or not state.alive[creditor]:
+            creditor = NOBODY
+        owner, mortgaged = state.owner, state.mortgaged
+        for sq in self.tables.buyable:
+            if owner[sq] == uid:
+                owner[sq] = creditor
+                if creditor == NOBODY:
+                    mortgaged[sq] = 0
+        if creditor != NOBODY:
+            state.cash[creditor] += state.cash[uid]
+        holder = state.card_holder
+        for card, held_by in enumerate(holder):
+            if held_by == uid:
+                holder[card] = NOBODY
+
+    def held_cards(self, state, uid):
+        return [card for card, holder in enumerate(state.card_holder) if holder == uid]
+
+    def end_turn(self, state):
+        """Settle the current player's debt (or drop it as bankrupt) and pass
+        to the next player alive."""
+        state.doubles = 0
+        uid = state.current
+        if state.cash[uid] < 0:
+            self.liquidate(state, uid)
+        if state.cash[uid] < 0:
+            self.bankrupt(state, uid)
+        state.creditor[uid] = NOBODY
+        alive = state.alive
+        n = len(alive)
+        nxt = state.current
+        for _ in range(n):
+            nxt = (nxt + 1) % n
+            if alive[nxt]:
+                break
+        state.current = nxt
+
+    def play(self, state, max_turns=1000):
+        """Play until one player is left or max_turns; return (winner, turns)."""
+        alive = state.alive
+        turns = 0
+        while turns < max_turns and sum(alive) > 1:
+            self.play_turn(state)
+            turns += 1
+        if sum(alive) == 1:
+            return alive.index(1), turns
+        return None, turns
+
+    def move(self, state, uid, steps):
+        """Move uid by steps, resolve the square and return its index."""
+        pos = (state.positions[uid] + steps) % self.tables.size
+        state.positions[uid] = pos
+        self.land(state, uid, pos, steps)
+        return pos
+
+    def land(self, state, uid, pos, dice=None):
+        """Resolve square pos for uid; dice is the roll that brought uid
+        there, None after a card move."""
+        tables = self.tables
+        owner = state.owner[pos]
+        kind = tables.kind[pos]
+        policy = self.policies[uid]
+
+        if owner == uid:
+            if state.mortgaged[pos]:
+                return
+            if policy.decide_build_house(self, state, uid, pos):
+                self.buy_house(state, uid, pos)
+            return
+
+        if owner == NOBODY and tables.price[pos]:
+            answer = policy.decide_purchase(self, state, uid, pos)
+            if answer == PAY_BY_MORTGAGING:
+                self.raise_cash(state, uid, tables.price[pos])
+                answer = state.cash[uid] >= tables.price[pos]
+            if answer:
+                state.cash[uid] -= tables.price[pos]
+                state.owner[pos] = uid
+            else:
+                self.auction(state, pos)
+            return
+
+        if owner != NOBODY:
+            if state.mortgaged[pos]:
+                return
+            if dice is None:
+                # moved by a card: utilities charge on a fresh roll
+                dice = self.dice.face() + self.dice.face() if self.rents.per_roll[pos] else 0
+            self.pay_rent(state, uid, pos, dice)
+            return
+
+        if kind == TAX:
+            state.cash[uid] -= tables.tax[pos]
+        elif kind == START:
+            state.cash[uid] += tables.go_salary
+        elif kind == GO_TO_JAIL:
+            self.send_to_jail(state, uid)
+        elif kind == CHANCE:
+            self.play_card(state, uid, pos, 0)
+        elif kind == CHEST:
+            self.play_card(state, uid, pos, 1)
+
+    def draw_card(self, state, deck):
+        """Return the next card of deck (0 chance, 1 community chest) not
+        held by a player, or None."""
+        start = self.tables.deck_start[deck]
+        n = self.tables.deck_sizes[deck]
+        for _ in range(n):
+            slot = state.deck_position[deck]
+            state.deck_position[deck] = (slot + 1) % n
+            card = state.deck_order[start + slot]
+            if state.card_holder[card] == NOBODY:
+                return card
+        return None
+
+    def play_card(self, state, uid, pos, deck):
+        """Draw a card on square pos and apply it as its action() does."""
+        card = self.draw_card(state, deck)
+        if card is None:
+            return
+        tables = self.tables
+        op = tables.card_op[card]
+        arg = tables.card_arg[card]
+        cash = state.cash
+        if op == CASH:
+            cash[uid] += arg
+        elif op == FROM_ALL:
+            creditor = state.creditor
+            for other, alive in enumerate(state.alive):
+                if alive and other != uid:
+                    cash[other] -= arg
+                    cash[uid] += arg
+                    if arg >= 0 and cash[other] < 0:
+                        creditor[other] = uid
+                    elif arg < 0 and cash[uid] < 0:
+                        creditor[uid] = other
+        elif op == REPAIRS:
+            houses = hotels = 0
+            owner, level = state.owner, state.level
+            for sq in tables.buyable:
+                if owner[sq] == uid and level[sq]:
+                    if level[sq] == tables.max_level:
+                        hotels += 1
+                    else:
+                        houses += level[sq]
+            cash[uid] -= arg[0] * houses + arg[1] * hotels
+        elif op == GOTO:
+            self.move_to(state, uid, arg)
+            self.land(state, uid, arg)
+        elif op == BACK:
+            target = (pos - arg) % tables.size
+            state.positions[uid] = target
+            self.land(state, uid, target)
+        elif op == NEAREST:
+            target = arg[pos]
+            holder = state.owner[target]
+            if holder == NOBODY:
+                self.move_to(state, uid, target)
+                self.land(state, uid, target)
+            elif holder != uid and state.mortgaged[target]:
+                # no rent on a mortgaged square
+                self.move_to(state, uid, target)
+            elif holder != uid:
+                if self.rents.per_roll[target]:
+                    due = (self.dice.face() + self.dice.face()) * 3
+                else:
+                    due = self.rent(state, target, 0) * 2
+                cash[uid] -= due
+                cash[holder] += due
+                if due >= 0 and cash[uid] < 0:
+                    state.creditor[uid] = holder
+                self.move_to(state, uid, target)
+        elif op == JAIL_FREE:
+            state.card_holder[card] = uid
+        elif op == TO_JAIL:
+            self.send_to_jail(state, uid)
+        elif op == DOUBLE_RENT:
+            state.double_rent[uid] = 1
+        elif op == SKIP_TURN:
+            state.skip[uid] += 1
+
+    def move_to(self, state, uid, target):
+        """Card move forward to target, collecting the Go salary when passing Go."""
+        tables = self.tables
+        if target < state.positions[uid] and target != tables.start:
+            state.cash[uid] += tables.go_salary
+        state.positions[uid] = target
+
+    def buy_house(self, state, uid, square):
+        if state.level[square] < self.tables.max_level:
+            state.cash[uid] -= self.tables.house_cost[square]
+            state.level[square] += 1
+
+    def rent(self, state, square, dice):
+        """Rent due on an owned square."""
+        return self.rents.state_rent(state, square, dice)
+
+    def pay_rent(self, state, uid, square, dice):
+        owner = state.owner[square]
+        rent = self.rent(state, square, dice)
+        if state.double_rent[owner]:
+            rent *= 2
+            state.double_rent[owner] = 0
+        state.cash[uid] -= rent
+        state.cash[owner] += rent
+        if state.cash[uid] < 0:
+            state.creditor[uid] = owner
+
+    def auction(self, state, square, current_bids=None):
+        """Auction square among the players alive; current_bids (uid -> bid)
+        resumes an auction already under way."""
+        cash = state.cash
+        current_bids = dict(current_bids or ())
+        active = [uid for uid, alive in enumerate(state.alive) if alive]
+        while True:
+            bids_this_round = False
+            for uid in list(active):
+                bid = self.policies[uid].decide_bid_auction(self, state, uid, square,
+                                                            current_bids)
+                if bid > current_bids.get(uid, 0) and bid <= cash[uid]:
+                    current_bids[uid] = bid
+                    bids_this_round = True
+                else:
+                    active.remove(uid)
+            if not bids_this_round or len(active) <= 1:
+                break
+
+        if current_bids:
+            winner = max(current_bids, key=current_bids.get)
+            cash[winner] -= current_bids[winner]
+            state.owner[square] = winner
@@ -0,0 +1,165 @@
+import json
+import struct
+from collections import deque, namedtuple
+from enum import IntEnum
+
+
+class EventKind(IntEnum):
+    ROLL = 1
+    MOVE = 2
+    DOUBLES = 3
+    SKIP = 4
+    BUY = 5
+    BUILD = 6
+    RENT = 7
+    DOUBLE_RENT = 8
+    TAX = 9
+    PASS_GO = 10
+    GO_TO_JAIL = 11
+    CARD = 12
+    AUCTION = 13
+    BID = 14
+    AUCTION_PASS = 15
+    AUCTION_WON = 16
+    AUCTION_UNSOLD = 17
+    TRADE_PROPOSED = 18
+    TRADE_ACCEPTED = 19
+    TRADE_REJECTED = 20
+    BANKRUPT = 21
+    CASH = 22
+    LEAVE_JAIL = 23
+    SELL_BUILDING = 24
+    MORTGAGE = 25
+
+
+# uid and square are -1 when they do not apply. For CARD events amount is the
+# index of the card in its BoardConfig deck and square tells which deck.
+Event = namedtuple("Event", ["kind", "uid", "square", "amount"])
+
+
+class Sink:
+    """Receives the events of one board. Subclasses override emit."""
+
+    def bind(self, board):
+        """Called once by the Board the sink is attached to."""
+
+    def emit(self, kind, uid, square, amount):
+        raise NotImplementedError
+
+    def close(self):
+        """Flush and release resources."""
+
+
+class RingBuffer(Sink):
+    """Keep the last maxlen events in memory."""
+
+    def __init__(self, maxlen=4096):
+        self.buffer = deque(maxlen=maxlen)
+
+    def emit(self, kind, uid, square, amount):
+        self.buffer.append(Event(kind, uid, square, amount))
+
+    def events(self):
+        return list(self.buffer)
+
+
+class JsonlSink(Sink):
+    """Write one JSON object per event."""
+
+    def __init__(self, fp):
+        self.fp = fp
+
+    def emit(self, kind, uid, square, amount):
+        self.fp.write(json.dumps(
+            {"kind": EventKind(kind).name, "uid": uid, "square": square, "amount": amount}
+        ))
+        self.fp.write("\n")
+
+    def close(self):
+        self.fp.flush()
+
+
+class BinarySink(Sink):
+    """Write fixed-size little-endian records: kind u8, uid i8, square i8, amount i32.
+
+    Amounts are stored as whole dollars. Read them back with read_binary."""
+
+    record = struct.Struct("<Bbbi")
+
+    def __init__(self, fp):
+        self.fp = fp
+        self._pack = self.record.pack
+
+    def emit(self, kind, uid, square, amount):
+        self.fp.write(self._pack(kind, uid, square, int(amount)))
+
+    def close(self):
+        self.fp.flush()
+
+
+def read_binary(fp):
+    """Yield the Events written by a BinarySink."""
+    size = BinarySink.record.size
+    unpack = BinarySink.record.unpack
+    while True:
+        chunk = fp.read(size)
+        if len(chunk) < size:
+            return
+        kind, uid, square, amount = unpack(chunk)
+        yield Event(EventKind(kind), uid, square, amount)
+
+
+_TEXT = {
+    EventKind.ROLL: "{player} rolls {amount}",
+    EventKind.MOVE: "{player} lands on {square}",
+    EventKind.DOUBLES: "{player} rolled doubles and goes again!",
+    EventKind.SKIP: "{player} skips their turn.",
+    EventKind.BUY: "{player} buys {square} for ${amount}",
+    EventKind.BUILD: "{player} builds on {square} for ${amount}",
+    EventKind.RENT: "{player} pays ${amount} rent on {square}",
+    EventKind.DOUBLE_RENT: "{player}'s Double Rent -> rent x2 = ${amount}",
+    EventKind.TAX: "{player} pays ${amount} tax",
+    EventKind.PASS_GO: "{player} collects ${amount} for passing Go",
+    EventKind.GO_TO_JAIL: "{player} goes directly to Jail",
+    EventKind.CARD: "{player} draws a card on {square}",
+    EventKind.AUCTION: "Auction for {square}",
+    EventKind.BID: "{player} bids ${amount}",
+    EventKind.AUCTION_PASS: "{player} passes",
+    EventKind.AUCTION_WON: "{player} wins auction for {square} at ${amount}",
+    EventKind.AUCTION_UNSOLD: "No bids for {square}, auction ends unsold",
+    EventKind.TRADE_PROPOSED: "{player} proposes a trade",
+    EventKind.TRADE_ACCEPTED: "{player} accepts the trade",
+    EventKind.TRADE_REJECTED: "{player} rejects the trade",
+    EventKind.BANKRUPT: "{player} has gone bankrupt!",
+    EventKind.CASH: "{player} receives ${amount}",
+    EventKind.LEAVE_JAIL: "{player} leaves jail paying ${amount}",
+    EventKind.SELL_BUILDING: "{player} sells a building on {square} for ${amount}",
+    EventKind.MORTGAGE: "{player} mortgages {square} for ${amount}",
+}
+
+
+class ConsoleSink(Sink):
+    """Print events as text, the way the board used to log."""
+
+    def __init__(self):
+        self.board = None
+
+    def bind(self, board):
+        self.board = board
+
+    def emit(self, kind, uid, square, amount):
+        print(format_event(Event(kind, uid, square, amount), self.board))
+
+
+def format_event(event, board=None):
+    """Return a human readable line for an event."""
+    player = square = None
+    if board is not None:
+        player = next((p for p in board.players if p.uid == event.uid), None)
+        if event.square >= 0:
+            square = board.squares[event.square]
+    return _TEXT[event.kind].format(
+        player=player if player is not None else "Player{0}".format(event.uid),
+        square=square if square is not None else "square {0}".format(event.square),
+        amount=event.amount,
+    )
@@ -0,0 +1,332 @@
+from collections import OrderedDict
+
+from engine import StateEngine
+from mcts import BID, BUILD, PURCHASE, bid_candidates
+from state import FREE, GO_TO_JAIL, NOBODY, PROPERTY, START, TAX
+
+
+def _dice_outcomes():
+    """(steps, is_double, probability) for two dice; doubles are kept apart
+    because they give the player another roll."""
+    counts = {}
+    for d1 in range(1, 7):
+        for d2 in range(1, 7):
+            key = (d1 + d2, d1 == d2)
+            counts[key] = counts.get(key, 0) + 1
+    return tuple((steps, double, n / 36.0) for (steps, double), n in sorted(counts.items()))
+
+
+DICE_OUTCOMES = _dice_outcomes()
+DOUBLES = tuple(o for o in DICE_OUTCOMES if o[1])
+NOT_DOUBLES = tuple(o for o in DICE_OUTCOMES if not o[1])
+DOUBLE_CHANCE = sum(p for _, _, p in DOUBLES)
+
+
+def net_worth_margin(state, uid, tables):
+    """Default evaluation: uid's net worth minus the best opponent's. Bankrupt
+    players are worth nothing."""
+    alive = state.alive
+    worth = state.cash.tolist()
+    owner, level, mortgaged = state.owner, state.level, state.mortgaged
+    price, house_cost, mortgage = tables.price, tables.house_cost, tables.mortgage
+    for sq in tables.buyable:
+        o = owner[sq]
+        if o != NOBODY:
+            worth[o] += price[sq] + house_cost[sq] * level[sq]
+            if mortgaged[sq]:
+                worth[o] -= mortgage[sq]
+    best = 0
+    for p, w in enumerate(worth):
+        if p != uid and alive[p] and w > best:
+            best = w
+    return (worth[uid] if alive[uid] else 0) - best
+
+
+class TranspositionTable:
+    """Bounded map from state key to value with least-recently-used eviction."""
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        entries = self.entries
+        entries[key] = value
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class Expectimax:
+    """Depth-limited expectimax over a GameState.
+
+    Every ply is one roll: a chance node over the dice sums, with doubles as
+    separate outcomes that give the same player the next ply. Jail follows
+    StateEngine: Go To Jail and a third double in a row send the player to
+    jail, where a turn is a roll that frees the player on doubles (moving but
+    not rolling again) and pays the fine after the last failed attempt. As on
+    Board, the Go salary is paid for landing on Start only.
+
+    The searching player maximises over its own buy/build choices and over
+    rolling, paying the fine or using a card in jail, in the first
+    choice_depth plies (all by default); opponents, and the searching player
+    below that, buy whatever they can afford, never build and use a card in
+    jail if they hold one, else roll. Declined squares stay unowned (auctions
+    are not searched), no cards are drawn and utility rent uses the average
+    roll of 7.
+
+    Values are cached in a TranspositionTable keyed by GameState.snapshot()
+    and the remaining depth. evaluate(state, uid, tables) scores the leaves.
+    """
+
+    def __init__(self, depth=2, evaluate=None, tt_size=100000, expected_dice=7,
+                 choice_depth=None):
+        self.depth = depth
+        self.choice_depth = depth if choice_depth is None else choice_depth
+        self.evaluate = evaluate or net_worth_margin
+        self.table = TranspositionTable(tt_size)
+        self.expected_dice = expected_dice
+        self.engine = StateEngine()
+        self.nodes = 0
+
+    def value(self, state, uid, depth):
+        """Expected value for uid of the state, with state.current to roll.
+        state is modified during the search but restored before returning."""
+        if depth == 0 or sum(state.alive) <= 1:
+            self.nodes += 1
+            return self.evaluate(state, uid, self.engine.tables)
+
+        key = (state.snapshot(), uid, depth)
+        value = self.table.get(key)
+        if value is not None:
+            return value
+
+        self.nodes += 1
+        mover = state.current
+        if state.skip[mover] > 0:
+            state.skip[mover] -= 1
+            value = self._finish(state, uid, state.positions[mover], False, depth)
+            state.skip[mover] += 1
+        elif state.jail[mover] != FREE:
+            value = self._jail_turn(state, uid, mover, depth)
+        else:
+            value = self._turn(state, uid, mover, depth)
+        self.table.put(key, value)
+        return value
+
+    def _chooses(self, mover, uid, depth):
+        """Whether mover's choices are searched at this depth."""
+        return mover == uid and self.depth - depth < self.choice_depth
+
+    def _turn(self, state, uid, mover, depth):
+        """Roll for a player out of jail."""
+        start = state.positions[mover]
+        if state.doubles == 2:
+            # a third double in a row goes straight to jail
+            state.positions[mover] = self.engine.tables.jail
+            state.jail[mover] = 0
+            value = DOUBLE_CHANCE * self._finish(state, uid, start, False, depth)
+            state.jail[mover] = FREE
+            outcomes = NOT_DOUBLES
+        else:
+            value = 0.0
+            outcomes = DICE_OUTCOMES
+        for steps, double, p in outcomes:
+            value += p * self._roll(state, uid, mover, start, steps, double, depth)
+        state.positions[mover] = start
+        return value
+
+    def _jail_turn(self, state, uid, mover, depth):
+        """A turn in jail: the searching player takes the best of rolling,
+        paying the fine and using a card, an opponent (or the searching
+        player past choice_depth) uses a card if it has one, else rolls."""
+        jail = state.jail[mover]
+        cards = self.engine.held_cards(state, mover)
+        chooses = self._chooses(mover, uid, depth)
+        value = None
+        if cards:
+            state.card_holder[cards[0]] = NOBODY
+            state.jail[mover] = FREE
+            value = self._turn(state, uid, mover, depth)
+            state.card_holder[cards[0]] = mover
+            state.jail[mover] = jail
+            if not chooses:
+                return value
+        if chooses:
+            fine = self.engine.tables.jail_fine
+            state.cash[mover] -= fine
+            state.jail[mover] = FREE
+            paid = self._turn(state, uid, mover, depth)
+            state.cash[mover] += fine
+            state.jail[mover] = jail
+            value = paid if value is None else max(value, paid)
+        rolled = self._jail_roll(state, uid, mover, depth)
+        return rolled if value is None else max(value, rolled)
+
+    def _jail_roll(self, state, uid, mover, depth):
+        """Roll to leave jail: doubles free the player, who moves without
+        rolling again; the last failed attempt pays the fine and moves."""
+        tables = self.engine.tables
+        jail = state.jail[mover]
+        start = state.positions[mover]
+        state.jail[mover] = FREE
+        value = 0.0
+        for steps, _, p in DOUBLES:
+            value += p * self._roll(state, uid, mover, start, steps, False, depth)
+        if jail + 1 >= tables.jail_attempts:
+            state.cash[mover] -= tables.jail_fine
+            for steps, _, p in NOT_DOUBLES:
+                value += p * self._roll(state, uid, mover, start, steps, False, depth)
+            state.cash[mover] += tables.jail_fine
+        else:
+            state.positions[mover] = start
+            state.jail[mover] = jail + 1
+            value += (1 - DOUBLE_CHANCE) * self._finish(state, uid, start, False, depth)
+        state.jail[mover] = jail
+        state.positions[mover] = start
+        return value
+
+    def _roll(self, state, uid, mover, start, steps, double, depth):
+        tables = self.engine.tables
+        cash, owner, level = state.cash, state.owner, state.level
+        pos = (start + steps) % tables.size
+        state.positions[mover] = pos
+        holder = owner[pos]
+        kind = tables.kind[pos]
+        finish = self._finish
+
+        if holder == mover:
+            value = finish(state, uid, pos, double, depth)
+            if (kind == PROPERTY and self._chooses(mover, uid, depth) and level[pos] < tables.max_level
+                    and cash[mover] >= tables.house_cost[pos]):
+                cost = tables.house_cost[pos]
+                cash[mover] -= cost
+                level[pos] += 1
+                value = max(value, finish(state, uid, pos, double, depth))
+                cash[mover] += cost
+                level[pos] -= 1
+            return value
+
+        if holder == NOBODY and tables.price[pos]:
+            price = tables.price[pos]
+            if cash[mover] < price:
+                return finish(state, uid, pos, double, depth)
+            cash[mover] -= price
+            owner[pos] = mover
+            value = finish(state, uid, pos, double, depth)
+            cash[mover] += price
+            owner[pos] = NOBODY
+            if self._chooses(mover, uid, depth):
+                value = max(value, finish(state, uid, pos, double, depth))
+            return value
+
+        if holder != NOBODY:
+            if state.mortgaged[pos]:
+                return finish(state, uid, pos, double, depth)
+            rent = self.engine.rent(state, pos, self.expected_dice)
+            doubled = state.double_rent[holder]
+            if doubled:
+                rent *= 2
+                state.double_rent[holder] = 0
+            cash[mover] -= rent
+            cash[holder] += rent
+            value = finish(state, uid, pos, double, depth)
+            cash[mover] += rent
+            cash[holder] -= rent
+            state.double_rent[holder] = doubled
+            return value
+
+        if kind == TAX or kind == START:
+            gain = tables.go_salary if kind == START else -tables.tax[pos]
+            cash[mover] += gain
+            value = finish(state, uid, pos, double, depth)
+            cash[mover] -= gain
+            return value
+
+        if kind == GO_TO_JAIL:
+            state.positions[mover] = tables.jail
+            state.jail[mover] = 0
+            value = finish(state, uid, pos, double, depth)
+            state.jail[mover] = FREE
+            return value
+        return finish(state, uid, pos, double, depth)
+
+    def _finish(self, state, uid, landed, double, depth):
+        """End the roll (passing the turn on unless doubles) and search on."""
+        mover = state.current
+        if double and state.jail[mover] == FREE:
+            if state.cash[mover] >= 0:
+                creditor = state.creditor[mover]
+                state.doubles += 1
+                state.creditor[mover] = NOBODY
+                value = self.value(state, uid, depth - 1)
+                state.doubles -= 1
+                state.creditor[mover] = creditor
+                return value
+            # liquidation touches too much to undo by hand
+            saved = state.copy()
+            self.engine.finish_roll(state, mover, True)
+            value = self.value(state, uid, depth - 1)
+            state.restore(saved)
+            return value
+        if state.cash[mover] < 0:
+            saved = state.copy()
+            self.engine.end_turn(state)
+            value = self.value(state, uid, depth - 1)
+            state.restore(saved)
+            return value
+        doubles = state.doubles
+        creditor = state.creditor[mover]
+        self.engine.end_turn(state)
+        value = self.value(state, uid, depth - 1)
+        state.current = mover
+        state.doubles = doubles
+        state.creditor[mover] = creditor
+        return value
+
+    def action_value(self, state, uid, kind, square, action, again=False):
+        """Value of taking action on a decision met during state.current's turn.
+        For a bid, action is the price paid if the bid wins (0 to pass); again
+        is set when the roll being resolved was a double that rolls again."""
+        state = state.copy()
+        engine = self.engine
+        if kind == PURCHASE and action:
+            state.cash[uid] -= engine.tables.price[square]
+            state.owner[square] = uid
+        elif kind == BUILD and action:
+            engine.buy_house(state, uid, square)
+        elif kind == BID and action:
+            state.cash[uid] -= action
+            state.owner[square] = uid
+        engine.finish_roll(state, state.current, again)
+        return self.value(state, uid, self.depth)
+
+    def best_action(self, state, uid, kind, square, current_bids=None, again=False):
+        if kind == BID:
+            # value only falls as the price rises: take the highest bid that
+            # still beats passing
+            bids = bid_candidates(self.engine.tables.price[square], state.cash[uid],
+                                  current_bids or {})
+            passing = self.action_value(state, uid, kind, square, 0, again)
+            for bid in reversed(bids[1:]):
+                if self.action_value(state, uid, kind, square, bid, again) > passing:
+                    return bid
+            return 0
+        return (self.action_value(state, uid, kind, square, True, again)
+                > self.action_value(state, uid, kind, square, False, again))
@@ -1,48 +1,106 @@
 
-import pickle
-import pygame
+import savegame
 from board import Board
+from events import ConsoleSink
+from spectator import Spectator
+from squares import Property
 from strategy import HumanRandom
+from termination import LAST_STANDING
+
+SAVE_PATH = "savegame.sav"
+FPS = 30
+
+# imported by Game._init_ui, so that importing this module (e.g. for Board or
+# savegame) needs neither pygame nor SDL
+pygame = None
+
+
+def _import_pygame():
+    global pygame
+    if pygame is None:
+        import pygame as module
+        pygame = module
+    return pygame
+
 
 class Game:
-    def __init__(self, num_players=4, strategies=None):
-        if strategies is None:
-            strategies = [HumanRandom() for _ in range(num_players)]
-        self.board = Board(num_players=num_players, strategies=strategies)
+    def __init__(self, num_players=4, strategies=None, referee=None, board=None):
+        if board is None:
+            if strategies is None:
+                strategies = [HumanRandom() for _ in range(num_players)]
+            board = Board(num_players=num_players, strategies=strategies,
+                          events=ConsoleSink())
+        self.board = board
         self.last_roll = (0, 0)
         self.last_message = ""
+        # an optional termination.Referee ending games nobody wins outright
+        self.referee = referee
+        # play a turn every frame instead of waiting for SPACE ("a" toggles)
+        self.autoplay = False
+        # the spectator.Frame shown by watch(), None when drawing the board
+        self._frame = None
+
+    def save(self, path=SAVE_PATH):
+        """Save the game (board and players only) to path."""
+        savegame.save_file(path, [self.board])
+
+    @classmethod
+    def load(cls, path=SAVE_PATH, strategies=None, referee=None):
+        """Continue the first game saved at path."""
+        board = savegame.load_file(path, strategies, events=ConsoleSink())[0]
+        return cls(strategies=strategies, referee=referee, board=board)
+
+    def _play_turn(self):
+        """Play the next turn on SPACE and return the dice."""
+        return self.board.play_single_turn()
+
+    def _end_message(self, reason):
+        if reason == LAST_STANDING:
+            return f"🎉 {self.board.players[0]} wins! 🎉"
+        return self._adjudicated_message(reason)
+
+    def _adjudicated_message(self, reason):
+        winner = self.referee.adjudicate(self.board)
+        for player in self.board.players:
+            if player.uid == winner:
+                return f"Game over ({reason}): {player} wins on net worth"
+        return f"Game over ({reason}): a draw"
 
     def _init_ui(self):
+        _import_pygame()
+        from atlas import load_atlas
+
         pygame.init()
         self.screen = pygame.display.set_mode((800, 800))
         pygame.display.set_caption("AI‐Monopoly")
         self.clock = pygame.time.Clock()
 
-        # Board
-        bg = pygame.image.load("assets/board.png").convert_alpha()
-        self.board_image = pygame.transform.smoothscale(bg, (800, 800))
-
-        # Tokens
-        self.token_images = []
-        for p in ("red", "blue", "green", "yellow"):
-            img = pygame.image.load(f"assets/token_{p}.png").convert_alpha()
-            self.token_images.append(pygame.transform.smoothscale(img, (30, 30)))
-
-        # House/Hotel
-        h = pygame.image.load("assets/house.png").convert_alpha()
-        self.house_image = pygame.transform.smoothscale(h, (20, 20))
-        h2 = pygame.image.load("assets/hotel.png").convert_alpha()
-        self.hotel_image = pygame.transform.smoothscale(h2, (25, 25))
-
-        # Dice
-        self.dice_images = []
-        for i in range(1, 7):
-            d = pygame.image.load(f"assets/dice_{i}.png").convert_alpha()
-            self.dice_images.append(pygame.transform.smoothscale(d, (40, 40)))
+        # Sprites, pre-scaled in one cached atlas
+        sprites = load_atlas("assets")
+        self.board_image = sprites["board"]
+        self.token_images = [sprites[f"token_{p}"] for p in ("red", "blue", "green", "yellow")]
+        self.house_image = sprites["house"]
+        self.hotel_image = sprites["hotel"]
+        self.dice_images = [sprites[f"dice_{i}"] for i in range(1, 7)]
 
         # Font
         self.font = pygame.font.SysFont(None, 24)
 
+        # screen coordinates, looked up by _draw_board: per square the tile,
+        # per square and token slot the token, per square the house and
+        # hotel spots
+        tiles = [self._get_tile_pos(i) for i in range(len(self.board.squares))]
+        self._token_slots = tuple(
+            tuple((x+8*i, y+8*i) for i in range(len(self.token_images))) for x, y in tiles)
+        self._house_slots = tuple(tuple((x+5+12*h, y+5) for h in range(4)) for x, y in tiles)
+        self._hotel_slots = tuple((x+5, y+20) for x, y in tiles)
+
+        # retained layers for _draw_board
+        self._property_squares = self.board.index.indices_of(Property)
+        self._static = None
+        self._buildings = None
+        self._sprites = []
+
     def _get_tile_pos(self, idx):
         size, edge = 800, 800//11
         if idx <= 10:
@@ -53,62 +111,163 @@ class Game:
             return edge*(idx-20), 0
         return size-edge, edge*(idx-30)
 
+    def _building_key(self):
+        """(houses, hotels) on every property, from the frame in watch()."""
+        if self._frame is None:
+            squares = self.board.squares
+            return tuple((squares[i].house_count, squares[i].hotel_count)
+                         for i in self._property_squares)
+        built = {}
+        for saved in self._frame.snapshot.players:
+            for idx, houses, hotels, _ in saved.squares:
+                built[idx] = (houses, hotels)
+        return tuple(built.get(i, (0, 0)) for i in self._property_squares)
+
+    def _token_positions(self):
+        if self._frame is None:
+            return self.board.positions
+        return [saved.position for saved in self._frame.snapshot.players]
+
+    def _compose_static(self, buildings):
+        """Pre-composite the board image and the buildings into one surface."""
+        static = self.board_image.convert()
+        house, hotel = self.house_image, self.hotel_image
+        for idx, (houses, hotels) in zip(self._property_squares, buildings):
+            for spot in self._house_slots[idx][:houses]:
+                static.blit(house, spot)
+            if hotels:
+                static.blit(hotel, self._hotel_slots[idx])
+        self._static = static
+
     def _draw_board(self):
-        self.screen.blit(self.board_image, (0, 0))
+        """Draw the frame, updating only the rects that changed.
 
+        The board and buildings come from the static layer, rebuilt when a
+        building changes (or _buildings is reset, e.g. on expose). Otherwise
+        only the rects of the tokens, dice and text of the last frame are
+        restored from it before drawing the new ones.
+        """
+        screen = self.screen
+        key = self._building_key()
+        if key != self._buildings:
+            self._buildings = key
+            self._compose_static(key)
+            screen.blit(self._static, (0, 0))
+            dirty = [screen.get_rect()]
+        else:
+            dirty = self._sprites
+            for rect in dirty:
+                screen.blit(self._static, rect, rect)
+
+        sprites = []
         # tokens
-        for i, pl in enumerate(self.board.players):
-            x,y = self._get_tile_pos(self.board.positions[i])
-            self.screen.blit(self.token_images[i], (x+8*i, y+8*i))
-
-        # houses/hotels
-        for idx, sq in enumerate(self.board.squares):
-            x,y = self._get_tile_pos(idx)
-            if hasattr(sq, "house_count") and sq.house_count>0:
-                for h in range(sq.house_count):
-                    self.screen.blit(self.house_image, (x+5+12*h, y+5))
-            if hasattr(sq, "hotel_count") and sq.hotel_count>0:
-                self.screen.blit(self.hotel_image, (x+5, y+20))
+        slots, images = self._token_slots, self.token_images
+        for i, pos in enumerate(self._token_positions()):
+            sprites.append(screen.blit(images[i], slots[pos][i]))
 
         # dice
         d1,d2 = self.last_roll
         if d1>0:
-            self.screen.blit(self.dice_images[d1-1], (10,10))
-            self.screen.blit(self.dice_images[d2-1], (60,10))
+            sprites.append(screen.blit(self.dice_images[d1-1], (10,10)))
+            sprites.append(screen.blit(self.dice_images[d2-1], (60,10)))
 
         # move text
         if self.last_message:
             txt = self.font.render(self.last_message, True, (0,0,0))
-            self.screen.blit(txt, (10,760))
+            sprites.append(screen.blit(txt, (10,760)))
+
+        self._sprites = sprites
+        pygame.display.update(dirty + sprites)
 
-        pygame.display.flip()
+    def _advance(self):
+        """Play a turn; return False once the game is over."""
+        self.last_roll = self._play_turn()
+        self.last_message = self.board.last_move_msg
+        if len(self.board.players) == 1:
+            self.last_message = self._end_message(LAST_STANDING)
+            return False
+        if self.referee is not None:
+            reason = self.referee.observe(self.board)
+            if reason is not None:
+                self.last_message = self._adjudicated_message(reason)
+                return False
+        return True
 
     def run(self):
         self._init_ui()
+        if self.referee is not None:
+            self.referee.start()
         running = True
+        # nothing is drawn while nothing changes
+        changed = True
         while running:
             for ev in pygame.event.get():
                 if ev.type == pygame.QUIT:
                     running = False
-                if ev.type == pygame.KEYDOWN and ev.key == pygame.K_SPACE:
-                    self.last_roll = self.board.play_single_turn()
-                    self.last_message = self.board.last_move_msg
-                    if len(self.board.players) == 1:
-                        self.last_message = f"🎉 {self.board.players[0]} wins! 🎉"
-                        running = False
+                elif ev.type == pygame.VIDEOEXPOSE:
+                    self._buildings = None
+                    changed = True
+                elif ev.type == pygame.KEYDOWN and ev.key == pygame.K_s:
+                    self.save()
+                    self.last_message = f"Game saved to {SAVE_PATH}"
+                    changed = True
+                elif ev.type == pygame.KEYDOWN and ev.key == pygame.K_a:
+                    self.autoplay = not self.autoplay
+                elif ev.type == pygame.KEYDOWN and ev.key == pygame.K_SPACE:
+                    running = self._advance()
+                    changed = True
+            if running and self.autoplay:
+                running = self._advance()
+                changed = True
 
-            self._draw_board()
-            self.clock.tick(30)
+            if changed:
+                self._draw_board()
+                changed = False
+            self.clock.tick(FPS)
+
+        pygame.quit()
+
+    def watch(self, turns_per_sec=None, log=False):
+        """Spectator mode: a background Spectator plays the game, turns_per_sec
+        turns a second or as fast as possible, while the window shows its
+        latest frame at FPS. The board's event sink is detached meanwhile
+        unless log is set. Close the window to stop."""
+        self._init_ui()
+        events = self.board.events
+        if not log:
+            self.board.events = None
+        spectator = Spectator(self.board, turns_per_sec, self.referee, self._play_turn)
+        spectator.start()
+        shown = None
+        running = True
+        while running:
+            for ev in pygame.event.get():
+                if ev.type == pygame.QUIT:
+                    running = False
+                elif ev.type == pygame.VIDEOEXPOSE:
+                    self._buildings = None
+                    shown = None
+            frame = spectator.frame
+            if frame is not shown:
+                shown = self._frame = frame
+                self.last_roll = frame.roll
+                self.last_message = frame.message
+                if frame.reason is not None:
+                    self.last_message = self._end_message(frame.reason)
+                self._draw_board()
+            self.clock.tick(FPS)
 
+        spectator.stop()
+        self._frame = None
+        self.board.events = events
         pygame.quit()
 
 if __name__=="__main__":
     choice = input("Load saved game? (y/n): ")
     if choice.lower().startswith("y"):
         try:
-            with open("savegame.pkl","rb") as f:
-                game = pickle.load(f)
-        except FileNotFoundError:
+            game = Game.load()
+        except (FileNotFoundError, savegame.SaveGameError):
             num = int(input("Number of players? "))
             game = Game(num_players=num)
     else:
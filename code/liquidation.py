@@ -0,0 +1,59 @@
+SELL_BUILDING = 0
+MORTGAGE = 1
+
+
+def _smallest_cover(values, need):
+    """Indices of the subset of values with the smallest sum >= need (the sum
+    of all values must reach need)."""
+    # reach[i] has bit s set when sum s is reachable with the first i values
+    reach = [1]
+    for v in values:
+        reach.append(reach[-1] | (reach[-1] << v))
+    above = reach[-1] >> need
+    total = need + (above & -above).bit_length() - 1
+    chosen = []
+    for i in range(len(values) - 1, -1, -1):
+        if not (reach[i] >> total) & 1:
+            chosen.append(i)
+            total -= values[i]
+    return chosen[::-1]
+
+
+def plan_liquidation(holdings, need, tables):
+    """Choose the sales and mortgages that raise need for one player.
+
+    holdings are (square, building level, mortgaged) for every square the
+    player owns; tables is a BoardTables. Returns (actions, raised) where
+    actions is a list of (SELL_BUILDING or MORTGAGE, square) to apply in
+    order. When raised < need the player cannot pay and everything has been
+    sold and mortgaged.
+
+    Mortgages come first since their value comes back when they are lifted,
+    and the set mortgaged is the one overshooting the debt the least. Only
+    when all of them fall short are buildings sold, one level at a time for
+    half their cost, cheapest buildings first; a square left without
+    buildings is mortgaged before moving on.
+    """
+    if need <= 0:
+        return [], 0
+    house_cost, mortgage = tables.house_cost, tables.mortgage
+    bare = sorted(sq for sq, level, mortgaged in holdings if not level and not mortgaged)
+    values = [mortgage[sq] for sq in bare]
+    if sum(values) >= need:
+        chosen = [bare[i] for i in _smallest_cover(values, need)]
+        return [(MORTGAGE, sq) for sq in chosen], sum(mortgage[sq] for sq in chosen)
+
+    actions = [(MORTGAGE, sq) for sq in bare]
+    raised = sum(values)
+    built = sorted((house_cost[sq], sq, level) for sq, level, _ in holdings if level)
+    for cost, sq, level in built:
+        for _ in range(level):
+            if raised >= need:
+                return actions, raised
+            actions.append((SELL_BUILDING, sq))
+            raised += cost // 2
+        if raised >= need:
+            return actions, raised
+        actions.append((MORTGAGE, sq))
+        raised += mortgage[sq]
+    return actions, raised
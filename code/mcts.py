@@ -0,0 +1,291 @@
+import math
+import multiprocessing
+import random
+import time
+
+from engine import RandomPolicy, StateEngine
+from state import GameState
+from strategy import BID, BUILD, PURCHASE
+
+BID_FRACTIONS = (0.5, 0.75, 1.0, 1.25)
+
+
+def bid_candidates(price, cash, current_bids):
+    """Bids worth considering: passing, or a fraction of the price that beats
+    the highest bid and is affordable."""
+    top = max(current_bids.values(), default=0)
+    bids = {int(price * f) for f in BID_FRACTIONS}
+    return [0] + sorted(b for b in bids if top < b <= cash)
+
+
+def decision_actions(kind, engine, state, uid, square, current_bids=None):
+    """Legal actions for a decision of the given kind."""
+    if kind == BID:
+        return bid_candidates(engine.tables.price[square], state.cash[uid],
+                              current_bids or {})
+    return [False, True]
+
+
+class Node:
+    """Statistics of one action sequence of the searching player."""
+
+    __slots__ = ("visits", "value", "children")
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0
+        self.children = {}
+
+
+class _TreePolicy:
+    """Policy of the searching player during a simulation.
+
+    While the simulation is inside the tree the decisions follow UCB1; the
+    first decision outside it expands a node, then default takes over.
+    """
+
+    def __init__(self, search, default):
+        self.search = search
+        self.default = default
+        self.node = None
+        self.path = None
+
+    def _choose(self, kind, engine, state, uid, square, current_bids=None):
+        if self.node is None:
+            return None
+        actions = decision_actions(kind, engine, state, uid, square, current_bids)
+        if len(actions) == 1:
+            return actions[0]
+        action, self.node = self.search.select(self.node, kind, actions)
+        self.path.append(self.node)
+        if self.node.visits == 0:
+            self.node = None
+        return action
+
+    def decide_purchase(self, engine, state, uid, square):
+        action = self._choose(PURCHASE, engine, state, uid, square)
+        if action is None:
+            return self.default.decide_purchase(engine, state, uid, square)
+        return action
+
+    def decide_bid_auction(self, engine, state, uid, square, current_bids):
+        action = self._choose(BID, engine, state, uid, square, current_bids)
+        if action is None:
+            return self.default.decide_bid_auction(engine, state, uid, square, current_bids)
+        return action
+
+    def decide_build_house(self, engine, state, uid, square):
+        action = self._choose(BUILD, engine, state, uid, square)
+        if action is None:
+            return self.default.decide_build_house(engine, state, uid, square)
+        return action
+
+    def decide_leave_jail(self, engine, state, uid):
+        return self.default.decide_leave_jail(engine, state, uid)
+
+
+class _FixedBid:
+    """Bid a fixed amount once, then drop out of the auction."""
+
+    def __init__(self, amount):
+        self.amount = amount
+
+    def decide_bid_auction(self, engine, state, uid, square, current_bids):
+        return self.amount
+
+
+class MCTS:
+    """Open-loop Monte Carlo Tree Search over a GameState.
+
+    The tree holds the searching player's own decisions (keyed by decision
+    kind and action); dice and opponents are sampled by the StateEngine. Each
+    iteration copies the root state, applies a root action, follows the tree
+    with UCB1, expands one node, then rolls out rollout_turns turns with the
+    default policy. The result is the player's share of the net worth of the
+    players still alive (1 for a win, 0 when bankrupt).
+
+    The search stops after iterations rollouts or time_limit_ms milliseconds,
+    whichever comes first; either may be None.
+    """
+
+    def __init__(self, iterations=100, time_limit_ms=None, exploration=1.4,
+                 rollout_turns=50, policy=None, seed=None):
+        if iterations is None and time_limit_ms is None:
+            raise ValueError("MCTS needs an iteration budget or a time limit")
+        self.iterations = iterations
+        self.time_limit_ms = time_limit_ms
+        self.exploration = exploration
+        self.rollout_turns = rollout_turns
+        self.policy = policy or RandomPolicy()
+        self.rng = random.Random(seed)
+        self.rollouts = 0
+        self.elapsed = 0.0
+
+    @property
+    def rollouts_per_sec(self):
+        if self.elapsed <= 0:
+            return 0.0
+        return self.rollouts / self.elapsed
+
+    def select(self, node, kind, actions):
+        """Pick an action by UCB1 (unvisited first) and return (action, child)."""
+        children = node.children
+        log_n = math.log(node.visits or 1)
+        best, best_score, best_child = None, -1.0, None
+        for action in actions:
+            child = children.get((kind, action))
+            if child is None:
+                child = children[(kind, action)] = Node()
+            if child.visits == 0:
+                return action, child
+            score = (child.value / child.visits
+                     + self.exploration * math.sqrt(log_n / child.visits))
+            if score > best_score:
+                best, best_score, best_child = action, score, child
+        return best, best_child
+
+    def evaluate(self, state, uid, tables):
+        if not state.alive[uid]:
+            return 0.0
+        alive = state.alive_players()
+        if len(alive) == 1:
+            return 1.0
+        mine = max(state.net_worth(uid, tables), 0)
+        total = sum(max(state.net_worth(p, tables), 0) for p in alive)
+        return mine / total if total else 0.0
+
+    def search(self, state, uid, kind, square, current_bids=None, again=False):
+        """Search a decision of player uid on square and return the root Node.
+
+        state is taken at the decision point: the mover has landed and, for a
+        bid, current_bids (uid -> bid) holds the auction so far. again is set
+        when the mover's roll was a double that gives another roll.
+        """
+        tree = _TreePolicy(self, self.policy)
+        policies = [self.policy] * state.n_players
+        policies[uid] = tree
+        engine = StateEngine(policies, rng=self.rng)
+        actions = decision_actions(kind, engine, state, uid, square, current_bids)
+
+        root = Node()
+        start = time.perf_counter()
+        deadline = None
+        if self.time_limit_ms is not None:
+            deadline = start + self.time_limit_ms / 1000.0
+        done = 0
+        while self.iterations is None or done < self.iterations:
+            if deadline is not None and done and time.perf_counter() >= deadline:
+                break
+            sim = state.copy()
+            action, child = self.select(root, kind, actions)
+            tree.node = child if child.visits else None
+            tree.path = [child]
+            self._apply(engine, sim, uid, kind, square, action, current_bids, again)
+            for _ in range(self.rollout_turns):
+                if sum(sim.alive) <= 1:
+                    break
+                engine.play_turn(sim)
+            value = self.evaluate(sim, uid, engine.tables)
+            root.visits += 1
+            root.value += value
+            for node in tree.path:
+                node.visits += 1
+                node.value += value
+            done += 1
+
+        self.rollouts += done
+        self.elapsed += time.perf_counter() - start
+        return root
+
+    def _apply(self, engine, state, uid, kind, square, action, current_bids, again):
+        """Play the root action and finish the roll it was taken in."""
+        if kind == PURCHASE:
+            if action:
+                state.cash[uid] -= engine.tables.price[square]
+                state.owner[square] = uid
+            else:
+                engine.auction(state, square)
+        elif kind == BUILD:
+            if action:
+                engine.buy_house(state, uid, square)
+        else:
+            tree = engine.policies[uid]
+            engine.policies[uid] = _FixedBid(action)
+            engine.auction(state, square, current_bids)
+            engine.policies[uid] = tree
+        engine.finish_roll(state, state.current, again)
+
+    def best_action(self, state, uid, kind, square, current_bids=None, again=False):
+        """Search and return the most visited root action."""
+        root = self.search(state, uid, kind, square, current_bids, again)
+        best = max(root.children.items(), key=lambda item: item[1].visits)
+        return best[0][1]
+
+
+def _search_snapshot(task):
+    """Pool worker: rebuild the state, search it, return the root statistics."""
+    (snapshot, uid, kind, square, current_bids, again, iterations, time_limit_ms,
+     exploration, rollout_turns, policy, seed) = task
+    search = MCTS(iterations, time_limit_ms, exploration, rollout_turns, policy, seed)
+    root = search.search(GameState.from_snapshot(snapshot), uid, kind, square,
+                         current_bids, again)
+    stats = {key: (child.visits, child.value) for key, child in root.children.items()}
+    return stats, search.rollouts
+
+
+class RootParallelMCTS(MCTS):
+    """Root-parallel MCTS: every worker process searches its own tree from the
+    same state snapshot with its own seed and the full budget, and the root
+    visit counts are summed. The pool is created on first use and kept for
+    later decisions; call close() when done.
+
+    Inside a daemonic process (e.g. a Tournament worker) a pool cannot be
+    started, so the search runs in-process instead.
+    """
+
+    def __init__(self, workers=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.workers = workers or multiprocessing.cpu_count()
+        self._pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def best_action(self, state, uid, kind, square, current_bids=None, again=False):
+        if multiprocessing.current_process().daemon:
+            return super().best_action(state, uid, kind, square, current_bids, again)
+
+        snapshot = state.snapshot()
+        tasks = [
+            (snapshot, uid, kind, square, current_bids, again, self.iterations,
+             self.time_limit_ms, self.exploration, self.rollout_turns, self.policy,
+             self.rng.getrandbits(64))
+            for _ in range(self.workers)
+        ]
+        start = time.perf_counter()
+        visits = {}
+        for stats, rollouts in self._get_pool().map(_search_snapshot, tasks):
+            self.rollouts += rollouts
+            for key, (n, _value) in stats.items():
+                visits[key] = visits.get(key, 0) + n
+        self.elapsed += time.perf_counter() - start
+        return max(visits, key=visits.get)[1]
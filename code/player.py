@@ -21,19 +21,49 @@ class Player:
         self.cash = 1500
         self.property_list = []
         self.cards = []
+
+        # running totals over property_list, kept by add_property,
+        # remove_property and add_building
+        self.houses = 0
+        self.hotels = 0
+        self.utilities = 0
+        self.railroads = 0
+        self.group_counts = {}
+        self.monopolies = set()
         self.skip_next_turns = 0
         self.double_rent = False
+        # None when free, else the failed attempts at leaving jail
+        self.in_jail_count = None
+        # player owed money when cash went negative, None for the bank
+        self.creditor = None
 
     def transfer(self, amount):
         self.cash += amount
     def will_bankrupt(self, amount):
-        """Check if a user is bankrupt."""
-        if self.cash + amount >= 0:
-            return False
-
-        # TODO: try to solve bankruptcy using a mortgage or selling items
-
-        return True
+        """Check if a user would go bankrupt, even after selling buildings
+        and mortgaging everything."""
+        return self.cash + amount + self.liquidation_value() < 0
+
+    def liquidation_value(self):
+        """Cash raised by selling every building and mortgaging every square."""
+        value = 0
+        for square in self.property_list:
+            if not square.mortgaged:
+                value += square.mortgage
+            if square.building_level():
+                value += square.building_level() * square.building_costs // 2
+        return value
+
+    def net_worth(self):
+        """Cash plus purchase price of squares and buildings, less mortgages."""
+        worth = self.cash
+        for square in self.property_list:
+            worth += square.price
+            if square.building_level():
+                worth += square.building_level() * square.building_costs
+            if square.mortgaged:
+                worth -= square.mortgage
+        return worth
 
     def set_bankrupt(self, board, player):
         """The player will become bankrupt."""
@@ -56,7 +86,7 @@ class Player:
 
     def count_failed_attempts_fail(self):
         """Return the number of failed attempts at leaving jail."""
-        return self.in_jail
+        return self.in_jail_count
 
     def leave_jail(self):
         """The user leaves jail."""
@@ -66,6 +96,13 @@ class Player:
         """Add a card."""
         self.cards.append(card)
 
+    def has_jail_card(self):
+        """Does the player hold a Get Out of Jail Free card?"""
+        # cards imports this module
+        from cards import GetOutJailFree
+
+        return any(isinstance(card, GetOutJailFree) for card in self.cards)
+
     def has_card(self, card_class):
         """Determine if the user has a card."""
         for i in range(len(self.cards)):
@@ -85,20 +122,43 @@ class Player:
     def add_property(self, square):
         """Add a property to the user."""
         self.property_list.append(square)
+        self._count_property(square, 1)
+
+    def remove_property(self, square):
+        """Remove a property from the user."""
+        self.property_list.remove(square)
+        self._count_property(square, -1)
+
+    def _count_property(self, square, sign):
+        self.houses += sign * square.count_houses()
+        self.hotels += sign * square.count_hotels()
+        if square.counter is not None:
+            setattr(self, square.counter, getattr(self, square.counter) + sign)
+        group = getattr(square, "property_group", None)
+        if group is not None:
+            count = self.group_counts.get(group, 0) + sign
+            self.group_counts[group] = count
+            if count == len(group.property_list):
+                self.monopolies.add(group)
+            else:
+                self.monopolies.discard(group)
+
+    def add_building(self, houses, hotels):
+        """Record houses and hotels built (or removed) on owned squares."""
+        self.houses += houses
+        self.hotels += hotels
+
+    def has_monopoly(self, group):
+        """Does the user own every property of the group."""
+        return group in self.monopolies
 
     def count_houses(self):
         """Count the houses of a player."""
-        result = 0
-        for p in self.property_list:
-            result += p.count_houses()
-        return result
+        return self.houses
 
     def count_hotels(self):
         """Count the hotels of a player."""
-        result = 0
-        for p in self.property_list:
-            result += p.count_hotels()
-        return result
+        return self.hotels
 
     def min_cash_threshold(self):
         return 200
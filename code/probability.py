@@ -0,0 +1,222 @@
+import numpy as np
+
+from board_config import BoardConfig
+from board_index import BoardIndex
+from rent import COUNTS, LEVELS, RentTable
+from cards import (
+    AdvanceIllinois,
+    AdvanceRailroad,
+    AdvanceStCharlesPlace,
+    AdvanceToGo,
+    AdvanceUtility,
+    GoBack3Spaces,
+    GoToJailCard,
+    TripBoardwalk,
+    TripReadingTrainStation,
+)
+from squares import Chance, CommunityChest, GoToJail, Start, TrainStation, Utility
+
+# a third double in a row sends the player to jail
+MAX_DOUBLES = 3
+
+# cards that move the token to a named square
+_CARD_SQUARE = {
+    AdvanceIllinois: "Illinois Avenue",
+    AdvanceStCharlesPlace: "St. Charles Place",
+    TripReadingTrainStation: "Reading Railroad",
+    TripBoardwalk: "Boardwalk",
+}
+# cards that move the token to the next square of a class
+_CARD_NEAREST = {
+    AdvanceToGo: Start,
+    AdvanceUtility: Utility,
+    AdvanceRailroad: TrainStation,
+}
+
+
+def dice_distribution():
+    """Return (non_doubles, doubles): probability of each sum 0..12 for two dice."""
+    plain = np.zeros(13)
+    doubles = np.zeros(13)
+    for d1 in range(1, 7):
+        for d2 in range(1, 7):
+            (doubles if d1 == d2 else plain)[d1 + d2] += 1 / 36.0
+    return plain, doubles
+
+
+class LandingModel:
+    """Markov chain of token movement for a board configuration.
+
+    A state is (square, doubles rolled so far this turn), or in jail after
+    some failed attempts at leaving, and one step is one roll. Landing on Go
+    To Jail, drawing a Go to Jail card or rolling a third double sends the
+    token to jail and ends the turn; a double that just ends on Jail,
+    visiting, keeps the count. A jailed player rolls to leave (never paying
+    early): doubles move the token without another roll, and the
+    Jail.max_attempts-th failed roll pays the fine and moves. Chance and
+    Community Chest squares move the token as the movement cards in their
+    decks do, each card being equally likely.
+
+    landing[i] is the long-run probability that a roll ends on square i, a
+    roll that stays in jail ending on Jail.
+    """
+
+    _cache = {}
+
+    def __init__(self, config=BoardConfig):
+        squares = config.squares
+        self.size = n = len(squares)
+        self.index = BoardIndex.for_config(config)
+        self.jail = self.index.jail
+        self.attempts = squares[self.jail].max_attempts
+        visit, self.jailed = self._redirect_matrices(config)
+        self.redirect = visit + self.jailed
+        self.transition = self._transition_matrix()
+        self.stationary = self._stationary(self.transition)
+        self.landing = self._squares(self.stationary)
+        self.rents = RentTable.for_config(config)
+        self.rent_table = self._rent_table(self.rents)
+        self.expected_rent = self.landing[:, None, None] * self.rent_table
+
+    @classmethod
+    def for_config(cls, config=BoardConfig):
+        """Return the model of a BoardConfig class, built once."""
+        model = cls._cache.get(config)
+        if model is None:
+            model = cls._cache[config] = cls(config)
+        return model
+
+    def _card_target(self, card, index):
+        """Square a card drawn on index moves the token to, or None."""
+        if isinstance(card, GoToJailCard):
+            return self.jail
+        if isinstance(card, GoBack3Spaces):
+            return (index - 3) % self.size
+        for klass, name in _CARD_SQUARE.items():
+            if isinstance(card, klass):
+                return self.index.by_name[name]
+        for klass, target in _CARD_NEAREST.items():
+            if isinstance(card, klass):
+                return self.index.next_of_class(target, index)
+        return None
+
+    def _redirect_matrices(self, config):
+        """(V, J): V[i, j] is the probability that arriving on i leaves the
+        token on j, J[i, jail] that it sends the token to jail."""
+        squares = config.squares
+        n = self.size
+
+        def resolve(i, depth):
+            row = np.zeros(2 * n)
+            sq = squares[i]
+            if isinstance(sq, GoToJail):
+                row[n + self.jail] = 1.0
+                return row
+            if isinstance(sq, Chance):
+                deck = config.chance_cards
+            elif isinstance(sq, CommunityChest):
+                deck = config.community_cards
+            else:
+                deck = ()
+            if not deck or depth == 0:
+                row[i] = 1.0
+                return row
+            for card in deck:
+                target = self._card_target(card, i)
+                if isinstance(card, GoToJailCard):
+                    row[n + self.jail] += 1.0 / len(deck)
+                elif target is None:
+                    row[i] += 1.0 / len(deck)
+                else:
+                    # GoBack3Spaces may land on another card square
+                    row += resolve(target, depth - 1) / len(deck)
+            return row
+
+        rows = np.array([resolve(i, 2) for i in range(n)])
+        return rows[:, :n], rows[:, n:]
+
+    def _transition_matrix(self):
+        """States (square, streak) come first, at streak * size + square,
+        then the jail states after 0..attempts-1 failed rolls."""
+        n = self.size
+        jail = self.jail
+        plain, doubles = dice_distribution()
+        visit, jailed = self.redirect - self.jailed, self.jailed
+        shift = np.zeros((13, n, n))
+        shift_jailed = np.zeros((13, n, n))
+        for steps in range(2, 13):
+            roll = np.roll(np.eye(n), steps, axis=1)
+            shift[steps] = roll @ visit
+            shift_jailed[steps] = roll @ jailed
+        plain_move = np.tensordot(plain, shift, axes=1)
+        plain_jailed = np.tensordot(plain, shift_jailed, axes=1)[:, jail]
+        double_move = np.tensordot(doubles, shift, axes=1)
+        # being sent to jail ends the turn, so such a double resets the
+        # count; a double that ends on Jail visiting rolls again
+        double_jailed = np.tensordot(doubles, shift_jailed, axes=1)[:, jail]
+
+        in_jail = MAX_DOUBLES * n
+        p = np.zeros((in_jail + self.attempts, in_jail + self.attempts))
+        for streak in range(MAX_DOUBLES):
+            rows = slice(streak * n, (streak + 1) * n)
+            p[rows, 0:n] += plain_move
+            p[rows, in_jail] += plain_jailed
+            if streak + 1 < MAX_DOUBLES:
+                p[rows, (streak + 1) * n:(streak + 2) * n] += double_move
+                p[rows, in_jail] += double_jailed
+            else:
+                p[rows, in_jail] += doubles.sum()
+        for failed in range(self.attempts):
+            row = in_jail + failed
+            # doubles leave jail without another roll
+            p[row, 0:n] += double_move[jail]
+            p[row, in_jail] += double_jailed[jail]
+            if failed + 1 < self.attempts:
+                p[row, row + 1] += plain.sum()
+            else:
+                # the last failed roll pays the fine and moves
+                p[row, 0:n] += plain_move[jail]
+                p[row, in_jail] += plain_jailed[jail]
+        return p
+
+    def _squares(self, dist):
+        """Fold a distribution over chain states onto the squares."""
+        n = self.size
+        squares = dist[:MAX_DOUBLES * n].reshape(MAX_DOUBLES, n).sum(axis=0)
+        squares[self.jail] += dist[MAX_DOUBLES * n:].sum()
+        return squares
+
+    @staticmethod
+    def _stationary(p):
+        """Solve pi P = pi with sum(pi) = 1."""
+        m = p.shape[0]
+        a = np.vstack([p.T - np.eye(m), np.ones(m)])
+        b = np.zeros(m + 1)
+        b[-1] = 1.0
+        pi, *_ = np.linalg.lstsq(a, b, rcond=None)
+        pi = np.clip(pi, 0.0, None)
+        return pi / pi.sum()
+
+    @staticmethod
+    def _rent_table(rents):
+        """rent_table[i, level, count]: rent on square i at a building level
+        with count squares of its group owned, as rents (a rent.RentTable)
+        charges it; utilities at the average roll of 7."""
+        table = np.asarray(rents.table, dtype=float).reshape(rents.size, LEVELS, COUNTS)
+        table[np.asarray(rents.per_roll)] *= 7
+        return table
+
+    def distribution_after(self, square, rolls=1):
+        """Probability of each square after a number of rolls from square (with
+        no doubles rolled yet)."""
+        start = np.zeros(self.transition.shape[0])
+        start[square] = 1.0
+        return self._squares(start @ np.linalg.matrix_power(self.transition, rolls))
+
+    def expected_rent_per_roll(self, square, level=0, count=None):
+        """Rent a square earns per opponent roll, at a building level with
+        count squares of its group owned (by default the whole group, so a
+        street without buildings charges its monopoly rent)."""
+        if count is None:
+            count = len(self.rents.members[square])
+        return float(self.expected_rent[square, level, count])
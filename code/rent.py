@@ -0,0 +1,118 @@
+from board_config import BoardConfig
+from board_index import BoardIndex
+from squares import Property, TrainStation, Utility
+
+# building levels 0-4 houses, 5 a hotel
+LEVELS = 6
+# squares of its group the owner holds, 0-4
+COUNTS = 5
+
+
+class RentTable:
+    """Rent of every square as one flat table.
+
+    table[(square * LEVELS + level) * COUNTS + count] is the rent on square at
+    a building level when its owner holds count squares of its group (the
+    property group for streets, all railroads or all utilities otherwise).
+    A street whose owner holds the whole group and has no buildings charges
+    monopoly_rent. Utility entries are multipliers of the dice total, flagged
+    in per_roll.
+    """
+
+    _cache = {}
+
+    def __init__(self, squares, groups):
+        index = BoardIndex(squares, groups)
+        self.size = n = len(squares)
+        table = [0] * (n * LEVELS * COUNTS)
+        per_roll = [False] * n
+        members = [()] * n
+        for i, sq in enumerate(squares):
+            base = i * LEVELS * COUNTS
+            if isinstance(sq, Property):
+                members[i] = group = index.group_members[index.group_of[i]]
+                for level, rent in enumerate(sq.rent):
+                    for count in range(1, len(group) + 1):
+                        table[base + level * COUNTS + count] = rent
+                table[base + len(group)] = sq.monopoly_rent
+            elif isinstance(sq, TrainStation):
+                members[i] = index.indices_of(TrainStation)
+                for count in range(1, len(members[i]) + 1):
+                    table[base + count] = sq.rent[count - 1]
+            elif isinstance(sq, Utility):
+                members[i] = index.indices_of(Utility)
+                per_roll[i] = True
+                for count in range(1, len(members[i]) + 1):
+                    table[base + count] = sq.multiplier[count - 1]
+        self.table = tuple(table)
+        self.per_roll = tuple(per_roll)
+        self.members = tuple(members)
+        self._arrays = None
+
+    @classmethod
+    def for_config(cls, config=BoardConfig):
+        """Return the rent table of a BoardConfig class, built once."""
+        rents = cls._cache.get(config)
+        if rents is None:
+            rents = cls._cache[config] = cls(config.squares, config.groups)
+        return rents
+
+    def rent(self, square, level, count, dice=7):
+        """Rent on square at a building level with count squares of its group
+        owned; dice is the roll total, used by utilities."""
+        rent = self.table[(square * LEVELS + level) * COUNTS + count]
+        if self.per_roll[square]:
+            return rent * dice
+        return rent
+
+    def square_rent(self, square, dice=7):
+        """Rent due on an owned square of a Board."""
+        owner = square.owner
+        if square.counter is None:
+            level = square.building_level()
+            count = owner.group_counts[square.property_group]
+        else:
+            level = 0
+            count = getattr(owner, square.counter)
+        return self.rent(square.index, level, count, dice)
+
+    def state_rent(self, state, square, dice=7):
+        """Rent due on an owned square of a GameState."""
+        owner = state.owner
+        holder = owner[square]
+        count = 0
+        for other in self.members[square]:
+            if owner[other] == holder:
+                count += 1
+        return self.rent(square, state.level[square], count, dice)
+
+    def _numpy_tables(self):
+        if self._arrays is None:
+            import numpy as np
+
+            n = self.size
+            same_group = np.zeros((n, n), dtype=bool)
+            for i, group in enumerate(self.members):
+                same_group[i, list(group)] = True
+            self._arrays = (np.asarray(self.table), np.asarray(self.per_roll),
+                            same_group)
+        return self._arrays
+
+    def price_states(self, owners, levels, dice=7):
+        """Vectorized rent of every square in many states at once.
+
+        owners and levels are (states, squares) arrays of owner uid (-1 for
+        none) and building level, e.g. stacked GameState.owner/level arrays.
+        Returns a float array of the same shape, 0 on unowned squares.
+        """
+        import numpy as np
+
+        table, per_roll, same_group = self._numpy_tables()
+        owners = np.asarray(owners)
+        levels = np.asarray(levels, dtype=np.int64)
+        same_owner = owners[:, :, None] == owners[:, None, :]
+        counts = (same_owner & same_group).sum(axis=2)
+        squares = np.arange(self.size)
+        rents = table[(squares * LEVELS + levels) * COUNTS + counts].astype(float)
+        rents = np.where(per_roll, rents * dice, rents)
+        return np.where(owners >= 0, rents, 0.0)
@@ -0,0 +1,293 @@
+import struct
+
+import savegame
+from strategy import JAIL_CARD, JAIL_PAY, JAIL_ROLL, PAY_BY_MORTGAGING, Strategy
+
+# A replay file is a header (magic, schema version, turns, start record
+# length), the savegame record of the board the game started from and the
+# decision log. The dice follow from the seed in the start record, so only
+# what the strategies answered is logged: a byte per yes/no, purchase or jail
+# choice, a varint per bid, a few bytes per trade offer, all in the order the
+# Board asked.
+MAGIC = b"MRPL"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHII")
+_PURCHASE = (False, True, PAY_BY_MORTGAGING)
+_JAIL = (JAIL_ROLL, JAIL_PAY, JAIL_CARD, PAY_BY_MORTGAGING)
+_JAIL_CODE = {choice: code for code, choice in enumerate(_JAIL)}
+
+
+class ReplayError(Exception):
+    pass
+
+
+def _put_int(log, value):
+    """Append a signed int as a zigzag varint."""
+    value = int(value)
+    value = value * 2 if value >= 0 else -value * 2 - 1
+    while value >= 0x80:
+        log.append(value & 0x7F | 0x80)
+        value >>= 7
+    log.append(value)
+
+
+def _put_offer(log, offer):
+    if not offer:
+        log.append(0)
+        return
+    log.append(1)
+    log.append(offer["from"].uid)
+    log.append(offer["to"].uid)
+    for key in ("give", "receive"):
+        squares = offer.get(key, [])
+        log.append(len(squares))
+        log.extend(sq.index for sq in squares)
+    _put_int(log, offer.get("cash", 0))
+
+
+class _Cursor:
+    """Reads a decision log back in order."""
+
+    def __init__(self, data, position=0):
+        self.data = data
+        self.position = position
+
+    def byte(self):
+        if self.position >= len(self.data):
+            raise ReplayError("the decision log is exhausted")
+        value = self.data[self.position]
+        self.position += 1
+        return value
+
+    def int(self):
+        value = shift = 0
+        while True:
+            b = self.byte()
+            value |= (b & 0x7F) << shift
+            if b < 0x80:
+                break
+            shift += 7
+        return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+    def offer(self, board):
+        if not self.byte():
+            return None
+        players, squares = board.all_players, board.squares
+        offer = {"from": players[self.byte()], "to": players[self.byte()]}
+        for key in ("give", "receive"):
+            offer[key] = [squares[self.byte()] for _ in range(self.byte())]
+        offer["cash"] = self.int()
+        return offer
+
+
+class _Recording(Strategy):
+    """Pass every decision on to strategy and log its answer."""
+
+    def __init__(self, strategy, log):
+        self.strategy = strategy
+        self.log = log
+
+    def __getattr__(self, name):
+        if name == "strategy":
+            raise AttributeError(name)
+        return getattr(self.strategy, name)
+
+    def set_rng(self, rng):
+        self.strategy.set_rng(rng)
+
+    def decide_purchase(self, board, player, square):
+        answer = self.strategy.decide_purchase(board, player, square)
+        self.log.append(2 if answer == PAY_BY_MORTGAGING else 1 if answer else 0)
+        return answer
+
+    def decide_bid_auction(self, board, player, square, current_bids):
+        answer = self.strategy.decide_bid_auction(board, player, square, current_bids)
+        _put_int(self.log, answer)
+        return answer
+
+    def propose_trade(self, board, player, other):
+        answer = self.strategy.propose_trade(board, player, other)
+        _put_offer(self.log, answer)
+        return answer
+
+    def accept_trade(self, board, player, offer):
+        answer = self.strategy.accept_trade(board, player, offer)
+        self.log.append(1 if answer else 0)
+        return answer
+
+    def decide_mortgage(self, board, player):
+        answer = self.strategy.decide_mortgage(board, player)
+        self.log.append(1 if answer else 0)
+        return answer
+
+    def decide_build_house(self, board, player, square):
+        answer = self.strategy.decide_build_house(board, player, square)
+        self.log.append(1 if answer else 0)
+        return answer
+
+    def decide_leave_jail(self, board, player):
+        answer = self.strategy.decide_leave_jail(board, player)
+        self.log.append(_JAIL_CODE[answer])
+        return answer
+
+
+class _Replaying(Strategy):
+    """Answer every decision from a decision log."""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def decide_purchase(self, board, player, square):
+        return _PURCHASE[self.cursor.byte()]
+
+    def decide_bid_auction(self, board, player, square, current_bids):
+        return self.cursor.int()
+
+    def propose_trade(self, board, player, other):
+        return self.cursor.offer(board)
+
+    def accept_trade(self, board, player, offer):
+        return bool(self.cursor.byte())
+
+    def decide_mortgage(self, board, player):
+        return bool(self.cursor.byte())
+
+    def decide_build_house(self, board, player, square):
+        return bool(self.cursor.byte())
+
+    def decide_leave_jail(self, board, player):
+        return _JAIL[self.cursor.byte()]
+
+
+class Replay:
+    """A recorded game: the savegame record it started from, the decision
+    log and the number of turns played."""
+
+    def __init__(self, start, decisions, turns):
+        self.start = bytes(start)
+        self.decisions = bytes(decisions)
+        self.turns = turns
+
+    def dumps(self):
+        return b"".join((
+            _HEADER.pack(MAGIC, VERSION, self.turns, len(self.start)),
+            self.start, self.decisions,
+        ))
+
+    @classmethod
+    def loads(cls, data):
+        if len(data) < _HEADER.size:
+            raise ReplayError("not a replay")
+        magic, version, turns, length = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("not a replay")
+        if version != VERSION:
+            raise ReplayError("unsupported replay version {0}".format(version))
+        offset = _HEADER.size
+        return cls(data[offset:offset + length], data[offset + length:], turns)
+
+    def save(self, path):
+        with open(path, "wb") as fp:
+            fp.write(self.dumps())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as fp:
+            return cls.loads(fp.read())
+
+    def __len__(self):
+        return self.turns
+
+
+class Recorder:
+    """Record the game played on board from its current state.
+
+    The strategies of board's players are wrapped to log their answers until
+    detach(). Play through play_turn() so that turns are counted.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.start = savegame.encode(board)
+        self.log = bytearray()
+        self.turns = 0
+        self._strategies = [p.strategy for p in board.all_players]
+        for player in board.all_players:
+            player.strategy = _Recording(player.strategy, self.log)
+
+    def play_turn(self):
+        roll = self.board.play_single_turn()
+        self.turns += 1
+        return roll
+
+    def detach(self):
+        """Give the players their own strategies back."""
+        for player, strategy in zip(self.board.all_players, self._strategies):
+            player.strategy = strategy
+
+    def replay(self):
+        """Return the Replay of the turns played so far."""
+        return Replay(self.start, self.log, self.turns)
+
+
+class ReplayPlayer:
+    """Play a Replay back on a headless Board.
+
+    seek() fast-forwards to any turn. Every `every` turns the board is
+    checkpointed (a Board.snapshot() and the log position), so going back
+    only replays the turns since the nearest checkpoint.
+    """
+
+    def __init__(self, replay, events=None, every=100):
+        self.replay = replay
+        self.every = every
+        self.board = savegame.new_board(replay.start, events=events)
+        self._cursor = _Cursor(replay.decisions)
+        for player in self.board.all_players:
+            player.strategy = _Replaying(self._cursor)
+        self.turn = 0
+        self._checkpoints = {0: (self.board.snapshot(), 0)}
+
+    def step(self):
+        """Play the next recorded turn and return the dice."""
+        if self.turn >= self.replay.turns:
+            raise ReplayError("end of the replay")
+        roll = self.board.play_single_turn()
+        self.turn += 1
+        if self.turn % self.every == 0 and self.turn not in self._checkpoints:
+            self._checkpoints[self.turn] = (self.board.snapshot(), self._cursor.position)
+        return roll
+
+    def at_end(self):
+        return self.turn >= self.replay.turns
+
+    def seek(self, turn):
+        """Bring the board to the start of turn (0 to replay.turns) and return it."""
+        if not 0 <= turn <= self.replay.turns:
+            raise ReplayError("turn {0} is outside the replay".format(turn))
+        start = max(t for t in self._checkpoints if t <= turn)
+        if turn < self.turn or start > self.turn:
+            snapshot, position = self._checkpoints[start]
+            self.board.restore(snapshot)
+            self._cursor.position = position
+            self.turn = start
+        while self.turn < turn:
+            self.step()
+        return self.board
+
+    def show(self, turn=0):
+        """Open the game window at turn; SPACE plays the recorded turns."""
+        # imported here so that headless replays never load pygame
+        from game import Game
+
+        player = self
+
+        class ReplayGame(Game):
+            def _play_turn(self):
+                if player.at_end():
+                    return self.last_roll
+                return player.step()
+
+        self.seek(turn)
+        ReplayGame(board=self.board).run()
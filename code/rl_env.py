@@ -0,0 +1,458 @@
+"""Gym-style reinforcement learning environment.
+
+MonopolyEnv seats one agent among engine policies and plays the Board rules
+on a StateEngine (which mirrors Board rule for rule, at a fraction of the
+cost). reset(seed) and step(action) follow the Gymnasium API: step returns
+(observation, reward, terminated, truncated, info), and info["action_mask"]
+flags the actions allowed on the decision the agent faces. VecEnv steps many
+environments in lockstep in this process, SubprocVecEnv spreads them over
+worker processes.
+"""
+import multiprocessing
+import random
+
+import numpy as np
+
+from dice import DiceStream, substream
+from engine import RandomPolicy, StateEngine
+from mcts import BID, BID_FRACTIONS, BUILD, PURCHASE
+from state import FREE, PROPERTY, BoardTables, GameState
+from strategy import JAIL_CARD, JAIL_PAY, JAIL_ROLL, PAY_BY_MORTGAGING
+
+# decision kinds: those of mcts, and leaving jail
+JAIL = 3
+KINDS = 4
+
+# actions
+PASS = 0        # decline: no purchase (the square is auctioned), no bid,
+                # no building, roll to leave jail
+ACCEPT = 1      # buy, build, or leave jail with a card or by paying the fine
+MORTGAGE = 2    # buy or pay the fine, mortgaging squares (then selling
+                # buildings) to raise the missing cash
+BID_ACTIONS = 3  # action BID_ACTIONS + k bids BID_FRACTIONS[k] of the price
+N_ACTIONS = BID_ACTIONS + len(BID_FRACTIONS)
+
+CASH_SCALE = 1500.0
+
+
+def bid_amount(price, action):
+    return int(price * BID_FRACTIONS[action - BID_ACTIONS])
+
+
+def liquidation_value(state, uid, tables):
+    """Cash uid could raise by mortgaging everything and selling all buildings."""
+    owner, level, mortgaged = state.owner, state.level, state.mortgaged
+    value = 0
+    for sq in tables.buyable:
+        if owner[sq] == uid:
+            if not mortgaged[sq]:
+                value += tables.mortgage[sq]
+            value += level[sq] * tables.house_cost[sq] // 2
+    return value
+
+
+def legal_actions(state, uid, tables, kind, square, current_bids=None):
+    """List of N_ACTIONS flags: the actions allowed on a decision."""
+    mask = [False] * N_ACTIONS
+    mask[PASS] = True
+    cash = state.cash[uid]
+    if kind == BID:
+        top = max(current_bids.values(), default=0) if current_bids else 0
+        price = tables.price[square]
+        for action in range(BID_ACTIONS, N_ACTIONS):
+            mask[action] = top < bid_amount(price, action) <= cash
+        return mask
+    if kind == BUILD:
+        mask[ACCEPT] = (tables.kind[square] == PROPERTY
+                        and state.level[square] < tables.max_level
+                        and cash >= tables.house_cost[square])
+        return mask
+    if kind == JAIL:
+        if uid in state.card_holder:
+            mask[ACCEPT] = True
+            return mask
+        cost = tables.jail_fine
+    else:
+        cost = tables.price[square]
+    if cash >= cost:
+        mask[ACCEPT] = True
+    elif cash + liquidation_value(state, uid, tables) >= cost:
+        mask[MORTGAGE] = True
+    return mask
+
+
+def apply_action(engine, state, uid, kind, square, current_bids, action):
+    """Return the policy answer for the engine to action on a decision. An
+    action that is not allowed counts as PASS."""
+    tables = engine.tables
+    if not legal_actions(state, uid, tables, kind, square, current_bids)[action]:
+        action = PASS
+    if kind == BID:
+        return 0 if action == PASS else bid_amount(tables.price[square], action)
+    if kind == JAIL:
+        if action == PASS:
+            return JAIL_ROLL
+        if uid in state.card_holder:
+            return JAIL_CARD
+        return PAY_BY_MORTGAGING if action == MORTGAGE else JAIL_PAY
+    if action == MORTGAGE:
+        return PAY_BY_MORTGAGING
+    return action != PASS
+
+
+def choose_action(model, observer, state, uid, kind, square, current_bids=None):
+    """Ask model(observation, action_mask) for an action on a decision; an
+    action that is not allowed counts as PASS."""
+    mask = np.array(legal_actions(state, uid, observer.tables, kind, square, current_bids))
+    action = int(model(observer.observe(state, uid, kind, square, current_bids), mask))
+    return action if mask[action] else PASS
+
+
+class Observer:
+    """Fixed-size float32 observation of a GameState from one seat.
+
+    Players come in turn order starting with the observer: position, cash,
+    alive and in-jail flags. Then per square a one-hot owner in the same
+    order, the building level and the mortgaged flag. Then the decision: a
+    one-hot kind, a one-hot square and the highest bid so far as a fraction
+    of the price. A state with fewer seats than n_players is padded.
+    """
+
+    def __init__(self, n_players, tables):
+        self.n_players = n = n_players
+        self.tables = tables
+        self.squares = size = tables.size
+        self.size = n * 4 + size * (n + 2) + KINDS + size + 1
+        self._orders = [(uid + np.arange(n)) % n for uid in range(n)]
+        self._price = np.maximum(np.asarray(tables.price, dtype=np.float32), 1)
+
+    def observe(self, state, uid, kind=None, square=-1, current_bids=None, out=None):
+        n, size = self.n_players, self.squares
+        obs = np.zeros(self.size, np.float32) if out is None else out
+        obs[:] = 0
+        seats = len(state.positions)
+        order = self._orders[uid][:seats] if seats == n else (uid + np.arange(seats)) % seats
+        obs[0:seats] = np.frombuffer(state.positions, np.int8)[order] / size
+        obs[n:n + seats] = np.frombuffer(state.cash, np.int64)[order] / CASH_SCALE
+        obs[2 * n:2 * n + seats] = np.frombuffer(state.alive, np.int8)[order]
+        obs[3 * n:3 * n + seats] = np.frombuffer(state.jail, np.int8)[order] != FREE
+        o = 4 * n
+        owner = np.frombuffer(state.owner, np.int8)
+        owned = np.flatnonzero(owner >= 0)
+        obs[o:o + size * n].reshape(size, n)[owned, (owner[owned] - uid) % seats] = 1
+        o += size * n
+        obs[o:o + size] = np.frombuffer(state.level, np.int8) / self.tables.max_level
+        o += size
+        obs[o:o + size] = np.frombuffer(state.mortgaged, np.int8)
+        o += size
+        if kind is not None:
+            obs[o + kind] = 1
+            if square >= 0:
+                obs[o + KINDS + square] = 1
+                if current_bids:
+                    obs[-1] = max(current_bids.values()) / self._price[square]
+        return obs
+
+
+class _PolicyStream:
+    """The engine rng of an env: uniforms in seeded batches, counter based as
+    DiceStream, so that a turn start is checkpointed by tell() alone.
+
+    Batch k comes from substream("<seed>/<k>", "policy"), a generator of its
+    own: seeding it like the dice batches would replay the dice's Mersenne
+    Twister output, and the opponents' decisions would follow the rolls.
+    """
+
+    def __init__(self, seed=0, batch=1024):
+        self.seed = seed
+        self.batch = batch
+        self._block = 0
+        self._i = 0
+        self._values = None
+
+    def _load(self):
+        draw = substream(f"{self.seed}/{self._block}", "policy").random
+        self._values = [draw() for _ in range(self.batch)]
+
+    def tell(self):
+        return self._block * self.batch + self._i
+
+    def seek(self, position):
+        block, self._i = divmod(position, self.batch)
+        if block != self._block:
+            self._block = block
+            self._values = None
+
+    def random(self):
+        if self._values is None:
+            self._load()
+        if self._i == self.batch:
+            self._block += 1
+            self._i = 0
+            self._load()
+        i = self._i
+        self._i = i + 1
+        return self._values[i]
+
+    def randint(self, a, b):
+        """Uniform on a..b like random.randint, from a single draw of the
+        stream (so not the numbers random.randint would give)."""
+        return a + int(self.random() * (b - a + 1))
+
+
+class _Decision(Exception):
+    """Raised inside a turn when the agent has to answer."""
+
+
+class _AgentPolicy:
+    """The agent's seat: answers from the actions given so far this turn."""
+
+    def __init__(self, env):
+        self.env = env
+
+    def decide_purchase(self, engine, state, uid, square):
+        return self.env._answer(PURCHASE, square, None)
+
+    def decide_bid_auction(self, engine, state, uid, square, current_bids):
+        return self.env._answer(BID, square, current_bids)
+
+    def decide_build_house(self, engine, state, uid, square):
+        return self.env._answer(BUILD, square, None)
+
+    def decide_leave_jail(self, engine, state, uid):
+        return self.env._answer(JAIL, -1, None)
+
+
+class MonopolyEnv:
+    """One agent seat against engine policies (RandomPolicy by default).
+
+    A step answers one decision of the agent: buying the square it landed
+    on, a bid in an auction, building on its square or leaving jail. The
+    game then runs on, through the other players' turns, up to the agent's
+    next decision. The reward is 1 when the agent is the last player
+    standing, -1 when it goes bankrupt, 0 otherwise; a game reaching
+    max_turns is truncated.
+
+    The engine cannot stop in the middle of a turn, so a decision aborts the
+    turn and step() replays it from its start (state and positions in the
+    counter-based dice and policy streams) with the answers given so far;
+    the replay reaches the same point.
+    """
+
+    def __init__(self, n_players=4, agent=0, opponents=None, max_turns=1000, tables=None):
+        self.tables = tables or BoardTables.for_config()
+        self.n_players = n_players
+        self.agent = agent
+        self.max_turns = max_turns
+        self.observer = Observer(n_players, self.tables)
+        self.observation_size = self.observer.size
+        self.n_actions = N_ACTIONS
+        self.rng = _PolicyStream()
+        policies = list(opponents) if opponents else [
+            RandomPolicy() for _ in range(n_players - 1)]
+        policies.insert(agent, _AgentPolicy(self))
+        self.engine = StateEngine(policies, self.tables, rng=self.rng, dice=DiceStream(0))
+        self.state = None
+        self.turns = 0
+        self._pending = None
+
+    def reset(self, seed=None):
+        """Start a new game and return (observation, info). The decks are
+        shuffled and the dice rolled as on Board(seed=seed); the opponents
+        decide from the env's own stream, so the game is not Board's."""
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.rng = self.engine.rng = _PolicyStream(seed)
+        self.engine.dice = DiceStream(seed)
+        self.state = GameState.new_game(self.n_players, seed, self.tables)
+        self._start = self.state.copy()
+        self._actions = []
+        self.turns = 0
+        self._advance()
+        return self.observe(), self.info()
+
+    def step(self, action):
+        """Answer the pending decision; return (observation, reward,
+        terminated, truncated, info)."""
+        reward, terminated, truncated = self._play(action)
+        return self.observe(), reward, terminated, truncated, self.info()
+
+    def _play(self, action):
+        if self._pending is None:
+            raise RuntimeError("the game is over, call reset()")
+        self._actions.append(int(action))
+        self.state.restore(self._start)
+        self.rng.seek(self._rng_position)
+        self.engine.dice.seek(self._dice_position)
+        self._advance()
+
+        state, agent = self.state, self.agent
+        reward = 0.0
+        terminated = False
+        if not state.alive[agent]:
+            reward, terminated = -1.0, True
+        elif sum(state.alive) == 1:
+            reward, terminated = 1.0, True
+        truncated = not terminated and self._pending is None
+        return reward, terminated, truncated
+
+    def _advance(self):
+        """Play on to the agent's next decision or the end of the game."""
+        state, engine, alive = self.state, self.engine, self.state.alive
+        while alive[self.agent] and sum(alive) > 1 and self.turns < self.max_turns:
+            if not self._actions:
+                # a new turn: remember where it starts
+                self._start.restore(state)
+                self._rng_position = self.rng.tell()
+                self._dice_position = engine.dice.tell()
+            self._answered = 0
+            try:
+                engine.play_turn(state)
+            except _Decision as decision:
+                self._pending = decision.args
+                return
+            self.turns += 1
+            self._actions = []
+        self._pending = None
+
+    def _answer(self, kind, square, current_bids):
+        i = self._answered
+        if i == len(self._actions):
+            raise _Decision(kind, square, dict(current_bids) if current_bids else None)
+        self._answered = i + 1
+        return apply_action(self.engine, self.state, self.agent, kind, square,
+                            current_bids, self._actions[i])
+
+    def observe(self, out=None):
+        if self._pending is None:
+            return self.observer.observe(self.state, self.agent, out=out)
+        kind, square, bids = self._pending
+        return self.observer.observe(self.state, self.agent, kind, square, bids, out=out)
+
+    def action_mask(self):
+        if self._pending is None:
+            mask = [False] * N_ACTIONS
+        else:
+            kind, square, bids = self._pending
+            mask = legal_actions(self.state, self.agent, self.tables, kind, square, bids)
+        return np.array(mask, dtype=bool)
+
+    def info(self):
+        kind, square = (None, -1) if self._pending is None else self._pending[:2]
+        return {"action_mask": self.action_mask(), "kind": kind, "square": square,
+                "turns": self.turns}
+
+
+class VecEnv:
+    """n_envs MonopolyEnvs stepped in lockstep in this process.
+
+    A finished game is reset at once, so the observation returned for it is
+    the first of the next game. Env i plays the seeds seed + i, then
+    seed + i + stride, ... (stride defaults to n_envs), so a run is
+    reproducible. step() returns (observations, rewards, terminated,
+    truncated, action_masks) as arrays with one row per env.
+    """
+
+    def __init__(self, n_envs, seed=0, stride=None, **kwargs):
+        self.envs = [MonopolyEnv(**kwargs) for _ in range(n_envs)]
+        self.n_envs = n_envs
+        self.observation_size = self.envs[0].observation_size
+        self.n_actions = N_ACTIONS
+        self._seeds = [seed + i for i in range(n_envs)]
+        self._stride = stride or n_envs
+        self.observations = np.zeros((n_envs, self.observation_size), np.float32)
+        self.masks = np.zeros((n_envs, N_ACTIONS), bool)
+
+    def _reset_env(self, i):
+        env = self.envs[i]
+        env.reset(self._seeds[i])
+        self._seeds[i] += self._stride
+        env.observe(out=self.observations[i])
+        self.masks[i] = env.action_mask()
+
+    def reset(self):
+        for i in range(self.n_envs):
+            self._reset_env(i)
+        return self.observations.copy(), self.masks.copy()
+
+    def step(self, actions):
+        n = self.n_envs
+        rewards = np.zeros(n, np.float32)
+        terminated = np.zeros(n, bool)
+        truncated = np.zeros(n, bool)
+        for i, env in enumerate(self.envs):
+            rewards[i], terminated[i], truncated[i] = env._play(actions[i])
+            if terminated[i] or truncated[i]:
+                self._reset_env(i)
+            else:
+                env.observe(out=self.observations[i])
+                self.masks[i] = env.action_mask()
+        return self.observations.copy(), rewards, terminated, truncated, self.masks.copy()
+
+    def close(self):
+        pass
+
+
+def _vec_worker(conn, n_envs, seed, stride, kwargs):
+    """Worker entry point: run a VecEnv and answer the commands on conn."""
+    envs = VecEnv(n_envs, seed=seed, stride=stride, **kwargs)
+    while True:
+        command, data = conn.recv()
+        if command == "step":
+            conn.send(envs.step(data))
+        elif command == "reset":
+            conn.send(envs.reset())
+        else:
+            conn.close()
+            return
+
+
+class SubprocVecEnv:
+    """VecEnv spread over worker processes, each stepping its share of the
+    n_envs environments in lockstep. Seeds are those of VecEnv(n_envs, seed),
+    whatever the number of processes."""
+
+    def __init__(self, n_envs, processes=None, seed=0, **kwargs):
+        processes = min(processes or multiprocessing.cpu_count(), n_envs)
+        self.n_envs = n_envs
+        self.n_actions = N_ACTIONS
+        bounds = [n_envs * k // processes for k in range(processes + 1)]
+        self._slices = [slice(a, b) for a, b in zip(bounds, bounds[1:])]
+        self._conns = []
+        self._workers = []
+        for part in self._slices:
+            parent, child = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=_vec_worker,
+                args=(child, part.stop - part.start, seed + part.start, n_envs, kwargs),
+                daemon=True)
+            worker.start()
+            child.close()
+            self._conns.append(parent)
+            self._workers.append(worker)
+        self.observation_size = MonopolyEnv(**kwargs).observation_size
+
+    def _gather(self):
+        return [conn.recv() for conn in self._conns]
+
+    def reset(self):
+        for conn in self._conns:
+            conn.send(("reset", None))
+        parts = self._gather()
+        return tuple(np.concatenate(field) for field in zip(*parts))
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        for conn, part in zip(self._conns, self._slices):
+            conn.send(("step", actions[part]))
+        parts = self._gather()
+        return tuple(np.concatenate(field) for field in zip(*parts))
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except OSError:
+                pass
+        for worker in self._workers:
+            worker.join()
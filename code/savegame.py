@@ -0,0 +1,220 @@
+import struct
+
+from board import Board, BoardSnapshot, PlayerSnapshot
+
+# A save file is a header (magic, schema version) followed by any number of
+# records, each a u32 length and the body of one game. Bodies are little-endian
+# structs, never pickles, so files load without pygame or the game classes and
+# a record can be skipped without decoding it.
+MAGIC = b"MSAV"
+VERSION = 1
+
+_FILE = struct.Struct("<4sH")
+_LENGTH = struct.Struct("<I")
+# seed, dice position, squares, players ever, current, doubles, players left
+_GAME = struct.Struct("<QQBBBBB")
+# size, position, held cards (bit mask); the order follows as size bytes
+_DECK = struct.Struct("<BBI")
+# uid, position, cash, skip, double rent, jail (-1 free), creditor (-1 none),
+# squares, cards
+_PLAYER = struct.Struct("<BBqBBbbBB")
+# index, houses, hotels, mortgaged
+_SQUARE = struct.Struct("<BBB?")
+# deck (0 chance, 1 community), card index
+_CARD = struct.Struct("<BB")
+
+
+class SaveGameError(Exception):
+    pass
+
+
+def _unpack(fmt, body, offset=0):
+    try:
+        return fmt.unpack_from(body, offset)
+    except struct.error:
+        raise SaveGameError("truncated save game") from None
+
+
+def _check(condition, what):
+    if not condition:
+        raise SaveGameError("corrupt save game: {0}".format(what))
+
+
+def _encode_deck(snapshot):
+    order, position, held = snapshot
+    mask = 0
+    for i in held:
+        mask |= 1 << i
+    return _DECK.pack(len(order), position, mask) + bytes(order)
+
+
+def encode(board):
+    """Return the record body of a Board's current game."""
+    snapshot = board.snapshot()
+    decks = (board.chance_deck, board.community_deck)
+    seed, position = snapshot.dice
+    if not 0 <= seed < 2**64:
+        raise SaveGameError("seed {0} cannot be saved (0 <= seed < 2**64)".format(seed))
+    parts = [_GAME.pack(seed, position, len(board.squares), len(board.all_players),
+                        snapshot.current, snapshot.doubles, len(snapshot.players))]
+    parts.extend(_encode_deck(deck) for deck in snapshot.decks)
+    for saved in snapshot.players:
+        parts.append(_PLAYER.pack(
+            saved.uid, saved.position, saved.cash, saved.skip, saved.double_rent,
+            -1 if saved.jail is None else saved.jail, saved.creditor,
+            len(saved.squares), len(saved.cards),
+        ))
+        parts.extend(_SQUARE.pack(*square) for square in saved.squares)
+        for card in saved.cards:
+            deck = 0 if card in decks[0].cards else 1
+            parts.append(_CARD.pack(deck, decks[deck].index(card)))
+    return b"".join(parts)
+
+
+def _counters(squares, owned):
+    """Player running totals (see Player._count_property) for owned squares."""
+    houses = hotels = utilities = railroads = 0
+    group_counts = {}
+    for index, h, hot, _ in owned:
+        square = squares[index]
+        houses += h
+        hotels += hot
+        if square.counter == "utilities":
+            utilities += 1
+        elif square.counter == "railroads":
+            railroads += 1
+        group = getattr(square, "property_group", None)
+        if group is not None:
+            group_counts[group] = group_counts.get(group, 0) + 1
+    monopolies = frozenset(
+        group for group, count in group_counts.items()
+        if count == len(group.property_list)
+    )
+    return houses, hotels, utilities, railroads, tuple(group_counts.items()), monopolies
+
+
+def decode(body, board):
+    """Return the BoardSnapshot of a record body, to restore into board (a
+    Board of the same layout and number of players). A body that is
+    truncated or does not describe a game on this board raises
+    SaveGameError."""
+    seed, position, size, everyone, current, doubles, left = _unpack(_GAME, body)
+    if size != len(board.squares) or everyone != len(board.all_players):
+        raise SaveGameError("saved game does not fit this board")
+    _check(0 < left <= everyone and current < left and doubles < 3, "players")
+    offset = _GAME.size
+    decks = []
+    for deck in (board.chance_deck, board.community_deck):
+        n, deck_position, mask = _unpack(_DECK, body, offset)
+        offset += _DECK.size
+        if n != len(deck.cards):
+            raise SaveGameError("saved game does not fit this board")
+        order = tuple(body[offset:offset + n])
+        offset += n
+        _check(sorted(order) == list(range(n)) and deck_position < max(n, 1)
+               and mask >> n == 0, "deck")
+        decks.append((order, deck_position, frozenset(i for i in range(n) if mask >> i & 1)))
+
+    squares = board.squares
+    max_houses = board.tables.max_level - 1
+    attempts = squares[board.index.jail].max_attempts
+    card_decks = (board.chance_deck.cards, board.community_deck.cards)
+    players = []
+    seen = set()
+    taken = set()
+    for _ in range(left):
+        (uid, pos, cash, skip, double_rent, jail, creditor,
+         n_squares, n_cards) = _unpack(_PLAYER, body, offset)
+        offset += _PLAYER.size
+        _check(uid < everyone and uid not in seen and pos < size
+               and -1 <= creditor < everyone and jail < attempts, "player")
+        seen.add(uid)
+        end = offset + n_squares * _SQUARE.size
+        _check(end <= len(body), "squares")
+        owned = tuple(_SQUARE.iter_unpack(body[offset:end]))
+        offset = end
+        _check(all(index < size and getattr(squares[index], "price", 0)
+                   for index, _, _, _ in owned), "squares")
+        indices = {index for index, _, _, _ in owned}
+        _check(len(indices) == len(owned) and not indices & taken, "squares")
+        taken |= indices
+        _check(all(houses <= max_houses and hotels <= 1 and not (houses and hotels)
+                   and (houses == hotels == 0 or hasattr(squares[index], "house_count"))
+                   for index, houses, hotels, _ in owned), "buildings")
+        end = offset + n_cards * _CARD.size
+        _check(end <= len(body), "cards")
+        held = tuple(_CARD.iter_unpack(body[offset:end]))
+        offset = end
+        _check(all(deck < 2 and i < len(card_decks[deck]) for deck, i in held), "cards")
+        players.append(PlayerSnapshot(
+            uid, pos, cash, owned, _counters(squares, owned),
+            tuple(card_decks[deck][i] for deck, i in held), skip,
+            bool(double_rent), None if jail < 0 else jail, creditor,
+        ))
+    _check(offset == len(body), "trailing bytes")
+    return BoardSnapshot((seed, position), tuple(decks), current, doubles, tuple(players))
+
+
+def players_in(body):
+    """Number of players a record body was started with."""
+    return _unpack(_GAME, body)[3]
+
+
+def new_board(body, strategies=None, events=None):
+    """Build a Board from a record body, continuing the saved game. strategies,
+    if given, needs one strategy per player the game started with."""
+    n = players_in(body)
+    _check(0 < n <= len(Board.token), "players")
+    if strategies is not None and len(strategies) < n:
+        raise ValueError("the saved game needs {0} strategies, got {1}".format(
+            n, len(strategies)))
+    board = Board(num_players=n, strategies=strategies, events=events)
+    board.restore(decode(body, board))
+    return board
+
+
+def dump(boards, fp):
+    """Write the games of boards to the binary file fp."""
+    fp.write(_FILE.pack(MAGIC, VERSION))
+    for board in boards:
+        body = encode(board)
+        fp.write(_LENGTH.pack(len(body)))
+        fp.write(body)
+
+
+def iter_bodies(fp):
+    """Yield the record bodies of a save file, checking its header."""
+    header = fp.read(_FILE.size)
+    if len(header) < _FILE.size:
+        raise SaveGameError("not a save file")
+    magic, version = _FILE.unpack(header)
+    if magic != MAGIC:
+        raise SaveGameError("not a save file")
+    if version != VERSION:
+        raise SaveGameError("unsupported save version {0}".format(version))
+    while True:
+        chunk = fp.read(_LENGTH.size)
+        if len(chunk) < _LENGTH.size:
+            return
+        (length,) = _LENGTH.unpack(chunk)
+        body = fp.read(length)
+        if len(body) < length:
+            raise SaveGameError("truncated save file")
+        yield body
+
+
+def load(fp, strategies=None, events=None):
+    """Yield a Board per game saved in fp, ready to play on."""
+    for body in iter_bodies(fp):
+        yield new_board(body, strategies, events)
+
+
+def save_file(path, boards):
+    with open(path, "wb") as fp:
+        dump(boards, fp)
+
+
+def load_file(path, strategies=None, events=None):
+    """Return the Boards saved in the file at path."""
+    with open(path, "rb") as fp:
+        return list(load(fp, strategies, events))
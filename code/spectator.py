@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import namedtuple
+
+from termination import LAST_STANDING
+
+# What the renderer shows: snapshot is a Board.snapshot() taken after turn
+# turns, roll and message the last dice and move text, reason why the game
+# ended (see termination), None while it goes on.
+Frame = namedtuple("Frame", ["turn", "snapshot", "roll", "message", "reason"])
+
+
+class Spectator:
+    """Play a Board on a background thread and publish Frames.
+
+    turns_per_sec limits the pace; None plays as fast as possible. A frame is
+    published after a turn when at least publish_every seconds passed since
+    the last one, and always at the end, so a fast game is not slowed by
+    snapshots nobody will see. The renderer reads frame whenever it likes;
+    frames are immutable, so no lock is needed. The board must not be
+    touched by other threads until stop().
+    """
+
+    def __init__(self, board, turns_per_sec=None, referee=None, play_turn=None,
+                 publish_every=1 / 60):
+        self.board = board
+        self.turns_per_sec = turns_per_sec
+        self.referee = referee
+        self.play_turn = play_turn or board.play_single_turn
+        self.publish_every = publish_every
+        self.frame = Frame(0, board.snapshot(), (0, 0), "", None)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.referee is not None:
+            self.referee.start()
+        self._thread = threading.Thread(target=self._run, name="spectator", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop playing and wait for the worker."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        board, referee = self.board, self.referee
+        delay = 1 / self.turns_per_sec if self.turns_per_sec else 0
+        turn = 0
+        published = deadline = time.perf_counter()
+        while not self._stop.is_set():
+            roll = self.play_turn()
+            turn += 1
+            if referee is not None:
+                reason = referee.observe(board)
+            else:
+                reason = LAST_STANDING if len(board.players) <= 1 else None
+            now = time.perf_counter()
+            if reason is not None or now - published >= self.publish_every:
+                self.frame = Frame(turn, board.snapshot(), roll, board.last_move_msg, reason)
+                published = now
+            if reason is not None:
+                return
+            if delay:
+                deadline += delay
+                if deadline > now:
+                    self._stop.wait(deadline - now)
+                else:
+                    deadline = now
@@ -1,3 +1,4 @@
+from events import EventKind
 from player import Bank, Player
 
 
@@ -10,7 +11,6 @@ class Square:
 
     def land(self, board, player, *args, **kwargs):
         """Defines what happens when the player lands on the place."""
-        print("Landing", player, "on", self)
 
     def pass_on(self, board, player, *args, **kwargs):
         """Defines what happens when the player lands on the place."""
@@ -55,6 +55,9 @@ class Buyable(Square):
 
     price = 0
     owner = None
+    mortgaged = False
+    # name of the Player counter this square kind adds to, if any
+    counter = None
 
     def land(self, board, player, *args, **kwargs):
         """Land the player on a buyable property."""
@@ -65,7 +68,7 @@ class Buyable(Square):
 
         rent_price = self.compute_rent(thr=kwargs["thr"])
         board.transaction_to_player(player, rent_price, self.owner)
-        print("RENT:", player, "paying rent of", rent_price, "to", self.owner)
+        board.emit(EventKind.RENT, player, self.index, rent_price)
 
     def can_be_bought(self):
         """Can this property be bought."""
@@ -96,6 +99,10 @@ class Buyable(Square):
         """Return the price of the property."""
         return 0
 
+    def building_level(self):
+        """Buildings on the square, none unless it is a Property."""
+        return 0
+
     def buy_house(self):
         """Buy a house in the property."""
         return
@@ -158,12 +165,21 @@ class Property(Buyable):
         self.building_costs = building_costs
 
     def compute_rent(self, *args, **kwargs):
-        """Return the rent price."""
-        return self.rent[self.house_count]
+        """Return the rent price, monopoly_rent for an unbuilt full group."""
+        level = self.building_level()
+        if level == 0 and self.owner.has_monopoly(self.property_group):
+            return self.monopoly_rent
+        return self.rent[level]
+
+    def building_level(self):
+        """Return 0-4 for the number of houses, 5 for a hotel."""
+        if self.hotel_count:
+            return len(self.rent) - 1
+        return self.house_count
 
     def get_house_price(self):
-        """Return the price of the property."""
-        if self.house_count < len(self.rent):
+        """Return the price of the next building, None if fully built."""
+        if self.building_level() < len(self.rent) - 1:
             return self.building_costs
 
     def count_houses(self):
@@ -175,8 +191,20 @@ class Property(Buyable):
         return self.hotel_count
 
     def buy_house(self):
-        """Buy a house in this property."""
-        self.house_count += 1
+        """Buy a house in this property, four houses become a hotel."""
+        if self.house_count < len(self.rent) - 2:
+            self.house_count += 1
+        else:
+            self.house_count = 0
+            self.hotel_count = 1
+
+    def sell_house(self):
+        """Sell one building level, a hotel goes back to four houses."""
+        if self.hotel_count:
+            self.hotel_count = 0
+            self.house_count = len(self.rent) - 2
+        elif self.house_count:
+            self.house_count -= 1
 
     def __repr__(self):
         if self.owner:
@@ -191,11 +219,11 @@ class PropertyGroup:
     """A grouping of properties."""
 
     name = ""
-    property_list = []
 
     def __init__(self, name):
         """Init a property list."""
         self.name = name
+        self.property_list = []
 
     def add_property(self, property):
         """Add a property to the group."""
@@ -206,8 +234,9 @@ class Utility(Buyable):
     """A Utility square."""
 
     price = 150
-    multiplier = [4.0, 10.0]
+    multiplier = [4, 10]
     mortgage = 75
+    counter = "utilities"
 
     def count_houses(self):
         """Count the number of houses."""
@@ -219,13 +248,7 @@ class Utility(Buyable):
 
     def compute_rent(self, *args, **kwargs):
         """Return the rent price."""
-        # check how many utilities does the owner has
-        utility_count = 0
-        for square in self.owner.property_list:
-            if issubclass(square.__class__, Utility):
-                utility_count += 1
-
-        return kwargs["thr"].get_amount() * self.multiplier[utility_count]
+        return kwargs["thr"].get_amount() * self.multiplier[self.owner.utilities - 1]
 
 
 class ElectricCompany(Utility):
@@ -245,6 +268,7 @@ class TrainStation(Buyable):
     price = 200
     rent = [25, 50, 100, 200]
     mortgage = 100
+    counter = "railroads"
 
     def __init__(self, name, *args, **kwargs):
         """Start a Monopoly game."""
@@ -260,8 +284,8 @@ class TrainStation(Buyable):
         return 0
 
     def compute_rent(self, *args, **kwargs):
-        """Return the rent price."""
-        return self.rent[0]
+        """Return the rent price for the number of railroads owned."""
+        return self.rent[self.owner.railroads - 1]
 
 
 class CommunityChest(Square):
@@ -318,6 +342,9 @@ class Jail(Square):
     """A train station."""
 
     name = "Jail"
+    fine = 50
+    # failed doubles rolls before the fine has to be paid
+    max_attempts = 3
 
 
 class GoToJail(Square):
@@ -0,0 +1,316 @@
+from array import array
+
+from board_config import BoardConfig
+from board_index import BoardIndex
+from cards import GOTO, NEAREST
+from dice import substream
+from squares import (
+    Chance,
+    CommunityChest,
+    GoToJail,
+    Jail,
+    Property,
+    Start,
+    TrainStation,
+    Utility,
+)
+
+# square kinds
+OTHER = 0
+START = 1
+PROPERTY = 2
+RAILROAD = 3
+UTILITY = 4
+CHANCE = 5
+CHEST = 6
+TAX = 7
+JAIL = 8
+GO_TO_JAIL = 9
+
+NOBODY = -1
+# GameState.jail of a player not in jail
+FREE = -1
+
+
+class BoardTables:
+    """Static per-square data of a board configuration, as flat tuples."""
+
+    _cache = {}
+
+    def __init__(self, squares, groups, decks=((), ())):
+        self.size = len(squares)
+        kind, price, house_cost, group, tax, rent, multiplier = [], [], [], [], [], [], []
+        mortgage = []
+        group_index = {id(g): i for i, g in enumerate(groups)}
+        for sq in squares:
+            if isinstance(sq, Property):
+                kind.append(PROPERTY)
+                rent.append(tuple(sq.rent))
+            elif isinstance(sq, TrainStation):
+                kind.append(RAILROAD)
+                rent.append(tuple(sq.rent))
+            elif isinstance(sq, Utility):
+                kind.append(UTILITY)
+                rent.append(())
+                multiplier.append(tuple(sq.multiplier))
+            else:
+                rent.append(())
+                if isinstance(sq, Start):
+                    kind.append(START)
+                elif isinstance(sq, Chance):
+                    kind.append(CHANCE)
+                elif isinstance(sq, CommunityChest):
+                    kind.append(CHEST)
+                elif isinstance(sq, Jail):
+                    kind.append(JAIL)
+                elif isinstance(sq, GoToJail):
+                    kind.append(GO_TO_JAIL)
+                elif hasattr(sq, "cash_on_land"):
+                    kind.append(TAX)
+                else:
+                    kind.append(OTHER)
+            price.append(getattr(sq, "price", 0))
+            house_cost.append(getattr(sq, "building_costs", 0) or 0)
+            mortgage.append(getattr(sq, "mortgage", 0) or 0)
+            group.append(group_index.get(id(getattr(sq, "property_group", None)), -1))
+            tax.append(-getattr(sq, "cash_on_land", 0))
+
+        self.kind = tuple(kind)
+        self.price = tuple(price)
+        self.house_cost = tuple(house_cost)
+        self.mortgage = tuple(mortgage)
+        self.group = tuple(group)
+        self.tax = tuple(tax)
+        self.rent = tuple(rent)
+        self.utility_multiplier = multiplier[0] if multiplier else ()
+        self.utilities = tuple(i for i, k in enumerate(kind) if k == UTILITY)
+        self.buyable = tuple(i for i, p in enumerate(price) if p)
+        self.jail = kind.index(JAIL)
+        self.jail_fine = squares[self.jail].fine
+        self.jail_attempts = squares[self.jail].max_attempts
+        self.go_salary = next(sq.cash_on_pass for sq in squares if isinstance(sq, Start))
+        self.max_level = max(len(r) for r in rent) - 1
+
+        # cards are numbered across decks: chance first, then community chest
+        index = BoardIndex(squares, groups)
+        nearest = {"railroad": index.next_by_class[TrainStation],
+                   "utility": index.next_by_class[Utility]}
+        self.deck_sizes = tuple(len(deck) for deck in decks)
+        self.deck_start = (0, self.deck_sizes[0])
+        card_op, card_arg = [], []
+        for deck in decks:
+            for card in deck:
+                op, arg = card.effect
+                if op == GOTO:
+                    arg = index.by_name[arg]
+                elif op == NEAREST:
+                    arg = nearest[arg]
+                card_op.append(op)
+                card_arg.append(arg)
+        self.card_op = tuple(card_op)
+        self.card_arg = tuple(card_arg)
+        self.start = index.start
+
+    @classmethod
+    def for_config(cls, config=BoardConfig):
+        """Return the tables of a BoardConfig class, built once."""
+        tables = cls._cache.get(config)
+        if tables is None:
+            tables = cls._cache[config] = cls(
+                config.squares, config.groups,
+                (config.chance_cards, config.community_cards))
+        return tables
+
+
+class GameState:
+    """Mutable game state in fixed-size arrays.
+
+    Players are indexed by uid, squares by their board index. A copy is a
+    handful of array copies whatever the stage of the game.
+
+    Cards are numbered as in BoardTables (chance, then community chest).
+    deck_order holds both shuffled decks back to back and never changes once
+    set, deck_position the next slot of each deck and card_holder the uid
+    holding a card (NOBODY while it is in its deck). jail is -1 for a free
+    player, else the failed attempts at leaving, and doubles counts the
+    doubles rolled so far in the current turn. creditor is the player a
+    player in debt owes its assets to (NOBODY for the bank).
+    """
+
+    __slots__ = ("positions", "cash", "alive", "skip", "double_rent",
+                 "owner", "level", "current", "deck_order", "deck_position",
+                 "card_holder", "jail", "doubles", "mortgaged", "creditor")
+
+    def __init__(self, n_players=4, n_squares=40, cash=1500,
+                 decks=(len(BoardConfig.chance_cards), len(BoardConfig.community_cards))):
+        self.positions = array("b", bytes(n_players))
+        self.cash = array("q", [cash]) * n_players
+        self.alive = array("b", [1]) * n_players
+        self.skip = array("b", bytes(n_players))
+        self.double_rent = array("b", bytes(n_players))
+        self.owner = array("b", [NOBODY]) * n_squares
+        self.level = array("b", bytes(n_squares))
+        self.current = 0
+        n_chance, n_chest = decks
+        self.deck_order = array("b", list(range(n_chance))
+                                + list(range(n_chance, n_chance + n_chest)))
+        self.deck_position = array("b", bytes(2))
+        self.card_holder = array("b", [NOBODY]) * (n_chance + n_chest)
+        self.jail = array("b", [FREE]) * n_players
+        self.doubles = 0
+        self.mortgaged = array("b", bytes(n_squares))
+        self.creditor = array("b", [NOBODY]) * n_players
+
+    @classmethod
+    def new_game(cls, n_players, seed, tables=None):
+        """The state of a new Board(num_players=n_players, seed=seed): decks
+        shuffled as the Board shuffles them, without building a Board."""
+        tables = tables or BoardTables.for_config()
+        state = cls(n_players, tables.size, decks=tables.deck_sizes)
+        shuffler = substream(seed, "decks")
+        for start, n in zip(tables.deck_start, tables.deck_sizes):
+            order = list(range(n))
+            shuffler.shuffle(order)
+            for k, i in enumerate(order):
+                state.deck_order[start + k] = start + i
+        return state
+
+    @property
+    def n_players(self):
+        return len(self.positions)
+
+    def copy(self):
+        """Return an independent copy."""
+        new = GameState.__new__(GameState)
+        new.positions = self.positions[:]
+        new.cash = self.cash[:]
+        new.alive = self.alive[:]
+        new.skip = self.skip[:]
+        new.double_rent = self.double_rent[:]
+        new.owner = self.owner[:]
+        new.level = self.level[:]
+        new.current = self.current
+        # fixed for the whole game, so shared
+        new.deck_order = self.deck_order
+        new.deck_position = self.deck_position[:]
+        new.card_holder = self.card_holder[:]
+        new.jail = self.jail[:]
+        new.doubles = self.doubles
+        new.mortgaged = self.mortgaged[:]
+        new.creditor = self.creditor[:]
+        return new
+
+    def restore(self, other):
+        """Overwrite this state in place with a copy of other (same sizes)."""
+        self.positions[:] = other.positions
+        self.cash[:] = other.cash
+        self.alive[:] = other.alive
+        self.skip[:] = other.skip
+        self.double_rent[:] = other.double_rent
+        self.owner[:] = other.owner
+        self.level[:] = other.level
+        self.deck_position[:] = other.deck_position
+        self.card_holder[:] = other.card_holder
+        self.jail[:] = other.jail
+        self.mortgaged[:] = other.mortgaged
+        self.creditor[:] = other.creditor
+        self.deck_order = other.deck_order
+        self.current = other.current
+        self.doubles = other.doubles
+
+    def snapshot(self):
+        """Return the state as immutable bytes (also usable as a hash key)."""
+        return b"".join((
+            bytes((len(self.positions), len(self.owner), self.current,
+                   len(self.card_holder), self.doubles)),
+            self.positions.tobytes(), self.cash.tobytes(), self.alive.tobytes(),
+            self.skip.tobytes(), self.double_rent.tobytes(),
+            self.owner.tobytes(), self.level.tobytes(), self.deck_order.tobytes(),
+            self.deck_position.tobytes(), self.card_holder.tobytes(),
+            self.jail.tobytes(), self.mortgaged.tobytes(), self.creditor.tobytes(),
+        ))
+
+    @classmethod
+    def from_snapshot(cls, data):
+        """Rebuild a GameState from snapshot() bytes."""
+        n, size, current, cards = data[0], data[1], data[2], data[3]
+        new = cls.__new__(cls)
+        new.doubles = data[4]
+        offset = 5
+        for name, code, count in (("positions", "b", n), ("cash", "q", n),
+                                  ("alive", "b", n), ("skip", "b", n),
+                                  ("double_rent", "b", n), ("owner", "b", size),
+                                  ("level", "b", size), ("deck_order", "b", cards),
+                                  ("deck_position", "b", 2),
+                                  ("card_holder", "b", cards), ("jail", "b", n),
+                                  ("mortgaged", "b", size), ("creditor", "b", n)):
+            values = array(code)
+            end = offset + values.itemsize * count
+            values.frombytes(data[offset:end])
+            setattr(new, name, values)
+            offset = end
+        new.current = current
+        return new
+
+    @classmethod
+    def from_board(cls, board):
+        """Capture the state of a Board."""
+        squares = board.squares
+        uids = [p.uid for p in board.players]
+        n = max(uids) + 1 if uids else 0
+        # every seat of the game, so that sizes stay fixed as players go bankrupt
+        n = max(n, len(getattr(board, "all_players", ())))
+        for sq in squares:
+            owner = sq.get_owner()
+            if owner is not None:
+                n = max(n, owner.uid + 1)
+        decks = (board.chance_deck, board.community_deck)
+        state = cls(n, len(squares), 0, tuple(len(d.cards) for d in decks))
+        for i in range(n):
+            state.alive[i] = 0
+        for player, position in zip(board.players, board.positions):
+            uid = player.uid
+            state.alive[uid] = 1
+            state.positions[uid] = position
+            state.cash[uid] = int(player.cash)
+            state.skip[uid] = player.skip_next_turns
+            state.double_rent[uid] = player.double_rent
+            if player.is_in_jail():
+                state.jail[uid] = player.in_jail_count
+            if player.creditor in board.players:
+                state.creditor[uid] = player.creditor.uid
+        for i, sq in enumerate(squares):
+            owner = sq.get_owner()
+            if owner is not None:
+                state.owner[i] = owner.uid
+                state.mortgaged[i] = sq.mortgaged
+                if isinstance(sq, Property):
+                    state.level[i] = sq.building_level()
+        offset = 0
+        for slot, deck in enumerate(decks):
+            for k, i in enumerate(deck.order):
+                state.deck_order[offset + k] = offset + i
+            state.deck_position[slot] = deck.position
+            for i in deck.held:
+                holder = next(p for p in board.players if deck.cards[i] in p.cards)
+                state.card_holder[offset + i] = holder.uid
+            offset += len(deck.cards)
+        if board.players:
+            state.current = board.players[board.current].uid
+        state.doubles = board.doubles_rolled
+        return state
+
+    def alive_players(self):
+        return [uid for uid, alive in enumerate(self.alive) if alive]
+
+    def net_worth(self, uid, tables):
+        """Cash plus purchase price of squares and buildings, less mortgages."""
+        worth = self.cash[uid]
+        price, house_cost, level = tables.price, tables.house_cost, self.level
+        mortgage, mortgaged = tables.mortgage, self.mortgaged
+        for sq, owner in enumerate(self.owner):
+            if owner == uid:
+                worth += price[sq] + house_cost[sq] * level[sq]
+                if mortgaged[sq]:
+                    worth -= mortgage[sq]
+        return worth
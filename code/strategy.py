@@ -1,6 +1,43 @@
 import random
 from abc import ABC, abstractmethod
 
+# answers to decide_leave_jail
+JAIL_ROLL = "roll"
+JAIL_PAY = "pay"
+JAIL_CARD = "card"
+
+# answer to decide_purchase or decide_leave_jail: mortgage squares (then sell
+# buildings) to raise the price or the fine, then buy or pay if that was enough
+PAY_BY_MORTGAGING = "mortgage"
+
+# decision kinds of the searches (mcts, expectimax, rl_env)
+PURCHASE = 0
+BID = 1
+BUILD = 2
+
+# bound by _import_search(): the search modules import the board modules,
+# which import this one
+GameState = Expectimax = MCTS = RootParallelMCTS = bid_candidates = rl_env = None
+
+
+def _import_search(rl=False):
+    """Import the search modules on first use (rl_env, which needs NumPy,
+    only when rl is set)."""
+    global GameState, Expectimax, MCTS, RootParallelMCTS, bid_candidates, rl_env
+    if GameState is None:
+        import expectimax
+        import mcts
+        import state
+
+        GameState = state.GameState
+        Expectimax = expectimax.Expectimax
+        MCTS, RootParallelMCTS = mcts.MCTS, mcts.RootParallelMCTS
+        bid_candidates = mcts.bid_candidates
+    if rl and rl_env is None:
+        import rl_env as module
+
+        rl_env = module
+
 class Strategy(ABC):
     @abstractmethod
     def decide_purchase(self, board, player, square) -> bool: pass
@@ -20,15 +57,42 @@ class Strategy(ABC):
     @abstractmethod
     def decide_build_house(self, board, player, square) -> bool: pass
 
+    def decide_leave_jail(self, board, player) -> str:
+        """Asked at the start of a turn in jail: JAIL_CARD, JAIL_PAY, JAIL_ROLL
+        or PAY_BY_MORTGAGING."""
+        return JAIL_CARD if player.has_jail_card() else JAIL_ROLL
+
+    def set_rng(self, rng):
+        """Draw the strategy's random choices from rng (a random.Random) from
+        now on; strategies without any ignore it."""
+
 class RandomStrategy(Strategy):
-    def __init__(self, buy_prob=0.5, trade_prob=0.5, mortgage_prob=0.5, build_prob=0.5):
+    """Random answers, drawn from rng (the random module by default)."""
+
+    def __init__(self, buy_prob=0.5, trade_prob=0.5, mortgage_prob=0.5, build_prob=0.5,
+                 rng=None):
         self.buy_prob = buy_prob
         self.trade_prob = trade_prob
         self.mortgage_prob = mortgage_prob
         self.build_prob = build_prob
+        self.rng = rng or random
+
+    def __getstate__(self):
+        # the random module cannot be pickled (e.g. to a Tournament worker)
+        state = self.__dict__.copy()
+        if state["rng"] is random:
+            state["rng"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.rng = self.rng or random
+
+    def set_rng(self, rng):
+        self.rng = rng
 
     def decide_purchase(self, board, player, square):
-        return random.random() < self.buy_prob
+        return self.rng.random() < self.buy_prob
 
     # def decide_bid_auction(self, board, player, square, current_bids):
     #     return random.randint(0, player.get_cash()) if random.random() < 0.5 else 0
@@ -36,53 +100,180 @@ class RandomStrategy(Strategy):
     def decide_bid_auction(self, board, player, square, current_bids):
         # Prevent bidding when cash is non-positive
         max_cash = max(int(player.get_cash()), 0)
-        if random.random() < 0.5 and max_cash > 0:
-            return random.randint(0, max_cash)
+        if self.rng.random() < 0.5 and max_cash > 0:
+            return self.rng.randint(0, max_cash)
         return 0
     
     def propose_trade(self, board, player, other):
         return None
 
     def accept_trade(self, board, player, offer):
-        return random.random() < self.trade_prob
+        return self.rng.random() < self.trade_prob
 
     def decide_mortgage(self, board, player):
-        return player.get_cash() < player.min_cash_threshold() and random.random() < self.mortgage_prob
+        return player.get_cash() < player.min_cash_threshold() and self.rng.random() < self.mortgage_prob
 
     def decide_build_house(self, board, player, square):
-        return player.get_cash() > getattr(square, "building_costs", float('inf')) and random.random() < self.build_prob
+        return player.get_cash() > getattr(square, "building_costs", float('inf')) and self.rng.random() < self.build_prob
+
+    def decide_leave_jail(self, board, player):
+        if player.has_jail_card():
+            return JAIL_CARD
+        if player.get_cash() > board.jail_fine and self.rng.random() < 0.5:
+            return JAIL_PAY
+        return JAIL_ROLL
 
 class MinimaxStrategy(Strategy):
-    def __init__(self, depth=2): self.depth = depth
+    """Depth-limited expectimax on a GameState copy of the board (see
+    expectimax.py). depth counts dice rolls; evaluate(state, uid, tables)
+    scores the leaves and tt_size bounds the transposition table, which is
+    kept across decisions.
+
+    The search visits every dice outcome (no chance-node pruning), so the
+    cost grows about tenfold per roll: a four-player decision measured 5-10
+    ms at depth 2, 30-100 ms at depth 3 and 0.3-1.7 s at depth 4."""
+
+    def __init__(self, depth=2, evaluate=None, tt_size=100000):
+        _import_search()
+        self.depth = depth
+        self.search = Expectimax(depth, evaluate=evaluate, tt_size=tt_size)
+
+    def _best(self, board, player, kind, square, current_bids=None):
+        _import_search()
+        bids = None
+        if current_bids:
+            bids = {p.uid: bid for p, bid in current_bids.items()}
+        return self.search.best_action(GameState.from_board(board), player.uid, kind,
+                                       square.index, bids, again=board.roll_again)
 
     def decide_purchase(self, board, player, square):
-        # stub: simple affordability check
-        return player.get_cash() >= getattr(square, "price", 0)
+        if square.get_price() > player.get_cash():
+            return False
+        return self._best(board, player, PURCHASE, square)
+
+    def decide_bid_auction(self, board, player, square, current_bids):
+        return self._best(board, player, BID, square, current_bids)
 
-    def decide_bid_auction(self, board, player, square, current_bids): return 0
     def propose_trade(self, board, player, other): return None
     def accept_trade(self, board, player, offer): return False
     def decide_mortgage(self, board, player): return False
-    def decide_build_house(self, board, player, square): return False
+
+    def decide_build_house(self, board, player, square):
+        price = square.get_house_price()
+        if not price or price > player.get_cash():
+            return False
+        return self._best(board, player, BUILD, square)
 
 class MCTStrategy(Strategy):
-    def __init__(self, iterations=100): self.iterations = iterations
+    """Monte Carlo Tree Search on a GameState copy of the board (see mcts.py).
+
+    Each decision runs at most `iterations` rollouts and, if time_limit_ms is
+    set, stops at that wall-clock budget. `search.rollouts_per_sec` reports the
+    rollout rate so far. With workers > 1 every decision is searched in that
+    many processes at once (root parallel), each with the full budget.
+    """
+
+    def __init__(self, iterations=100, time_limit_ms=None, rollout_turns=50, seed=None,
+                 workers=1):
+        _import_search()
+        self.iterations = iterations
+        self.time_limit_ms = time_limit_ms
+        if workers == 1:
+            self.search = MCTS(iterations=iterations, time_limit_ms=time_limit_ms,
+                               rollout_turns=rollout_turns, seed=seed)
+        else:
+            self.search = RootParallelMCTS(workers, iterations=iterations,
+                                           time_limit_ms=time_limit_ms,
+                                           rollout_turns=rollout_turns, seed=seed)
+
+    def close(self):
+        """Release the worker pool of a root-parallel search."""
+        if hasattr(self.search, "close"):
+            self.search.close()
+
+    def _best(self, board, player, kind, square, current_bids=None):
+        _import_search()
+        state = GameState.from_board(board)
+        bids = None
+        if current_bids:
+            bids = {p.uid: bid for p, bid in current_bids.items()}
+        return self.search.best_action(state, player.uid, kind, square.index, bids,
+                                       again=board.roll_again)
+
+    def decide_purchase(self, board, player, square):
+        if square.get_price() > player.get_cash():
+            return False
+        return self._best(board, player, PURCHASE, square)
+
+    def decide_bid_auction(self, board, player, square, current_bids):
+        _import_search()
+        bids = bid_candidates(square.get_price(), player.get_cash(), current_bids)
+        if len(bids) == 1:
+            return 0
+        return self._best(board, player, BID, square, current_bids)
 
-    def decide_purchase(self, board, player, square): return False
-    def decide_bid_auction(self, board, player, square, current_bids): return 0
     def propose_trade(self, board, player, other): return None
     def accept_trade(self, board, player, offer): return False
     def decide_mortgage(self, board, player): return False
-    def decide_build_house(self, board, player, square): return False
+
+    def decide_build_house(self, board, player, square):
+        price = square.get_house_price()
+        if not price or price > player.get_cash():
+            return False
+        return self._best(board, player, BUILD, square)
 
 class RLStrategy(Strategy):
-    def __init__(self, model=None): self.model = model
+    """Plays a policy trained on rl_env.MonopolyEnv: model(observation,
+    action_mask) returns the action for a decision, observed as the env
+    observes it. Without a model every decision is declined and a card is
+    used to leave jail (the Strategy default)."""
+
+    def __init__(self, model=None):
+        self.model = model
+        self._observer = None
+
+    def _act(self, board, player, kind, square=None, current_bids=None):
+        _import_search(rl=True)
+        if self.model is None:
+            return rl_env.PASS
+        state = GameState.from_board(board)
+        if self._observer is None or self._observer.n_players != state.n_players:
+            self._observer = rl_env.Observer(state.n_players, board.tables)
+        bids = None
+        if current_bids:
+            bids = {p.uid: bid for p, bid in current_bids.items()}
+        index = -1 if square is None else square.index
+        return rl_env.choose_action(self.model, self._observer, state, player.uid, kind, index, bids)
+
+    def decide_purchase(self, board, player, square):
+        action = self._act(board, player, PURCHASE, square)
+        if action == rl_env.MORTGAGE:
+            return PAY_BY_MORTGAGING
+        return action == rl_env.ACCEPT
+
+    def decide_bid_auction(self, board, player, square, current_bids):
+        action = self._act(board, player, BID, square, current_bids)
+        if action < rl_env.BID_ACTIONS:
+            return 0
+        return rl_env.bid_amount(square.get_price(), action)
 
-    def decide_purchase(self, board, player, square): return False
-    def decide_bid_auction(self, board, player, square, current_bids): return 0
     def propose_trade(self, board, player, other): return None
     def accept_trade(self, board, player, offer): return False
     def decide_mortgage(self, board, player): return False
-    def decide_build_house(self, board, player, square): return False
+
+    def decide_build_house(self, board, player, square):
+        return self._act(board, player, BUILD, square) == rl_env.ACCEPT
+
+    def decide_leave_jail(self, board, player):
+        if self.model is None:
+            return super().decide_leave_jail(board, player)
+        action = self._act(board, player, rl_env.JAIL)
+        if action == rl_env.PASS:
+            return JAIL_ROLL
+        if player.has_jail_card():
+            return JAIL_CARD
+        if action == rl_env.MORTGAGE:
+            return PAY_BY_MORTGAGING
+        return JAIL_PAY
 
 HumanRandom = RandomStrategy
\ No newline at end of file
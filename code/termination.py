@@ -0,0 +1,97 @@
+from collections import deque
+
+# why a game stopped
+LAST_STANDING = "last standing"
+TURN_CAP = "turn cap"
+STALEMATE = "stalemate"
+DOMINANCE = "dominance"
+
+
+class Referee:
+    """Decide when a Board game nobody has won yet should stop, and who wins.
+
+    A game stops at max_turns, at a stalemate, or when one player dominates.
+    Trends are sampled every stride turns over a sliding window of window
+    turns. It is a stalemate when ownership, buildings and mortgages have not
+    changed for the whole window and no player losing cash at the window's
+    rate would run out within horizon more turns. A player dominates when its
+    net worth is at least dominance of the total net worth of the players
+    still in the game. Neither rule applies before min_turns.
+
+    A stopped game goes to the player with the highest net worth (None on a
+    tie). Call start() before each game and observe() after each turn.
+    """
+
+    def __init__(self, max_turns=1000, window=200, stride=10, horizon=1000,
+                 dominance=0.8, min_turns=100):
+        self.max_turns = max_turns
+        self.window = window
+        self.stride = stride
+        self.horizon = horizon
+        self.dominance = dominance
+        self.min_turns = min_turns
+        self.start()
+
+    def start(self):
+        """Forget the previous game."""
+        self.turns = 0
+        self.reason = None
+        self._samples = deque(maxlen=self.window // self.stride + 1)
+        self._holdings = None
+        self._changed = 0
+
+    def observe(self, board):
+        """Count one turn of board; return the reason to stop, or None."""
+        self.turns += 1
+        if len(board.players) <= 1:
+            self.reason = LAST_STANDING
+        elif self.turns >= self.max_turns:
+            self.reason = TURN_CAP
+        elif self.turns % self.stride == 0:
+            self.reason = self._sample(board)
+        return self.reason
+
+    def _sample(self, board):
+        players = board.players
+        # which squares each player holds, so that a trade counts as a change
+        holdings = tuple(
+            (p.uid, frozenset((sq.index, sq.building_level(), sq.mortgaged)
+                              for sq in p.property_list))
+            for p in players
+        )
+        if holdings != self._holdings:
+            self._holdings = holdings
+            self._changed = self.turns
+        cash = {p.uid: p.cash for p in players}
+        self._samples.append(cash)
+        if self.turns < self.min_turns:
+            return None
+
+        worth = [p.net_worth() for p in players]
+        total = sum(w for w in worth if w > 0)
+        if total > 0 and max(worth) >= self.dominance * total:
+            return DOMINANCE
+
+        if self.turns - self._changed < self.window:
+            return None
+        first = self._samples[0]
+        span = self.stride * (len(self._samples) - 1)
+        for uid, now in cash.items():
+            lost = first.get(uid, now) - now
+            if lost > 0 and now - lost * self.horizon / span < 0:
+                return None
+        return STALEMATE
+
+    def adjudicate(self, board):
+        """uid of the winner: the last player standing, else the richest in
+        net worth, None when the richest are tied."""
+        players = board.players
+        if len(players) == 1:
+            return players[0].uid
+        if not players:
+            return None
+        worth = [(p.net_worth(), p.uid) for p in players]
+        worth.sort(reverse=True)
+        if len(worth) > 1 and worth[0][0] == worth[1][0]:
+            return None
+        return worth[0][1]
@@ -0,0 +1,38 @@
+import os
+import random
+import sys
+
+import pytest
+
+# the game modules are flat files in code/, imported by plain name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board  # noqa: E402
+from state import GameState  # noqa: E402
+from strategy import RandomStrategy  # noqa: E402
+
+
+@pytest.fixture
+def new_board():
+    """new_board(seed, n_players=4, strategies=None): a Board of
+    RandomStrategy players unless strategies are given."""
+    def make(seed, n_players=4, strategies=None):
+        strategies = strategies or [RandomStrategy() for _ in range(n_players)]
+        return Board(num_players=n_players, strategies=strategies, seed=seed)
+    return make
+
+
+@pytest.fixture
+def play():
+    """play(board, turns, seed): play up to turns turns with the random module
+    seeded and return the GameState snapshot after each."""
+    def run(board, turns, seed):
+        random.seed(seed)
+        trace = []
+        for _ in range(turns):
+            if len(board.players) == 1:
+                break
+            board.play_single_turn()
+            trace.append(GameState.from_board(board).snapshot())
+        return trace
+    return run
@@ -0,0 +1,73 @@
+import json
+import os
+import shutil
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+import atlas  # noqa: E402
+
+ASSETS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+
+@pytest.fixture
+def display(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.quit()
+
+
+def test_pack_fits_the_width_without_overlaps():
+    sizes = {name: size for name, (_, size) in atlas.SPRITES.items()}
+    sizes.update({"wide{0}".format(i): (300, 10 + i) for i in range(5)})
+    rects, height = atlas.pack(sizes)
+    assert set(rects) == set(sizes)
+    boxes = [pygame.Rect(rect) for rect in rects.values()]
+    for name, (x, y, w, h) in rects.items():
+        assert (w, h) == sizes[name]
+        assert 0 <= x and x + w <= atlas.ATLAS_WIDTH and y + h <= height
+    for i, box in enumerate(boxes):
+        assert box.collidelist(boxes[i + 1:]) == -1
+
+
+def test_sprites_are_scaled_and_cached(display, tmp_path, monkeypatch):
+    cache = str(tmp_path / "cache")
+    built = atlas.load_atlas(ASSETS, cache)
+    assert os.path.exists(os.path.join(cache, "atlas.bmp"))
+    for name, (_, size) in atlas.SPRITES.items():
+        assert built[name].get_size() == size
+
+    def no_build(*args):
+        raise AssertionError("the cached atlas was not used")
+
+    monkeypatch.setattr(atlas, "_build", no_build)
+    cached = atlas.load_atlas(ASSETS, cache)
+    for name in atlas.SPRITES:
+        assert pygame.image.tobytes(cached[name], "RGBA") == \
+            pygame.image.tobytes(built[name], "RGBA"), name
+
+
+def test_changed_assets_rebuild_the_cache(display, tmp_path):
+    assets = str(tmp_path / "assets")
+    shutil.copytree(ASSETS, assets, ignore=shutil.ignore_patterns("cache"))
+    cache = str(tmp_path / "cache")
+    atlas.load_atlas(assets, cache)
+    key = atlas._source_key(assets)
+
+    house = os.path.join(assets, "house.png")
+    stamp = os.stat(house).st_mtime_ns + 10**9
+    os.utime(house, ns=(stamp, stamp))
+    assert atlas._source_key(assets) != key
+    atlas.load_atlas(assets, cache)
+    with open(os.path.join(cache, "atlas.json")) as fp:
+        assert json.load(fp)["key"] == atlas._source_key(assets)
+
+
+def test_unwritable_cache_is_skipped(display, tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    sprites = atlas.load_atlas(ASSETS, str(blocker / "cache"))
+    assert sprites["board"].get_size() == (800, 800)
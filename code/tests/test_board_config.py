@@ -0,0 +1,44 @@
+from board_config import BoardConfig
+from squares import Property
+
+
+def test_boards_do_not_share_squares_or_groups(new_board):
+    first, second = new_board(0, n_players=2), new_board(1, n_players=2)
+    for a, b, template in zip(first.squares, second.squares, BoardConfig.squares):
+        assert a is not b and a is not template
+        assert type(a) is type(template) and a.name == template.name
+    for a, b in zip(first.groups, second.groups):
+        assert a is not b
+        assert all(sq in first.squares for sq in a.property_list)
+        assert all(sq.property_group is a for sq in a.property_list)
+        assert [sq.name for sq in a.property_list] == [sq.name for sq in b.property_list]
+
+
+def test_playing_one_board_leaves_the_other_alone(new_board):
+    first, second = new_board(0, n_players=2), new_board(1, n_players=2)
+    player = first.players[0]
+    square = next(sq for sq in first.squares if isinstance(sq, Property))
+    for other in square.property_group.property_list:
+        first._set_owner(other, player)
+    first._buy_house(player, square)
+    square.mortgaged = True
+
+    twin = second.squares[square.index]
+    assert square.get_owner() is player and square.count_houses() == 1
+    assert twin.get_owner() is None and twin.count_houses() == 0 and not twin.mortgaged
+    template = BoardConfig.squares[square.index]
+    assert template.get_owner() is None and template.count_houses() == 0
+    assert not second.players[0].has_monopoly(twin.property_group)
+
+
+def test_squares_know_their_index(new_board):
+    board = new_board(0)
+    assert [sq.index for sq in board.squares] == list(range(len(board.squares)))
+
+
+def test_decks_are_shuffled_per_board(new_board):
+    a, b, c = new_board(3), new_board(3), new_board(4)
+    assert a.chance_deck.order == b.chance_deck.order
+    assert a.community_deck.order == b.community_deck.order
+    assert (a.chance_deck.order, a.community_deck.order) != \
+        (c.chance_deck.order, c.community_deck.order)
@@ -0,0 +1,55 @@
+from board_config import BoardConfig
+from board_index import BoardIndex
+from squares import (Buyable, Chance, CommunityChest, Jail, Property, Square, Start,
+                     TrainStation, Utility)
+
+
+def scan_next(squares, klass, after):
+    """The first square of klass strictly after index after, by a linear scan."""
+    n = len(squares)
+    for step in range(1, n + 1):
+        i = (after + step) % n
+        if isinstance(squares[i], klass):
+            return i
+
+
+def test_next_of_class_matches_a_scan():
+    index = BoardIndex.for_config()
+    squares = BoardConfig.squares
+    for klass in (Start, Jail, Property, Buyable, TrainStation, Utility, Chance, CommunityChest):
+        for i in range(len(squares)):
+            assert index.next_of_class(klass, i) == scan_next(squares, klass, i), (klass, i)
+
+
+def test_lookups_by_name_class_and_group():
+    index = BoardIndex.for_config()
+    squares = BoardConfig.squares
+    for i, sq in enumerate(squares):
+        assert squares[index.by_name[sq.name]].name == sq.name
+        assert i in index.indices_of(type(sq))
+    assert index.by_name["Jail"] == index.jail == 10
+    assert index.by_name["Start"] == index.start == 0
+    assert index.indices_of(TrainStation) == (5, 15, 25, 35)
+    assert index.indices_of(Square) == ()
+    for gi, group in enumerate(BoardConfig.groups):
+        assert [squares[i] for i in index.group_members[gi]] == group.property_list
+        assert all(index.group_of[i] == gi for i in index.group_members[gi])
+    assert index.group_of[index.jail] == -1
+
+
+def test_index_is_built_once_per_config(new_board):
+    class Other(BoardConfig):
+        pass
+
+    assert BoardIndex.for_config() is BoardIndex.for_config(BoardConfig)
+    assert new_board(0).index is new_board(1).index
+    assert BoardIndex.for_config(Other) is not BoardIndex.for_config()
+
+
+def test_card_moves_use_the_board_index(new_board):
+    board = new_board(0)
+    assert board.get_square_by_class(Utility, from_square=7).name == "Electric Company"
+    assert board.get_square_by_class(Utility, from_square=board.squares[22]).name == "Water Works"
+    assert board.get_square_by_class(TrainStation, from_square=36).name == "Reading Railroad"
+    assert board.get_square_by_class(Start) is board.squares[0]
+    assert board.squares[board.get_square_index_by_name("Illinois Avenue")].name == "Illinois Avenue"
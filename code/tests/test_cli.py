@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+import cli
+
+CODE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_after(script):
+    """Run script in a fresh interpreter and return which of pygame and numpy
+    it left in sys.modules."""
+    check = script + "\nimport sys\nprint(*sorted({'pygame', 'numpy'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", check], cwd=CODE, capture_output=True,
+                            text=True, check=True)
+    return result.stdout.splitlines()[-1].split()
+
+
+def test_headless_imports_skip_pygame_and_numpy():
+    assert loaded_after("import game, cli, simulator, tournament, savegame") == []
+    assert loaded_after("import game\ngame.Game(num_players=2).board.play_single_turn()") == []
+    assert loaded_after("import cli\ncli.main(['simulate', '--games', '2', '--max-turns', '50'])") == []
+
+
+def test_simulate_command(capsys):
+    cli.main(["simulate", "-s", "random", "random", "--games", "3", "--max-turns", "100"])
+    out = capsys.readouterr().out
+    assert "0 (random)" in out and "ended by" in out
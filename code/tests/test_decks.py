@@ -0,0 +1,37 @@
+import random
+
+from decks import Deck
+
+
+def test_draws_cycle_through_the_shuffled_order():
+    deck = Deck("abcdef")
+    deck.shuffle(random.Random(1))
+    assert sorted(deck.order) == list(range(6)) and deck.order != tuple(range(6))
+    drawn = [deck.draw() for _ in range(12)]
+    assert drawn == list(deck.order) * 2
+
+
+def test_held_cards_are_skipped_until_released():
+    deck = Deck("abcd")
+    assert [deck.draw() for _ in range(4)] == [0, 1, 2, 3]
+    deck.hold(1)
+    assert len(deck) == 3
+    assert [deck.draw() for _ in range(3)] == [0, 2, 3]
+    deck.release(1)
+    assert [deck.draw() for _ in range(4)] == [0, 1, 2, 3]
+    for i in range(4):
+        deck.hold(i)
+    assert deck.draw() is None
+
+
+def test_restore_continues_from_the_snapshot():
+    deck = Deck("abcde")
+    deck.shuffle(random.Random(2))
+    deck.draw()
+    deck.hold(deck.order[1])
+    snapshot = deck.snapshot()
+    expected = [deck.draw() for _ in range(6)]
+    deck.release(deck.order[1])
+    deck.shuffle(random.Random(3))
+    deck.restore(snapshot)
+    assert [deck.draw() for _ in range(6)] == expected
@@ -0,0 +1,61 @@
+import random
+from collections import Counter
+
+from dice import DiceStream, Throw, substream
+
+
+def faces(stream, n):
+    return [stream.face() for _ in range(n)]
+
+
+def test_faces_are_even_and_seeded():
+    counts = Counter(faces(DiceStream(1), 60000))
+    assert sorted(counts) == [1, 2, 3, 4, 5, 6]
+    assert all(abs(n / 60000 - 1 / 6) < 0.01 for n in counts.values())
+    assert faces(DiceStream(1), 3000) == faces(DiceStream(1), 3000)
+    assert faces(DiceStream(1), 100) != faces(DiceStream(2), 100)
+
+
+def test_roll_and_batches_do_not_change_the_stream():
+    expected = faces(DiceStream(5, batch=1024), 5000)
+    small = DiceStream(5, batch=1024)
+    rolled = []
+    while len(rolled) < 5000:
+        rolled.extend(small.roll())
+    assert rolled[:5000] == expected
+
+
+def test_seek_jumps_without_replaying():
+    stream = DiceStream(9, batch=64)
+    tells, expected = [], []
+    for _ in range(1000):
+        tells.append(stream.tell())
+        expected.append(stream.face())
+    for i in (997, 0, 1, 60, 61, 500):
+        jumped = DiceStream(9, batch=64)
+        jumped.seek(tells[i])
+        assert faces(jumped, 3) == expected[i:i + 3]
+    stream = DiceStream(9, batch=64)
+    faces(stream, 300)
+    state = stream.getstate()
+    tail = faces(stream, 100)
+    other = DiceStream(1, batch=64)
+    other.setstate(state)
+    assert faces(other, 100) == tail
+
+
+def test_streams_leave_random_alone():
+    random.seed(4)
+    expected = random.random()
+    random.seed(4)
+    faces(DiceStream(3), 5000)
+    Throw(dice=DiceStream(3))
+    substream(3, "decks").random()
+    assert random.random() == expected
+
+
+def test_substreams_differ_by_name_and_seed():
+    draws = {(seed, name): substream(seed, name).random()
+             for seed in (0, 1) for name in ("decks", "strategies")}
+    assert len(set(draws.values())) == 4
+    assert substream(0, "decks").random() == draws[0, "decks"]
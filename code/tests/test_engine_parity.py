@@ -0,0 +1,130 @@
+"""StateEngine must play the Board rules rule for rule: the same seed and the
+same decisions give the same game, turn by turn."""
+import random
+
+import pytest
+
+from board import Board
+from cards import AdvanceRailroad, AdvanceUtility
+from dice import DiceStream
+from engine import RandomPolicy, StateEngine
+from squares import TrainStation, Utility
+from state import GameState
+from strategy import RandomStrategy
+
+TURNS = 400
+
+
+def view(state):
+    """What both sides must agree on; a bankrupt player's leftovers differ."""
+    alive = state.alive_players()
+    return (
+        list(state.alive), state.current, state.doubles,
+        list(state.owner), list(state.level), list(state.mortgaged),
+        list(state.deck_position), list(state.card_holder),
+        [(uid, state.positions[uid], state.cash[uid], state.skip[uid],
+          state.double_rent[uid], state.jail[uid], state.creditor[uid]) for uid in alive],
+    )
+
+
+def board_trace(seed, n_players):
+    board = Board(num_players=n_players,
+                  strategies=[RandomStrategy() for _ in range(n_players)], seed=seed)
+    start = GameState.from_board(board)
+    # RandomStrategy and RandomPolicy draw the same numbers from the random module
+    random.seed(seed)
+    trace = []
+    for _ in range(TURNS):
+        if len(board.players) == 1:
+            break
+        board.play_single_turn()
+        trace.append(view(GameState.from_board(board)))
+    return start, trace
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("seed", range(0, 120, 3))
+def test_engine_plays_board_games(seed, n_players):
+    state, trace = board_trace(seed, n_players)
+    assert trace
+    random.seed(seed)
+    engine = StateEngine([RandomPolicy() for _ in range(n_players)], dice=DiceStream(seed))
+    for turn, expected in enumerate(trace):
+        engine.play_turn(state)
+        assert view(state) == expected, "seed {0} diverges at turn {1}".format(seed, turn)
+
+
+def test_new_game_matches_board():
+    for seed in range(20):
+        assert (GameState.new_game(4, seed).snapshot()
+                == GameState.from_board(Board(seed=seed)).snapshot())
+
+
+@pytest.mark.parametrize("card_class, square_class",
+                         [(AdvanceRailroad, TrainStation), (AdvanceUtility, Utility)])
+@pytest.mark.parametrize("mortgaged", [False, True])
+def test_nearest_cards(card_class, square_class, mortgaged):
+    board = Board(seed=1)
+    player, owner = board.players[0], board.players[1]
+    chance = board.squares.index(
+        next(sq for sq in board.squares if type(sq).__name__ == "Chance"))
+    target = board.get_square_by_class(square_class, from_square=board.squares[chance])
+    board._set_owner(target, owner)
+    target.mortgaged = mortgaged
+    board.positions[0] = chance
+    state = GameState.from_board(board)
+
+    deck = board.chance_deck
+    card = next(c for c in deck.cards if isinstance(c, card_class))
+    card.action(board, player, square=board.squares[chance])
+
+    engine = StateEngine([RandomPolicy() for _ in range(4)], dice=DiceStream(1))
+    state.deck_order[state.deck_position[0]] = deck.cards.index(card)
+    engine.play_card(state, 0, chance, 0)
+
+    assert state.positions[0] == board.positions[0] == target.index
+    assert state.cash[0] == player.cash
+    assert state.cash[1] == owner.cash
+    if mortgaged:
+        assert player.cash == 1500
+
+
+@pytest.mark.parametrize("seed", [3, 8, 21])
+def test_every_card(seed, new_board, play):
+    """Each card of both decks, drawn on each of its squares mid-game, does
+    the same on Board (Card.action) and StateEngine (Card.effect)."""
+    start = new_board(seed, 3)
+    play(start, 60, seed)
+    # buildings for the repair cards: a hotel and two houses
+    drawer = start.players[start.current]
+    street = next(sq for sq in start.squares if hasattr(sq, "house_count"))
+    group = street.property_group.property_list
+    for square in group:
+        start._set_owner(square, drawer)
+        square.mortgaged = False
+    for square, level in ((group[0], 5), (group[1], 2)):
+        while square.building_level() < level:
+            start._buy_house(drawer, square)
+    snapshot = start.snapshot()
+    for deck_no, (deck, kind) in enumerate([(start.chance_deck, "Chance"),
+                                            (start.community_deck, "CommunityChest")]):
+        squares = [sq for sq in start.squares if type(sq).__name__ == kind]
+        for i in range(len(deck.cards)):
+            if i in deck.held:
+                continue
+            for square in squares:
+                board = start
+                board.restore(snapshot)
+                uid = board.players[board.current].uid
+                board.positions[board.current] = square.index
+                deck.position = deck.order.index(i)
+                state = GameState.from_board(board)
+                random.seed(i)
+                board._draw_card(deck, board.players[board.current], square)
+
+                engine = StateEngine([RandomPolicy() for _ in range(3)],
+                                     dice=DiceStream(board.seed))
+                engine.dice.setstate(snapshot.dice)
+                random.seed(i)
+                engine.play_card(state, uid, square.index, deck_no)
+                assert view(state) == view(GameState.from_board(board)), deck.cards[i].name
@@ -0,0 +1,70 @@
+import io
+import json
+import random
+
+from board import Board
+from events import (BinarySink, ConsoleSink, Event, EventKind, JsonlSink, RingBuffer,
+                    format_event, read_binary)
+from strategy import RandomStrategy
+
+
+def played(seed, events=None, turns=150):
+    board = Board(num_players=3, strategies=[RandomStrategy() for _ in range(3)],
+                  events=events, seed=seed)
+    random.seed(seed)
+    for _ in range(turns):
+        if len(board.players) == 1:
+            break
+        board.play_single_turn()
+    return board
+
+
+def test_sinks_do_not_change_the_game(play, new_board):
+    silent = play(new_board(4, n_players=3), 150, 4)
+    sink = RingBuffer(maxlen=None)
+    board = Board(num_players=3, strategies=[RandomStrategy() for _ in range(3)],
+                  events=sink, seed=4)
+    assert play(board, 150, 4) == silent
+    kinds = [event.kind for event in sink.events()]
+    # one roll or skip per turn
+    assert kinds.count(EventKind.ROLL) + kinds.count(EventKind.SKIP) == len(silent)
+    assert EventKind.MOVE in kinds and EventKind.BUY in kinds
+
+
+def test_disabled_events_print_nothing(capsys):
+    played(5)
+    assert capsys.readouterr().out == ""
+    played(5, ConsoleSink(), turns=5)
+    assert "rolls" in capsys.readouterr().out
+
+
+def test_ring_buffer_keeps_the_last_events():
+    everything, recent = RingBuffer(maxlen=None), RingBuffer(maxlen=10)
+    played(6, everything)
+    played(6, recent)
+    assert recent.events() == everything.events()[-10:]
+
+
+def test_file_sinks_round_trip():
+    memory = RingBuffer(maxlen=None)
+    played(7, memory)
+    expected = memory.events()
+
+    text = io.StringIO()
+    played(7, JsonlSink(text))
+    rows = [json.loads(line) for line in text.getvalue().splitlines()]
+    assert [Event(EventKind[r["kind"]], r["uid"], r["square"], r["amount"]) for r in rows] \
+        == expected
+
+    data = io.BytesIO()
+    played(7, BinarySink(data))
+    assert len(data.getvalue()) == BinarySink.record.size * len(expected)
+    data.seek(0)
+    assert list(read_binary(data)) == [e._replace(amount=int(e.amount)) for e in expected]
+
+
+def test_format_event():
+    board = played(8, turns=0)
+    line = format_event(Event(EventKind.BUY, 1, 39, 400), board)
+    assert line == "{0} buys {1} for $400".format(board.players[1], board.squares[39])
+    assert format_event(Event(EventKind.RENT, 2, 5, 25)) == "Player2 pays $25 rent on square 5"
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from expectimax import Expectimax
+from mcts import PURCHASE
+from state import NOBODY, GameState
+from strategy import MinimaxStrategy, RandomStrategy
+
+
+@pytest.fixture
+def midgame(new_board, play):
+    """midgame(seed): a three-player Board 40 turns into its game."""
+    def make(seed):
+        board = new_board(seed, 3)
+        play(board, 40, seed)
+        return board
+    return make
+
+
+def test_a_double_keeps_the_turn_after_the_decision(midgame):
+    state = GameState.from_board(midgame(1))
+    uid = state.current
+    search = Expectimax(depth=1)
+    tables = search.engine.tables
+    square = next(sq for sq in tables.buyable if state.owner[sq] == NOBODY)
+    state.positions[uid] = square
+
+    rolled_again = state.copy()
+    rolled_again.cash[uid] -= tables.price[square]
+    rolled_again.owner[square] = uid
+    rolled_again.doubles += 1
+    expected = Expectimax(depth=1).value(rolled_again, uid, 1)
+    assert search.action_value(state, uid, PURCHASE, square, True, again=True) == expected
+
+    passed_on = rolled_again.copy()
+    passed_on.doubles -= 1
+    search.engine.end_turn(passed_on)
+    expected = Expectimax(depth=1).value(passed_on, uid, 1)
+    assert search.action_value(state, uid, PURCHASE, square, True) == expected
+
+
+def test_value_restores_the_state_it_searched(midgame):
+    for seed in range(5):
+        state = GameState.from_board(midgame(seed))
+        for uid in range(state.n_players):
+            state.creditor[uid] = (uid + 1) % state.n_players
+        before = state.snapshot()
+        Expectimax(depth=2).value(state, state.current, 2)
+        assert state.snapshot() == before
+
+
+class _Watcher(RandomStrategy):
+    """Remembers board.roll_again at each purchase decision."""
+
+    def __init__(self):
+        super().__init__()
+        self.seen = []
+
+    def decide_purchase(self, board, player, square):
+        self.seen.append(board.roll_again)
+        return super().decide_purchase(board, player, square)
+
+
+def test_board_tells_strategies_about_another_roll(new_board):
+    watchers = [_Watcher() for _ in range(3)]
+    board = new_board(4, 3, watchers)
+    random.seed(4)
+    for _ in range(300):
+        if len(board.players) < 3:
+            break
+        player = board.players[board.current]
+        seen = len(player.strategy.seen)
+        board.play_single_turn()
+        if len(player.strategy.seen) > seen:
+            again = player.strategy.seen[-1]
+            plays_again = board.players[board.current] is player
+            assert again == plays_again or (
+                again and (player.is_in_jail() or player not in board.players))
+    assert any(any(w.seen) for w in watchers)
+    assert not board.roll_again
+
+
+def test_minimax_strategy_plays_a_game(new_board, play):
+    board = new_board(2, 2, [MinimaxStrategy(depth=1), RandomStrategy()])
+    assert play(board, 100, 2)
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+CODE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def ui(monkeypatch, tmp_path, new_board):
+    """A Game with its UI up on SDL's dummy video driver, sprites cached in
+    tmp_path; returns (game, rects passed to each display.update)."""
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame = pytest.importorskip("pygame")
+    import atlas
+    from game import Game
+
+    load_atlas = atlas.load_atlas
+    monkeypatch.setattr(atlas, "load_atlas",
+                        lambda assets: load_atlas(assets, cache=str(tmp_path)))
+    monkeypatch.chdir(CODE)
+    game = Game(board=new_board(2, n_players=3))
+    game._init_ui()
+    updates = []
+    monkeypatch.setattr(pygame.display, "update", lambda rects: updates.append(list(rects)))
+    yield game, updates
+    pygame.quit()
+
+
+def pixels(game):
+    import pygame
+
+    return pygame.image.tobytes(game.screen, "RGB")
+
+
+def test_only_sprites_are_redrawn_while_buildings_stay(ui):
+    game, updates = ui
+    full = game.screen.get_rect()
+    game._draw_board()
+    assert full in updates[-1]
+    static = game._static
+
+    game.last_roll, game.last_message = (3, 4), "a move"
+    game._draw_board()
+    assert full not in updates[-1]
+    assert game._static is static
+    # the old sprites are restored and the new ones drawn
+    assert len(updates[-1]) == 3 + 2 * 3
+
+    board = game.board
+    player = board.players[0]
+    square = next(board.squares[i] for i in game._property_squares)
+    board._set_owner(square, player)
+    board._buy_house(player, square)
+    game._draw_board()
+    assert full in updates[-1]
+    assert game._static is not static
+
+
+def test_incremental_frames_match_a_full_redraw(ui):
+    game, _ = ui
+    board = game.board
+    game._draw_board()
+    for turn in range(60):
+        game._advance()
+        if turn % 10 == 0:
+            # build somewhere so the static layer changes too
+            player = board.players[board.current]
+            square = board.squares[game._property_squares[turn // 10]]
+            board._set_owner(square, player)
+            board._buy_house(player, square)
+        game._draw_board()
+        drawn = pixels(game)
+        game._buildings = None
+        game._draw_board()
+        assert pixels(game) == drawn, turn
+
+
+def test_sprite_slots_follow_the_tiles(ui):
+    game, _ = ui
+    for idx in range(len(game.board.squares)):
+        x, y = game._get_tile_pos(idx)
+        assert game._token_slots[idx] == tuple((x + 8 * i, y + 8 * i) for i in range(4))
+        assert game._house_slots[idx] == tuple((x + 5 + 12 * h, y + 5) for h in range(4))
+        assert game._hotel_slots[idx] == (x + 5, y + 20)
+    tiles = {game._get_tile_pos(idx) for idx in range(len(game.board.squares))}
+    assert len(tiles) == len(game.board.squares)
+    assert all(0 <= x < 800 and 0 <= y < 800 for x, y in tiles)
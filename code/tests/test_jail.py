@@ -0,0 +1,112 @@
+from cards import GetOutJailFree
+from strategy import JAIL_CARD, JAIL_PAY, JAIL_ROLL, RandomStrategy
+
+
+class Loaded:
+    """Dice that roll the given pairs in order."""
+
+    def __init__(self, *rolls):
+        self.rolls = list(rolls)
+
+    def roll(self):
+        return self.rolls.pop(0)
+
+
+class Sitter(RandomStrategy):
+    """Never buys, bids or builds; answers `leave` in jail."""
+
+    def __init__(self, leave=JAIL_ROLL):
+        super().__init__()
+        self.leave = leave
+
+    def decide_purchase(self, board, player, square):
+        return False
+
+    def decide_bid_auction(self, board, player, square, current_bids):
+        return 0
+
+    def decide_build_house(self, board, player, square):
+        return False
+
+    def decide_leave_jail(self, board, player):
+        return self.leave
+
+
+def jailed(new_board, leave=JAIL_ROLL, *rolls):
+    board = new_board(0, n_players=2, strategies=[Sitter(leave), Sitter()])
+    player = board.players[0]
+    board.send_to_jail(player)
+    board.dice = Loaded(*rolls)
+    return board, player
+
+
+def test_third_failed_roll_pays_the_fine_and_moves(new_board):
+    board, player = jailed(new_board, JAIL_ROLL, (1, 2), (1, 3), (2, 3), (2, 4))
+    cash = player.get_cash()
+    for attempt in range(1, 3):
+        board.current = 0
+        board.play_single_turn()
+        assert player.is_in_jail() and player.count_failed_attempts_fail() == attempt
+        assert board.positions[0] == board.index.jail
+    board.current = 0
+    board.play_single_turn()
+    assert not player.is_in_jail()
+    assert player.get_cash() == cash - board.jail_fine
+    assert board.positions[0] == board.index.jail + 5
+    assert board.current == 1
+
+
+def test_doubles_free_without_another_roll(new_board):
+    board, player = jailed(new_board, JAIL_ROLL, (2, 2))
+    cash = player.get_cash()
+    board.play_single_turn()
+    assert not player.is_in_jail()
+    assert player.get_cash() == cash
+    assert board.positions[0] == board.index.jail + 4
+    assert board.current == 1 and board.doubles_rolled == 0
+
+
+def test_paying_or_a_card_leaves_before_rolling(new_board):
+    board, player = jailed(new_board, JAIL_PAY, (1, 2))
+    cash = player.get_cash()
+    board.play_single_turn()
+    assert not player.is_in_jail()
+    assert player.get_cash() == cash - board.jail_fine
+    assert board.positions[0] == board.index.jail + 3
+
+    board, player = jailed(new_board, JAIL_CARD, (1, 2))
+    card = next(c for c in board.chance_deck.cards if isinstance(c, GetOutJailFree))
+    player.add_card(card)
+    cash = player.get_cash()
+    board.play_single_turn()
+    assert not player.is_in_jail() and not player.has_jail_card()
+    assert player.get_cash() == cash
+    assert board.positions[0] == board.index.jail + 3
+
+
+def test_card_answer_without_a_card_rolls(new_board):
+    board, player = jailed(new_board, JAIL_CARD, (1, 2))
+    board.play_single_turn()
+    assert player.is_in_jail() and player.count_failed_attempts_fail() == 1
+
+
+def test_third_double_goes_to_jail(new_board):
+    board = new_board(0, n_players=2, strategies=[Sitter(), Sitter()])
+    board.dice = Loaded((1, 1), (2, 2), (3, 3))
+    player = board.players[0]
+    for _ in range(2):
+        board.play_single_turn()
+        assert board.current == 0 and not player.is_in_jail()
+    board.play_single_turn()
+    assert player.is_in_jail()
+    assert board.positions[0] == board.index.jail
+    assert board.current == 1
+
+
+def test_go_to_jail_square(new_board):
+    board = new_board(0, n_players=2, strategies=[Sitter(), Sitter()])
+    board.positions[0] = board.get_square_index_by_name("Go to Jail") - 7
+    board.dice = Loaded((3, 4))
+    board.play_single_turn()
+    assert board.players[0].is_in_jail()
+    assert board.positions[0] == board.index.jail
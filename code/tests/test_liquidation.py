@@ -0,0 +1,51 @@
+import itertools
+import random
+from types import SimpleNamespace
+
+from liquidation import MORTGAGE, SELL_BUILDING, plan_liquidation
+
+
+def make_tables(mortgage, house_cost=None):
+    n = len(mortgage)
+    return SimpleNamespace(mortgage=list(mortgage), house_cost=list(house_cost or [0] * n))
+
+
+def test_mortgages_overshoot_the_least():
+    rng = random.Random(0)
+    for _ in range(200):
+        mortgage = [rng.choice(range(30, 210, 5)) for _ in range(rng.randint(1, 8))]
+        tables = make_tables(mortgage)
+        holdings = [(sq, 0, False) for sq in range(len(mortgage))]
+        need = rng.randint(1, sum(mortgage))
+        actions, raised = plan_liquidation(holdings, need, tables)
+        best = min(sum(c) for k in range(1, len(mortgage) + 1)
+                   for c in itertools.combinations(mortgage, k) if sum(c) >= need)
+        assert raised == best
+        assert all(action == MORTGAGE for action, _ in actions)
+        assert raised == sum(mortgage[sq] for _, sq in actions)
+
+
+def test_mortgaged_squares_are_skipped():
+    tables = make_tables([100, 60, 80])
+    actions, raised = plan_liquidation([(0, 0, True), (1, 0, False), (2, 0, False)], 70, tables)
+    assert actions == [(MORTGAGE, 2)] and raised == 80
+
+
+def test_buildings_are_sold_cheapest_first():
+    #            square  0    1    2    3
+    tables = make_tables([50, 100, 100, 150], house_cost=[0, 50, 200, 0])
+    holdings = [(0, 0, False), (1, 2, False), (2, 1, False), (3, 0, True)]
+    actions, raised = plan_liquidation(holdings, 250, tables)
+    # the bare square's mortgage falls short: sell the 50 houses (25 each),
+    # mortgage that square, then the 200 house
+    assert actions == [(MORTGAGE, 0), (SELL_BUILDING, 1), (SELL_BUILDING, 1),
+                       (MORTGAGE, 1), (SELL_BUILDING, 2)]
+    assert raised == 50 + 25 + 25 + 100 + 100 >= 250
+
+
+def test_nothing_to_raise_and_not_enough():
+    tables = make_tables([50, 100], house_cost=[0, 50])
+    assert plan_liquidation([(0, 0, False)], 0, tables) == ([], 0)
+    actions, raised = plan_liquidation([(0, 0, False), (1, 1, False)], 1000, tables)
+    assert raised == 50 + 25 + 100 < 1000
+    assert actions == [(MORTGAGE, 0), (SELL_BUILDING, 1), (MORTGAGE, 1)]
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from engine import RandomPolicy, StateEngine
+from mcts import MCTS, PURCHASE, RootParallelMCTS, _search_snapshot
+from state import NOBODY, GameState
+from strategy import MCTStrategy, RandomStrategy
+
+
+@pytest.fixture
+def decision_state(new_board, play):
+    """decision_state(seed): (state, uid, square) with the player to move
+    standing on an unowned square 30 turns into a game."""
+    def make(seed):
+        board = new_board(seed, 3)
+        play(board, 30, seed)
+        state = GameState.from_board(board)
+        uid = state.current
+        square = next(sq for sq in board.tables.buyable if state.owner[sq] == NOBODY)
+        state.positions[uid] = square
+        return state, uid, square
+    return make
+
+
+def test_root_action_on_doubles_keeps_the_turn(decision_state):
+    state, uid, square = decision_state(3)
+    search = MCTS(iterations=1, seed=0)
+    engine = StateEngine([RandomPolicy()] * state.n_players, rng=search.rng)
+
+    sim = state.copy()
+    search._apply(engine, sim, uid, PURCHASE, square, True, None, True)
+    assert (sim.current, sim.doubles, sim.owner[square]) == (uid, state.doubles + 1, uid)
+
+    sim = state.copy()
+    search._apply(engine, sim, uid, PURCHASE, square, True, None, False)
+    assert sim.current != uid and sim.doubles == 0
+
+
+def test_search_is_reproducible(decision_state):
+    state, uid, square = decision_state(5)
+    first = MCTS(iterations=30, rollout_turns=10, seed=1).search(
+        state, uid, PURCHASE, square, again=True)
+    second = MCTS(iterations=30, rollout_turns=10, seed=1).search(
+        state, uid, PURCHASE, square, again=True)
+    stats = lambda root: {k: (c.visits, c.value) for k, c in root.children.items()}
+    assert stats(first) == stats(second)
+    assert first.visits == 30
+    assert set(first.children) == {(PURCHASE, False), (PURCHASE, True)}
+
+
+def test_mcts_strategy_plays_a_game(new_board, play):
+    board = new_board(6, 2, [MCTStrategy(iterations=5, rollout_turns=5, seed=0),
+                             RandomStrategy()])
+    assert play(board, 60, 6)
+
+
+def test_root_parallel_sums_the_workers_visits(decision_state):
+    state, uid, square = decision_state(5)
+    seeds = random.Random(2)
+    visits = {}
+    for _ in range(2):
+        task = (state.snapshot(), uid, PURCHASE, square, None, False, 20, None, 1.4, 10,
+                RandomPolicy(), seeds.getrandbits(64))
+        stats, rollouts = _search_snapshot(task)
+        assert rollouts == 20
+        for key, (n, _value) in stats.items():
+            visits[key] = visits.get(key, 0) + n
+
+    with RootParallelMCTS(2, iterations=20, rollout_turns=10, seed=2) as search:
+        action = search.best_action(state, uid, PURCHASE, square)
+        assert search.rollouts == 40
+        assert search.best_action(state, uid, PURCHASE, square) in (False, True)
+        assert search._pool is not None
+    assert search._pool is None
+    assert action == max(visits, key=visits.get)[1]
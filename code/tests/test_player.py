@@ -0,0 +1,63 @@
+import random
+from collections import Counter
+
+from cards import DoubleRent, GetOutJailFree
+from player import Player
+from squares import TrainStation, Utility
+
+
+def test_has_jail_card():
+    player = Player()
+    assert not player.has_jail_card()
+    player.add_card(DoubleRent())
+    assert not player.has_jail_card()
+    player.add_card(GetOutJailFree())
+    assert player.has_jail_card()
+
+
+def test_leaving_jail_uses_the_jail_card(new_board):
+    board = new_board(0, 2)
+    player = board.players[0]
+    jail_card = next(c for c in board.community_deck.cards if isinstance(c, GetOutJailFree))
+    other = DoubleRent()
+    player.add_card(other)
+    player.add_card(jail_card)
+    board.send_to_jail(player)
+    board._jail_decision(player)
+    assert not player.is_in_jail()
+    assert player.cards == [other]
+
+
+def recount(player):
+    """The aggregates of player counted from its squares."""
+    squares = player.property_list
+    groups = Counter(sq.property_group for sq in squares if hasattr(sq, "property_group"))
+    return (
+        sum(sq.count_houses() for sq in squares),
+        sum(sq.count_hotels() for sq in squares),
+        sum(isinstance(sq, Utility) for sq in squares),
+        sum(isinstance(sq, TrainStation) for sq in squares),
+        dict(groups),
+        {g for g, n in groups.items() if n == len(g.property_list)},
+    )
+
+
+def aggregates(player):
+    return (player.houses, player.hotels, player.utilities, player.railroads,
+            {g: n for g, n in player.group_counts.items() if n},
+            player.monopolies)
+
+
+def test_aggregates_follow_the_squares(new_board):
+    built = 0
+    for seed in range(4):
+        board = new_board(seed, n_players=3)
+        random.seed(seed)
+        for _ in range(400):
+            if len(board.players) == 1:
+                break
+            board.play_single_turn()
+            for player in board.all_players:
+                assert aggregates(player) == recount(player)
+                built += player.houses + player.hotels
+    assert built
@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+import pytest
+
+from board_config import BoardConfig
+from dice import DiceStream
+from engine import StateEngine
+from probability import LandingModel
+from rent import RentTable
+from squares import Property
+from state import GameState
+from strategy import JAIL_ROLL
+
+
+class _Roller:
+    """Never buys, bids or builds; rolls to leave jail."""
+
+    def decide_purchase(self, engine, state, uid, square):
+        return False
+
+    def decide_bid_auction(self, engine, state, uid, square, current_bids):
+        return 0
+
+    def decide_build_house(self, engine, state, uid, square):
+        return False
+
+    def decide_leave_jail(self, engine, state, uid):
+        return JAIL_ROLL
+
+
+def test_landing_matches_a_played_game():
+    model = LandingModel.for_config()
+    engine = StateEngine([_Roller()], dice=DiceStream(1), rng=random.Random(1))
+    state = GameState.new_game(1, 1)
+    counts = np.zeros(model.size)
+    rolls = 200000
+    for _ in range(rolls):
+        engine.play_turn(state)
+        counts[state.positions[0]] += 1
+    assert np.abs(counts / rolls - model.landing).max() < 0.004
+    # up to three rolls in jail, not one
+    assert model.landing[model.jail] > 0.1
+
+
+def test_rents_follow_the_rent_table():
+    model = LandingModel.for_config()
+    rents = RentTable.for_config()
+    monopolies = 0
+    for i, sq in enumerate(BoardConfig.squares):
+        group = len(rents.members[i])
+        for level in range(2):
+            for count in range(1, group + 1):
+                expected = model.landing[i] * rents.rent(i, level, count)
+                assert model.expected_rent_per_roll(i, level, count) == pytest.approx(expected)
+        if isinstance(sq, Property):
+            # a whole group without buildings charges the monopoly rent
+            assert model.expected_rent_per_roll(i) == pytest.approx(
+                model.landing[i] * sq.monopoly_rent)
+            monopolies += sq.monopoly_rent != sq.rent[0]
+    assert monopolies
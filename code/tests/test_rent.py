@@ -0,0 +1,58 @@
+import random
+from types import SimpleNamespace
+
+from squares import Buyable, Property, TrainStation, Utility
+
+
+def roll(total):
+    return SimpleNamespace(get_amount=lambda: total)
+
+
+def test_rent_table_matches_compute_rent(new_board):
+    rng = random.Random(0)
+    built = 0
+    for seed in range(20):
+        board = new_board(seed, n_players=2)
+        for square in board.squares:
+            if isinstance(square, Buyable) and rng.random() < 0.7:
+                board._set_owner(square, rng.choice(board.players))
+        for player in board.players:
+            for group in player.monopolies:
+                for square in group.property_list:
+                    for _ in range(rng.randint(0, 5)):
+                        board._buy_house(player, square)
+                    built += square.building_level()
+        for square in board.squares:
+            if isinstance(square, Buyable) and square.get_owner() is not None:
+                dice = rng.randint(2, 12)
+                assert board.rents.square_rent(square, dice) == \
+                    square.compute_rent(thr=roll(dice)), square
+    assert built
+
+
+def test_railroads_and_utilities_by_count_owned(new_board):
+    board = new_board(0, n_players=2)
+    owner = board.players[0]
+    for klass, rents in ((TrainStation, [25, 50, 100, 200]), (Utility, [4 * 8, 10 * 8])):
+        squares = [board.squares[i] for i in board.index.indices_of(klass)]
+        for count, rent in enumerate(rents, 1):
+            board._set_owner(squares[count - 1], owner)
+            for square in squares[:count]:
+                assert board.rents.square_rent(square, 8) == rent
+
+
+def test_monopoly_rent_on_a_bare_group(new_board):
+    board = new_board(0, n_players=2)
+    owner = board.players[0]
+    square = next(sq for sq in board.squares
+                  if isinstance(sq, Property) and sq.monopoly_rent != sq.rent[0])
+    group = square.property_group.property_list
+    for other in group:
+        board._set_owner(other, owner)
+    assert board.rents.square_rent(square) == square.monopoly_rent
+    other = next(sq for sq in group if sq is not square)
+    board._set_owner(other, board.players[1])
+    assert board.rents.square_rent(square) == square.rent[0]
+    board._set_owner(other, owner)
+    board._buy_house(owner, square)
+    assert board.rents.square_rent(square) == square.rent[1]
@@ -0,0 +1,97 @@
+"""Replays: a recorded game plays back, and seeks, to the same states."""
+import random
+
+import pytest
+
+from replay import Recorder, Replay, ReplayError, ReplayPlayer
+from state import GameState
+from strategy import RandomStrategy, RLStrategy
+
+
+class MortgagingModel:
+    """RL model that mortgages to pay whenever it may, else takes a random
+    allowed action; counts its mortgages."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.mortgages = 0
+
+    def __call__(self, observation, mask):
+        import rl_env
+
+        if mask[rl_env.MORTGAGE]:
+            self.mortgages += 1
+            return rl_env.MORTGAGE
+        return self.rng.choice([a for a in range(len(mask)) if mask[a]])
+
+
+@pytest.fixture
+def record(new_board, play):
+    """record(seed, turns, n_players=4, strategies=None): record a game and
+    return the Replay and the state after each turn (index 0 is the start)."""
+    def run(seed, turns, n_players=4, strategies=None):
+        board = new_board(seed, n_players, strategies)
+        play(board, seed % 5 * 10, seed)
+        recorder = Recorder(board)
+        states = [GameState.from_board(board).snapshot()]
+        for _ in range(turns):
+            if len(board.players) == 1:
+                break
+            recorder.play_turn()
+            states.append(GameState.from_board(board).snapshot())
+        recorder.detach()
+        return recorder.replay(), states
+    return run
+
+
+@pytest.mark.parametrize("n_players", [2, 4])
+@pytest.mark.parametrize("seed", range(6))
+def test_replay_plays_the_recorded_game(seed, n_players, record):
+    replay, states = record(seed, 300, n_players)
+    player = ReplayPlayer(Replay.loads(replay.dumps()))
+    assert GameState.from_board(player.board).snapshot() == states[0]
+    for expected in states[1:]:
+        player.step()
+        assert GameState.from_board(player.board).snapshot() == expected
+    assert player.at_end()
+    with pytest.raises(ReplayError):
+        player.step()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_replay_with_an_rl_seat(seed, record):
+    """RLStrategy answers mortgage-to-pay; the Board does the mortgaging, so
+    playback mortgages too."""
+    pytest.importorskip("numpy")
+    model = MortgagingModel(seed)
+    strategies = [RLStrategy(model), RandomStrategy(), RLStrategy(MortgagingModel(seed + 1))]
+    replay, states = record(seed, 300, 3, strategies)
+    player = ReplayPlayer(Replay.loads(replay.dumps()))
+    for expected in states[1:]:
+        player.step()
+        assert GameState.from_board(player.board).snapshot() == expected
+    assert model.mortgages
+
+
+def test_seek(record):
+    replay, states = record(6, 400)
+    player = ReplayPlayer(replay, every=25)
+    rng = random.Random(1)
+    last = len(states) - 1
+    assert last > 100
+    for turn in [last, 0, 100, 25, 24, 26, last // 2] + [
+            rng.randrange(len(states)) for _ in range(20)]:
+        board = player.seek(turn)
+        assert player.turn == turn
+        assert GameState.from_board(board).snapshot() == states[turn]
+    with pytest.raises(ReplayError):
+        player.seek(len(states))
+
+
+def test_file_round_trip(tmp_path, record):
+    replay, _ = record(4, 200)
+    path = str(tmp_path / "game.rpl")
+    replay.save(path)
+    loaded = Replay.load(path)
+    assert loaded.dumps() == replay.dumps()
+    assert len(loaded) == len(replay)
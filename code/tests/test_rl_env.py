@@ -0,0 +1,82 @@
+import random
+
+import numpy as np
+
+from dice import DiceStream
+from rl_env import MonopolyEnv, VecEnv, _PolicyStream
+
+
+def test_policy_stream_is_not_the_dice_stream():
+    for seed in (0, 1, 12345):
+        stream = _PolicyStream(seed, batch=64)
+        draws = {stream.random() for _ in range(256)}
+        for block in range(4):
+            # the generator behind dice batch `block`
+            dice_rng = random.Random(seed * 2**32 + block)
+            assert not draws & {dice_rng.random() for _ in range(64)}
+
+
+def test_policy_draws_are_uncorrelated_with_the_dice():
+    for seed in (0, 7):
+        dice = DiceStream(seed)
+        stream = _PolicyStream(seed)
+        faces = np.array([dice.face() for _ in range(20000)], float)
+        draws = np.array([stream.random() for _ in range(20000)])
+        assert abs(np.corrcoef(faces, draws)[0, 1]) < 0.03
+
+
+def play(env, seed, steps=200):
+    """Reset env with seed and step it with seeded random allowed actions;
+    return the observations, rewards and masks seen."""
+    rng = random.Random(seed)
+    obs, info = env.reset(seed)
+    trace = [obs.copy()]
+    for _ in range(steps):
+        mask = info["action_mask"]
+        if not mask.any():
+            break
+        action = rng.choice(np.flatnonzero(mask).tolist())
+        obs, reward, terminated, truncated, info = env.step(action)
+        trace.append((obs.copy(), reward, terminated, truncated, info["action_mask"].copy()))
+        if terminated or truncated:
+            break
+    return trace
+
+
+def same(a, b):
+    return len(a) == len(b) and all(
+        np.array_equal(x, y) if isinstance(x, np.ndarray) else
+        all(np.array_equal(u, v) for u, v in zip(x, y)) for x, y in zip(a, b))
+
+
+def test_env_reset_and_step_are_deterministic():
+    env = MonopolyEnv(n_players=3, max_turns=300)
+    first = play(env, 11)
+    assert len(first) > 10
+    play(env, 12)
+    assert same(play(env, 11), first)
+    assert same(play(MonopolyEnv(n_players=3, max_turns=300), 11), first)
+    assert not same(play(env, 12), first)
+
+
+def test_vec_env_is_deterministic():
+    def run():
+        envs = VecEnv(3, seed=5, n_players=2, max_turns=200)
+        rng = random.Random(0)
+        obs, masks = envs.reset()
+        trace = [obs]
+        for _ in range(100):
+            actions = [rng.choice(np.flatnonzero(m).tolist() or [0]) for m in masks]
+            obs, rewards, terminated, truncated, masks = envs.step(actions)
+            trace.append((obs, rewards, terminated, truncated, masks))
+        return trace
+
+    assert same(run(), run())
+
+
+def test_vec_env_plays_the_seeds_of_single_envs():
+    envs = VecEnv(2, seed=20, n_players=2, max_turns=200)
+    obs, _ = envs.reset()
+    for i in range(2):
+        expected, _ = MonopolyEnv(n_players=2, max_turns=200).reset(20 + i)
+        assert np.array_equal(obs[i], expected)
@@ -0,0 +1,114 @@
+"""Save games: save -> load -> continue plays the same game, and a damaged
+file raises SaveGameError."""
+import io
+import random
+
+import pytest
+
+import savegame
+from savegame import SaveGameError
+from state import GameState
+from strategy import RandomStrategy
+
+
+def strategies(n):
+    return [RandomStrategy() for _ in range(n)]
+
+
+@pytest.mark.parametrize("n_players", [2, 3, 4])
+@pytest.mark.parametrize("seed", range(8))
+def test_save_load_continue(seed, n_players, new_board, play):
+    board = new_board(seed, n_players)
+    play(board, 30 + 10 * seed, seed)
+    body = savegame.encode(board)
+
+    loaded = savegame.new_board(body, strategies(n_players))
+    assert savegame.encode(loaded) == body
+    assert GameState.from_board(loaded).snapshot() == GameState.from_board(board).snapshot()
+    assert play(loaded, 150, seed + 1) == play(board, 150, seed + 1)
+
+
+def test_file_round_trip(tmp_path, new_board, play):
+    boards = [new_board(seed, n) for seed, n in ((1, 2), (2, 3), (3, 4))]
+    for seed, board in enumerate(boards):
+        play(board, 50, seed)
+    path = str(tmp_path / "games.sav")
+    savegame.save_file(path, boards)
+    loaded = savegame.load_file(path)
+    assert [savegame.encode(b) for b in loaded] == [savegame.encode(b) for b in boards]
+
+
+def test_large_seed(new_board, play):
+    board = new_board(2**64 - 1)
+    play(board, 20, 0)
+    loaded = savegame.new_board(savegame.encode(board))
+    assert loaded.seed == 2**64 - 1
+    assert savegame.encode(loaded) == savegame.encode(board)
+
+
+def test_negative_seed_is_refused(new_board):
+    with pytest.raises(SaveGameError):
+        savegame.encode(new_board(-1))
+
+
+def test_bad_header(new_board):
+    with pytest.raises(SaveGameError):
+        list(savegame.iter_bodies(io.BytesIO(b"PNG\x00\x01\x00")))
+    data = io.BytesIO()
+    savegame.dump([new_board(0)], data)
+    with pytest.raises(SaveGameError):
+        list(savegame.iter_bodies(io.BytesIO(data.getvalue()[:-3])))
+
+
+def test_truncated_and_corrupt_bodies(new_board, play):
+    board = new_board(5)
+    play(board, 120, 5)
+    body = savegame.encode(board)
+    target = new_board(0)
+    for end in range(len(body)):
+        with pytest.raises(SaveGameError):
+            savegame.decode(body[:end], target)
+    rng = random.Random(0)
+    for _ in range(2000):
+        damaged = bytearray(body)
+        for _ in range(rng.randint(1, 3)):
+            damaged[rng.randrange(len(damaged))] = rng.randrange(256)
+        try:
+            savegame.new_board(bytes(damaged))
+        except SaveGameError:
+            pass
+
+
+def _share_square(board, square):
+    other = next(p for p in board.players if square not in p.property_list)
+    other.property_list.append(square)
+
+
+def _set(square, houses, hotels):
+    square.house_count, square.hotel_count = houses, hotels
+
+
+@pytest.mark.parametrize("damage", [
+    lambda board, square: _share_square(board, square),
+    lambda board, square: _set(square, 5, 0),
+    lambda board, square: _set(square, 0, 2),
+    lambda board, square: _set(square, 2, 1),
+    lambda board, square: setattr(board.players[0], "in_jail_count", 3),
+    lambda board, square: setattr(board, "doubles_rolled", 3),
+], ids=["shared square", "houses", "hotels", "houses and hotel", "jail", "doubles"])
+def test_impossible_games_are_refused(damage, new_board, play):
+    board = new_board(5)
+    play(board, 60, 5)
+    square = next(sq for p in board.players for sq in p.property_list
+                  if hasattr(sq, "house_count"))
+    assert len(board.players) > 1
+    savegame.new_board(savegame.encode(board))
+    damage(board, square)
+    with pytest.raises(SaveGameError):
+        savegame.new_board(savegame.encode(board))
+
+
+def test_too_few_strategies(new_board):
+    body = savegame.encode(new_board(1, 4))
+    with pytest.raises(ValueError):
+        savegame.new_board(body, strategies(3))
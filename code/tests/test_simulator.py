@@ -0,0 +1,36 @@
+import pickle
+import random
+
+from board import Board
+from dice import substream
+from simulator import Simulator
+from strategy import RandomStrategy
+
+
+def test_games_are_reproducible_and_leave_random_alone():
+    simulator = Simulator([RandomStrategy() for _ in range(3)], seed=10, max_turns=300)
+    random.seed(99)
+    before = random.getstate()
+    first = simulator.run(5).results
+    assert random.getstate() == before
+    assert simulator.run(5).results == first
+    assert [simulator.play_game(12)] == first[2:3]
+
+
+def test_decks_do_not_share_the_dice_generator():
+    # with seed 0 the first dice batch comes from random.Random(0)
+    board = Board(num_players=2, seed=0)
+    order = list(range(len(board.chance_deck.cards)))
+    random.Random(0).shuffle(order)
+    assert board.chance_deck.order != tuple(order)
+    order = list(range(len(board.chance_deck.cards)))
+    substream(0, "decks").shuffle(order)
+    assert board.chance_deck.order == tuple(order)
+
+
+def test_strategies_pickle_with_their_generator():
+    copy = pickle.loads(pickle.dumps(RandomStrategy()))
+    assert copy.rng is random
+    seeded = RandomStrategy(rng=random.Random(4))
+    copy = pickle.loads(pickle.dumps(seeded))
+    assert copy.rng.random() == seeded.rng.random()
@@ -0,0 +1,45 @@
+"""Board.snapshot()/restore(): a restored game goes on exactly as it did."""
+import pytest
+
+from state import GameState
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_restore_then_continue(seed, new_board, play):
+    board = new_board(seed)
+    play(board, 20 + seed * 5, seed)
+    snapshot = board.snapshot()
+    before = GameState.from_board(board).snapshot()
+    first = play(board, 150, seed + 1000)
+
+    board.restore(snapshot)
+    assert GameState.from_board(board).snapshot() == before
+    assert play(board, 150, seed + 1000) == first
+
+
+def test_restore_is_repeatable(new_board, play):
+    board = new_board(7)
+    play(board, 40, 7)
+    snapshot = board.snapshot()
+    traces = []
+    for _ in range(3):
+        board.restore(snapshot)
+        traces.append(play(board, 100, 99))
+        assert board.snapshot() != snapshot
+    assert traces[0] == traces[1] == traces[2]
+    board.restore(snapshot)
+    assert board.snapshot() == snapshot
+
+
+def test_restore_brings_back_bankrupt_players(new_board, play):
+    for seed in range(200):
+        board = new_board(seed, n_players=2)
+        snapshot = board.snapshot()
+        if play(board, 1000, seed) and len(board.players) == 1:
+            break
+    else:
+        pytest.skip("no game ended")
+    board.restore(snapshot)
+    assert len(board.players) == 2
+    assert GameState.from_board(board).snapshot() == \
+        GameState.from_board(new_board(seed, n_players=2)).snapshot()
@@ -0,0 +1,77 @@
+import random
+import time
+
+from board import Board
+from spectator import Spectator
+from strategy import RandomStrategy
+from termination import TURN_CAP, Referee
+
+
+def new_board(seed):
+    strategies = [RandomStrategy(rng=random.Random(seed * 10 + i)) for i in range(3)]
+    return Board(num_players=3, strategies=strategies, seed=seed)
+
+
+def comparable(snapshot):
+    """A Board.snapshot() without the counters, which refer to the board's
+    own PropertyGroup objects."""
+    return snapshot._replace(players=tuple(p._replace(counters=None)
+                                           for p in snapshot.players))
+
+
+def serial_snapshots(seed, referee):
+    board = new_board(seed)
+    referee.start()
+    snapshots = []
+    while True:
+        board.play_single_turn()
+        snapshots.append(comparable(board.snapshot()))
+        if referee.observe(board) is not None:
+            return snapshots
+
+
+def wait(spectator, timeout=30):
+    end = time.monotonic() + timeout
+    while spectator.running and time.monotonic() < end:
+        time.sleep(0.001)
+
+
+def test_frames_are_snapshots_of_the_game_played_in_order():
+    expected = serial_snapshots(3, Referee(max_turns=300))
+    spectator = Spectator(new_board(3), referee=Referee(max_turns=300), publish_every=0)
+    first = spectator.frame
+    assert first.turn == 0 and first.reason is None
+    spectator.start()
+    frames = []
+    while spectator.running or frames[-1:] != [spectator.frame]:
+        frame = spectator.frame
+        if frame is not first and (not frames or frame is not frames[-1]):
+            frames.append(frame)
+    spectator.stop()
+
+    assert frames[-1].turn == len(expected) and frames[-1].reason is not None
+    for frame in frames:
+        assert comparable(frame.snapshot) == expected[frame.turn - 1]
+    assert [f.turn for f in frames] == sorted({f.turn for f in frames})
+
+
+def test_turn_cap_and_rate():
+    spectator = Spectator(new_board(4), turns_per_sec=200, referee=Referee(max_turns=20))
+    start = time.perf_counter()
+    spectator.start()
+    wait(spectator)
+    # 20 turns at 200 a second
+    assert time.perf_counter() - start >= 0.09
+    assert spectator.frame.turn == 20 and spectator.frame.reason == TURN_CAP
+
+
+def test_stop_ends_the_worker():
+    spectator = Spectator(new_board(5), turns_per_sec=20)
+    spectator.start()
+    time.sleep(0.1)
+    spectator.stop()
+    assert not spectator.running
+    turn = spectator.frame.turn
+    assert 1 <= turn <= 4
+    time.sleep(0.1)
+    assert spectator.frame.turn == turn
@@ -0,0 +1,65 @@
+from termination import DOMINANCE, LAST_STANDING, STALEMATE, TURN_CAP, Referee
+
+
+def observe(referee, board, turns):
+    """Observe turns turns of an unchanging board; return the turn and
+    reason the referee stopped at, or (None, None)."""
+    for _ in range(turns):
+        reason = referee.observe(board)
+        if reason is not None:
+            return referee.turns, reason
+    return None, None
+
+
+def test_last_standing(new_board):
+    board = new_board(0, 2)
+    board.players.pop(0)
+    referee = Referee()
+    assert referee.observe(board) == LAST_STANDING
+    assert referee.adjudicate(board) == 1
+
+
+def test_turn_cap(new_board):
+    board = new_board(0, 3)
+    referee = Referee(max_turns=50, min_turns=1000)
+    assert observe(referee, board, 100) == (50, TURN_CAP)
+    # everyone still has the starting cash: a tie
+    assert referee.adjudicate(board) is None
+
+
+def test_dominance(new_board):
+    board = new_board(0, 3)
+    board.players[2].cash = 20000
+    referee = Referee(stride=1, min_turns=5)
+    assert observe(referee, board, 100) == (5, DOMINANCE)
+    assert referee.adjudicate(board) == 2
+
+
+def test_stalemate(new_board):
+    board = new_board(0, 2)
+    referee = Referee(window=20, stride=1, min_turns=0)
+    turn, reason = observe(referee, board, 100)
+    assert reason == STALEMATE and turn == 21
+
+
+def test_players_running_out_of_cash_are_no_stalemate(new_board):
+    board = new_board(0, 2)
+    referee = Referee(window=20, stride=1, min_turns=0, horizon=1000)
+    for _ in range(100):
+        board.players[0].cash -= 10
+        assert referee.observe(board) is None
+
+
+def test_a_trade_is_a_change(new_board):
+    board = new_board(0, 2)
+    first, second = board.players
+    streets = [sq for sq in board.squares if hasattr(sq, "house_count")]
+    board._set_owner(streets[0], first)
+    board._set_owner(streets[5], second)
+    referee = Referee(window=20, stride=1, min_turns=0)
+    assert observe(referee, board, 10) == (None, None)
+    # swap the squares: both players still hold one
+    board._set_owner(streets[0], second)
+    board._set_owner(streets[5], first)
+    turn, reason = observe(referee, board, 100)
+    assert reason == STALEMATE and turn == 31
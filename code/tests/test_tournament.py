@@ -0,0 +1,28 @@
+"""Tournament results are counted per entrant, not per strategy class."""
+from strategy import MCTStrategy, RandomStrategy
+from tournament import Tournament, entrant_labels
+
+
+def test_entrant_labels():
+    strategies = [RandomStrategy(), MCTStrategy(iterations=1), RandomStrategy()]
+    assert entrant_labels(strategies) == [
+        "RandomStrategy #0", "MCTStrategy", "RandomStrategy #2"]
+
+
+def test_duplicate_classes_get_a_row_each():
+    tournament = Tournament([RandomStrategy() for _ in range(3)], 12, processes=1,
+                            shard_size=4)
+    table = tournament.run()
+    rows = {name: (seats, wins) for name, seats, wins, *_ in table.rows()}
+    assert set(rows) == {"RandomStrategy #0", "RandomStrategy #1", "RandomStrategy #2"}
+    assert all(seats == 12 for seats, _ in rows.values())
+    assert sum(wins for _, wins in rows.values()) <= 12
+
+
+def test_results_do_not_depend_on_the_pool():
+    def rows(processes):
+        tournament = Tournament([RandomStrategy() for _ in range(2)], 16, seed=3,
+                                processes=processes, shard_size=3)
+        return tournament.run().rows()
+
+    assert rows(1) == rows(2)
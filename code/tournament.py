@@ -0,0 +1,160 @@
+import math
+import multiprocessing
+import time
+from collections import Counter
+
+from simulator import Simulator
+from termination import LAST_STANDING, Referee
+
+
+def wilson_interval(wins, games, z=1.96):
+    """Return the (low, high) Wilson score interval for a win rate."""
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    denom = 1 + z * z / games
+    centre = (p + z * z / (2 * games)) / denom
+    margin = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denom
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def entrant_labels(strategies):
+    """One label per entrant: its class name, followed by its seat in the
+    lineup when several entrants share a class."""
+    names = [s.__class__.__name__ for s in strategies]
+    counts = Counter(names)
+    return [name if counts[name] == 1 else "{0} #{1}".format(name, seat)
+            for seat, name in enumerate(names)]
+
+
+class WinTable:
+    """Win counts per entrant, merged from any number of game results."""
+
+    def __init__(self):
+        self.seats = Counter()
+        self.wins = Counter()
+        self.games = 0
+        self.capped = 0
+        self.turns = 0
+        self.reasons = Counter()
+
+    def add(self, lineup, result):
+        """Count one GameResult played by the entrant labels in lineup (by uid)."""
+        self.games += 1
+        self.turns += result.turns
+        self.seats.update(lineup)
+        self.reasons[result.reason] += 1
+        if result.reason != LAST_STANDING:
+            self.capped += 1
+        if result.winner is not None:
+            self.wins[lineup[result.winner]] += 1
+
+    def merge(self, other):
+        self.seats.update(other.seats)
+        self.wins.update(other.wins)
+        self.games += other.games
+        self.capped += other.capped
+        self.turns += other.turns
+        self.reasons.update(other.reasons)
+
+    def rows(self):
+        """Return (name, seats, wins, rate, ci_low, ci_high) sorted by win rate."""
+        rows = []
+        for name, seats in self.seats.items():
+            wins = self.wins[name]
+            low, high = wilson_interval(wins, seats)
+            rows.append((name, seats, wins, wins / seats, low, high))
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows
+
+    def __str__(self):
+        lines = ["{0:<20} {1:>8} {2:>8} {3:>7}  {4}".format(
+            "entrant", "seats", "wins", "rate", "95% CI")]
+        for name, seats, wins, rate, low, high in self.rows():
+            lines.append("{0:<20} {1:>8} {2:>8} {3:>7.3f}  [{4:.3f}, {5:.3f}]".format(
+                name, seats, wins, rate, low, high))
+        lines.append("games: {0}  capped: {1}".format(self.games, self.capped))
+        if self.capped:
+            lines.append("  " + "  ".join(
+                "{0}: {1}".format(reason, n) for reason, n in sorted(self.reasons.items())
+                if reason != LAST_STANDING))
+        return "\n".join(lines)
+
+
+def _rotate(lineup, k):
+    k %= len(lineup)
+    return lineup[k:] + lineup[:k]
+
+
+def _play_shard(task):
+    """Worker entry point: play one shard and return its results."""
+    index, strategies, seed, n_games, referee = task
+    simulator = Simulator(strategies, seed=seed, referee=referee)
+    return index, list(simulator.iter_games(n_games))
+
+
+class Tournament:
+    """Play a strategy lineup many times over a process pool.
+
+    Games are cut into shards of shard_size games. Shard i always gets the
+    seeds seed + i*shard_size onwards and the lineup rotated by i seats, so the
+    results do not depend on the number of processes or on scheduling. Every
+    game is stopped by a copy of referee (a termination.Referee, by default
+    one with the turn cap max_turns). Results are counted per entrant, so a
+    lineup may hold the same strategy class several times.
+    """
+
+    def __init__(self, strategies, n_games, seed=0, processes=None, shard_size=50,
+                 max_turns=1000, referee=None):
+        self.strategies = list(strategies)
+        self.labels = entrant_labels(self.strategies)
+        self.n_games = n_games
+        self.seed = seed
+        self.processes = processes or multiprocessing.cpu_count()
+        self.shard_size = shard_size
+        self.max_turns = max_turns
+        self.referee = referee or Referee(max_turns=max_turns)
+        self.elapsed = 0.0
+
+    def _tasks(self):
+        for index, first in enumerate(range(0, self.n_games, self.shard_size)):
+            yield (
+                index,
+                _rotate(self.strategies, index),
+                self.seed + first,
+                min(self.shard_size, self.n_games - first),
+                self.referee,
+            )
+
+    def lineup_names(self, shard_index):
+        """Entrant labels by uid for the given shard."""
+        return _rotate(self.labels, shard_index)
+
+    def _unpack(self, shards):
+        for index, results in shards:
+            names = self.lineup_names(index)
+            for result in results:
+                yield names, result
+
+    def iter_results(self):
+        """Yield (lineup names, GameResult) as shards finish, in any order."""
+        start = time.perf_counter()
+        if self.processes == 1:
+            yield from self._unpack(map(_play_shard, self._tasks()))
+        else:
+            with multiprocessing.Pool(self.processes) as pool:
+                yield from self._unpack(pool.imap_unordered(_play_shard, self._tasks()))
+        self.elapsed = time.perf_counter() - start
+
+    def run(self):
+        """Play every game and return the merged WinTable."""
+        table = WinTable()
+        for names, result in self.iter_results():
+            table.add(names, result)
+        return table
+
+    @property
+    def games_per_sec(self):
+        if self.elapsed <= 0:
+            return float("inf")
+        return self.n_games / self.elapsed